@@ -0,0 +1,64 @@
+"""
+_common.py — shared helpers for the TWFF benchmark scripts
+
+Puts glassbox/ and spec/verification/ on sys.path (the same way glassbox/app.py
+does for components/) and provides a deterministic synthetic session generator.
+"""
+from __future__ import annotations
+
+import datetime
+import os
+import random
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, "glassbox"))
+sys.path.insert(0, os.path.join(REPO_ROOT, "spec", "verification"))
+
+_START = datetime.datetime(2026, 2, 16, 9, 0, 0)
+
+
+def synthetic_events(n: int, seed: int = 0):
+    """
+    Yield (event_type, meta, timestamp) tuples resembling a real session:
+    ~90% edits, ~6% checkpoints, the rest pastes / AI interactions / focus changes.
+    """
+    rng = random.Random(seed)
+    pos = 0
+    t   = _START
+    for _ in range(n):
+        t += datetime.timedelta(microseconds=rng.randint(50_000, 400_000))
+        ts = t.isoformat() + "Z"
+        r  = rng.random()
+        if r < 0.90:
+            start = pos
+            pos  += rng.randint(1, 8)
+            yield "edit", {"position_start": start, "position_end": pos, "source": "human"}, ts
+        elif r < 0.96:
+            yield "checkpoint", {"char_count_total": pos, "word_count_total": pos // 6,
+                                 "position": pos}, ts
+        elif r < 0.98:
+            n_chars = rng.randint(20, 400)
+            yield "paste", {"char_count": n_chars, "source": "external",
+                            "position_start": pos, "position_end": pos + n_chars,
+                            "output_preview": "Lorem ipsum dolor sit amet " * 3}, ts
+            pos += n_chars
+        elif r < 0.99:
+            n_chars = rng.randint(40, 600)
+            yield "ai_interaction", {
+                "interaction_type": "paraphrase", "model": "llama3.2:3b",
+                "input_preview": "make this more formal", "output_preview": "Subsequently, the",
+                "output_length": n_chars, "position_start": pos,
+                "position_end": pos + n_chars, "acceptance": "fully_accepted",
+            }, ts
+            pos += n_chars
+        else:
+            yield "focus_change", {"duration_ms": rng.randint(500, 90_000)}, ts
+
+
+def fmt_rate(n: float) -> str:
+    for unit in ("", "k", "M", "G"):
+        if abs(n) < 1000:
+            return f"{n:,.1f}{unit}"
+        n /= 1000
+    return f"{n:,.1f}T"
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+bench_anchor_verify.py — anchored, segment-parallel verification vs core count
+
+Writes a synthetic chained process-log.json with SPEC §5.8 anchors every
+--anchor-every events (offsets included, as export() writes them), then
+times anchor_verify.verify_anchored() for each worker count, next to the
+sequential stream_verify pass.
+
+Usage:
+    python benchmarks/bench_anchor_verify.py [--events 10000000] [--workers 1,2,4,8]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from _common import fmt_rate, synthetic_events
+
+from anchor_verify import verify_anchored
+from stream_verify import verify_stream
+from verify_process_log import compute_event_hash
+
+SESSION_ID = "bench-anchor-verify"
+
+
+def write_log(path: str, n: int, every: int) -> None:
+    prev, anchors, i = "", [], 0
+    with open(path, "wb") as f:
+        f.write(('{\n  "version": "0.1.0",\n'
+                 f'  "session_id": "{SESSION_ID}",\n'
+                 '  "user_id": "anon-bench",\n  "events": [').encode())
+        while i < n:
+            for etype, meta, ts in synthetic_events(min(50_000, n - i), seed=i):
+                sep = b"\n    " if i == 0 else b",\n    "
+                if i % every == 0:
+                    anchors.append({"index": i, "hash": prev, "offset": f.tell() + len(sep)})
+                event = {"timestamp": ts, "type": etype, "meta": meta}
+                event["_hash"] = prev = compute_event_hash(event, prev, SESSION_ID)
+                f.write(sep + json.dumps(event, indent=2).replace("\n", "\n    ").encode())
+                i += 1
+        integrity = {"algorithm": "SHA-256-CHAIN", "chain_length": n, "head_hash": prev,
+                     "session_id": SESSION_ID, "anchor_interval": every, "anchors": anchors}
+        f.write(("\n  ],\n  \"_integrity\": "
+                 + json.dumps(integrity, indent=2).replace("\n", "\n  ") + "\n}").encode())
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--events", type=int, default=10_000_000)
+    parser.add_argument("--anchor-every", type=int, default=100_000)
+    parser.add_argument("--workers", default=",".join(
+        str(w) for w in (1, 2, 4, 8, 16, 32) if w <= (os.cpu_count() or 1)))
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "process-log.json")
+        write_log(path, args.events, args.anchor_every)
+        print(f"{os.path.getsize(path) / 2**20:,.0f} MiB, {args.events:,} events, "
+              f"anchor every {args.anchor_every:,}\n")
+        print(f"{'mode':<22} {'seconds':>8} {'events/s':>10} {'speed-up':>9}")
+
+        t0 = time.perf_counter()
+        assert verify_stream(path).ok
+        base = time.perf_counter() - t0
+        print(f"{'sequential stream':<22} {base:>8.1f} {fmt_rate(args.events / base):>10} {1.0:>8.2f}x")
+
+        for w in map(int, args.workers.split(",")):
+            t0 = time.perf_counter()
+            assert verify_anchored(path, workers=w).ok
+            t = time.perf_counter() - t0
+            print(f"{f'anchored, {w} worker(s)':<22} {t:>8.1f} "
+                  f"{fmt_rate(args.events / t):>10} {base / t:>8.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+bench_binlog.py — meta/process-log.bin vs process-log.json: size and speed
+
+Builds a chained log of --events synthetic events and compares, per format:
+
+  size         raw bytes and deflated (level 6, as in the container)
+  encode       dict → bytes  (json.dumps / binlog.encode)
+  decode       bytes → dict  (json.loads / binlog.decode)
+
+"json" is the exported layout (indent=2); "json compact" uses separators
+(",", ":") for reference. Every decode is checked against the original dict.
+
+Usage:
+    python benchmarks/bench_binlog.py [--events 200000] [--repeat 3]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import time
+import zlib
+
+from _common import fmt_rate, synthetic_events
+
+from components.binlog import BinaryLogReader, decode, encode
+from components.process_log import ProcessLog
+
+
+def best(fn, repeat: int):
+    times, result = [], None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - t0)
+    return min(times), result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--events", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    log = ProcessLog()
+    for etype, meta, _ in synthetic_events(args.events, seed=0):
+        log.log_event(etype, meta)
+    doc = log.to_dict()
+    doc["_integrity"] = log.integrity()
+    n = len(doc["events"])
+
+    formats = (
+        ("json",         lambda d: json.dumps(d, indent=2).encode("utf-8"), json.loads),
+        ("json compact", lambda d: json.dumps(d, separators=(",", ":")).encode("utf-8"), json.loads),
+        ("binlog",       encode, decode),
+    )
+    print(f"{n:,} events\n")
+    print(f"{'format':<13} {'bytes':>12} {'B/event':>8} {'deflated':>11} "
+          f"{'encode ev/s':>12} {'decode ev/s':>12}")
+    for name, enc, dec in formats:
+        t_enc, data = best(lambda: enc(doc), args.repeat)
+        t_dec, back = best(lambda: dec(data), args.repeat)
+        assert back == doc, f"{name} did not round-trip"
+        packed = zlib.compress(data, 6)
+        print(f"{name:<13} {len(data):>12,} {len(data) / n:>8.1f} {len(packed):>11,} "
+              f"{fmt_rate(n / t_enc):>12} {fmt_rate(n / t_dec):>12}")
+
+    data = encode(doc)
+    reader = BinaryLogReader(data)
+    t_ts, _ = best(reader.timestamps_ns, args.repeat)
+    t_ty, _ = best(reader.event_types, args.repeat)
+    print(f"\nbinlog columns without building events: timestamps {fmt_rate(n / t_ts)} ev/s, "
+          f"types {fmt_rate(n / t_ty)} ev/s")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+bench_canonical_hash.py — SPEC §5.2 hashes/s: previous per-call json.dumps vs twff_hash
+
+Cross-checks every synthetic event against the previous implementation
+(dict comprehension + json.dumps(sort_keys=True) + sha256) before timing,
+and runs the pinned vectors in spec/verification/hash_vectors.json.
+
+Usage:
+    python benchmarks/bench_canonical_hash.py [--events 200000]
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import time
+
+from _common import fmt_rate, synthetic_events
+
+import twff_hash
+
+SESSION_ID = "3f2b8c1e-9d4a-4f6b-8e2c-1a5d7f9b0c3e"
+
+
+def legacy_event_hash(event: dict, previous_hash: str, session_id: str) -> str:
+    """The implementation previously copy-pasted into each verifier."""
+    payload = {k: v for k, v in event.items() if k != "_hash"}
+    payload_json = json.dumps(payload, separators=(",", ":"), sort_keys=True)
+    hash_input   = payload_json + "|" + previous_hash + "|" + session_id
+    return hashlib.sha256(hash_input.encode("utf-8")).hexdigest()
+
+
+def chain(events: list[dict], fn) -> float:
+    prev = ""
+    t0 = time.perf_counter()
+    for event in events:
+        prev = fn(event, prev, SESSION_ID)
+    return time.perf_counter() - t0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--events", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    failures = twff_hash.check_vectors()
+    if failures:
+        print("\n".join(failures))
+        return 1
+
+    events, prev = [], ""
+    for etype, meta, ts in synthetic_events(args.events):
+        event = {"timestamp": ts, "type": etype, "meta": meta}
+        event["_hash"] = prev = legacy_event_hash(event, prev, SESSION_ID)
+        events.append(event)
+    prev = ""
+    for i, event in enumerate(events):
+        h = twff_hash.compute_event_hash(event, prev, SESSION_ID)
+        if h != event["_hash"]:
+            print(f"MISMATCH at event {i}")
+            return 1
+        prev = h
+    print(f"{len(events):,} events and pinned vectors: byte-identical\n")
+
+    print(f"{'implementation':<34} {'hashes/s':>10}")
+    base = None
+    for name, fn in (("legacy json.dumps per call", legacy_event_hash),
+                     ("twff_hash.compute_event_hash", twff_hash.compute_event_hash)):
+        best = min(chain(events, fn) for _ in range(args.repeat))
+        rate = len(events) / best
+        base = base or rate
+        print(f"{name:<34} {fmt_rate(rate):>10}  ({rate / base:.2f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+bench_chain_algorithms.py — SPEC §5.9 chain throughput per hash algorithm
+
+Two numbers per algorithm in twff_hash.CHAIN_ALGORITHMS:
+
+  digest  — chain_hash() over pre-serialised payloads (the hash alone)
+  event   — compute_event_hash() per event (canonical JSON + hash), i.e.
+            what ProcessLog and the verifiers actually pay
+
+Every chain is re-verified with the same algorithm before timing.
+
+Usage:
+    python benchmarks/bench_chain_algorithms.py [--events 200000]
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+from _common import fmt_rate, synthetic_events
+
+import twff_hash
+
+SESSION_ID = "3f2b8c1e-9d4a-4f6b-8e2c-1a5d7f9b0c3e"
+
+
+def time_digest(payloads: list[str], hasher) -> float:
+    prev = ""
+    t0 = time.perf_counter()
+    for payload in payloads:
+        prev = hasher(payload, prev, SESSION_ID)
+    return time.perf_counter() - t0
+
+
+def time_event(events: list[dict], algorithm: str) -> float:
+    prev = ""
+    t0 = time.perf_counter()
+    for event in events:
+        prev = twff_hash.compute_event_hash(event, prev, SESSION_ID, algorithm)
+    return time.perf_counter() - t0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--events", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    failures = twff_hash.check_vectors()
+    if failures:
+        print("\n".join(failures))
+        return 1
+
+    events   = [{"timestamp": ts, "type": etype, "meta": meta}
+                for etype, meta, ts in synthetic_events(args.events)]
+    payloads = [twff_hash.canonical_json(e) for e in events]
+    size     = sum(map(len, payloads))
+    print(f"{len(events):,} events, {size / 2**20:,.1f} MiB canonical payload\n")
+
+    print(f"{'algorithm':<20} {'digest/s':>10} {'event/s':>10} {'vs. SHA-256':>12}")
+    base = None
+    for name in twff_hash.CHAIN_ALGORITHMS:
+        hasher = twff_hash.chain_hasher(name)
+        prev = ""
+        for payload in payloads:
+            prev = hasher(payload, prev, SESSION_ID)
+        chained = [dict(e) for e in events]
+        head = ""
+        for e in chained:
+            e["_hash"] = head = twff_hash.compute_event_hash(e, head, SESSION_ID, name)
+        if head != prev:
+            print(f"{name}: compute_event_hash and chain_hash disagree")
+            return 1
+
+        digest = len(payloads) / min(time_digest(payloads, hasher) for _ in range(args.repeat))
+        event  = len(events) / min(time_event(events, name) for _ in range(args.repeat))
+        base = base or event
+        print(f"{name:<20} {fmt_rate(digest):>10} {fmt_rate(event):>10} {event / base:>11.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
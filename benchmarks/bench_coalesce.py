@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+bench_coalesce.py — edit-burst coalescing on synthetic keystroke traces
+
+Each trace is a stream of single-character edits with a simulated clock:
+typing bursts at a given speed, pauses between sentences, occasional
+backspace runs and cursor jumps. The EditCoalescer is driven with that clock
+so results are deterministic.
+
+Usage:
+    python benchmarks/bench_coalesce.py [--keys 100000]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+
+from _common import fmt_rate
+
+from components.clock import format_ns
+from components.coalesce import EditCoalescer
+
+TRACES = {
+    # name: (mean ms between keys, P(pause), P(backspace run), P(cursor jump))
+    "steady typist (60 wpm)":    (200, 0.02, 0.02, 0.005),
+    "fast typist (110 wpm)":     (110, 0.02, 0.03, 0.005),
+    "hunt-and-peck (20 wpm)":    (600, 0.05, 0.02, 0.01),
+    "heavy revision":            (250, 0.04, 0.12, 0.08),
+}
+
+POLICIES = {
+    "window 1s / span 5s":  dict(window_ms=1000, max_span_ms=5000),
+    "window 2s / span 30s": dict(window_ms=2000, max_span_ms=30000),
+    "window 500ms / span 2s": dict(window_ms=500, max_span_ms=2000),
+}
+
+
+def keystrokes(n: int, mean_ms: float, p_pause: float, p_back: float, p_jump: float, seed: int = 1):
+    """Yield (position_start, position_end, now_ms)."""
+    rng    = random.Random(seed)
+    now    = 0.0
+    cursor = 0
+    length = 0
+    back   = 0
+    for _ in range(n):
+        now += rng.expovariate(1 / mean_ms)
+        if rng.random() < p_pause:
+            now += rng.uniform(2_000, 20_000)
+        if rng.random() < p_jump and length:
+            cursor = rng.randint(0, length)
+        if back == 0 and rng.random() < p_back:
+            back = rng.randint(1, 12)
+        if back and cursor:
+            back   -= 1
+            cursor -= 1
+            length -= 1
+            yield cursor, cursor + 1, now
+        else:
+            back = 0
+            yield cursor, cursor + 1, now
+            cursor += 1
+            length += 1
+
+
+def run(trace, n: int, policy: dict) -> tuple[int, int, float, int, int]:
+    coalescer = EditCoalescer(**policy)
+    out       = []
+    ts        = 1_771_232_400_000_000_000  # 2026-02-16T09:00:00Z
+    last_ms   = 0.0
+    raw_bytes = 0
+    for start, end, now in keystrokes(n, *trace):
+        raw = {"timestamp": format_ns(ts), "type": "edit",
+               "meta": {"position_start": start, "position_end": end, "source": "human"}}
+        raw_bytes += len(json.dumps(raw, indent=2))
+        finished = coalescer.offer(start, end, "human", ts, now_ms=now)
+        if finished:
+            out.append(finished)
+        last_ms = now
+    finished = coalescer.flush()
+    if finished:
+        out.append(finished)
+    merged_bytes = sum(
+        len(json.dumps({"timestamp": format_ns(t), "type": "edit", "meta": m}, indent=2)) for m, t in out
+    )
+    return coalescer.edits_in, coalescer.edits_out, last_ms / 1000, raw_bytes, merged_bytes
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--keys", type=int, default=100_000)
+    args = parser.parse_args()
+
+    print(f"{'trace':<24} {'policy':<24} {'in':>8} {'out':>8} {'ratio':>6} "
+          f"{'ev/s in':>8} {'ev/s saved':>10} {'JSON saved':>10}")
+    for tname, trace in TRACES.items():
+        for pname, policy in POLICIES.items():
+            n_in, n_out, secs, raw_b, merged_b = run(trace, args.keys, policy)
+            saved_rate = (n_in - n_out) / secs
+            print(f"{tname:<24} {pname:<24} {n_in:>8,} {n_out:>8,} {n_in / n_out:>5.1f}x "
+                  f"{fmt_rate(n_in / secs):>8} {fmt_rate(saved_rate):>10} "
+                  f"{100 * (1 - merged_b / raw_b):>9.1f}%")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
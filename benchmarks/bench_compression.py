@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+bench_compression.py — export time vs archive size per CompressionPolicy
+
+Exports realistic containers under each policy and reports export time and
+.twff size:
+
+  short essay     2,000 events, no assets
+  long session    200,000 events, no assets
+  illustrated     20,000 events + 4 images (1 MiB each, incompressible like PNG/JPEG)
+
+"previous" reproduces the old behaviour (every member deflated at level 6).
+
+It also measures what a preset zlib dictionary of TWFF event keys would
+save on the process log. ZIP deflate members cannot declare a dictionary,
+so such a log could not be read by standard unzip tools. The number is
+reported for reference only and no policy uses it.
+
+Usage:
+    python benchmarks/bench_compression.py [--repeat 3]
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import random
+import time
+import zipfile
+import zlib
+
+from _common import synthetic_events
+
+from components.compression import (
+    DEFAULT_POLICY,
+    FAST_POLICY,
+    SMALLEST_POLICY,
+    CompressionPolicy,
+)
+from components.process_log import ProcessLog
+
+PREVIOUS_POLICY = CompressionPolicy(log_level=6, text_level=6, default_level=6,
+                                    sniff=False, stored_suffixes=frozenset())
+
+POLICIES = (("previous", PREVIOUS_POLICY), ("default", DEFAULT_POLICY),
+            ("fast", FAST_POLICY), ("smallest", SMALLEST_POLICY))
+
+# Keys and values that recur in every TWFF log, most frequent last (zlib
+# prefers matches near the end of the dictionary).
+TWFF_ZDICT = (
+    b'"chat_interaction" "focus_change" "session_end" "session_start" '
+    b'"ai_interaction" "interaction_type" "model" "prompt_length" "response_length" '
+    b'"paste" "char_count" "preview" "source": "external" '
+    b'"checkpoint" "char_count_total" "word_count_total" "position" '
+    b'"_hash": " "meta": { "source": "human" "position_start": "position_end": '
+    b'"type": "edit", "timestamp": "2026-'
+)
+
+
+def build(events: int, images: int, seed: int) -> tuple[ProcessLog, dict[str, bytes]]:
+    log = ProcessLog()
+    for etype, meta, _ in synthetic_events(events, seed=seed):
+        log.log_event(etype, meta)
+    rng = random.Random(seed)
+    assets = {f"content/images/figure{i + 1}.png": rng.randbytes(1 << 20) for i in range(images)}
+    return log, assets
+
+
+def export_once(log: ProcessLog, assets: dict, policy: CompressionPolicy) -> tuple[float, int]:
+    buf = io.BytesIO()
+    t0 = time.perf_counter()
+    log.export_to(buf, "<html><body><p>essay</p></body></html>", assets, policy)
+    return time.perf_counter() - t0, buf.tell()
+
+
+def deflate_size(data: bytes, zdict: bytes | None = None) -> int:
+    c = zlib.compressobj(6, zlib.DEFLATED, -15, **({"zdict": zdict} if zdict else {}))
+    return len(c.compress(data)) + len(c.flush())
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    scenarios = (("short essay", 2_000, 0), ("long session", 200_000, 0), ("illustrated", 20_000, 4))
+    print(f"{'container':<14} {'policy':<10} {'export s':>9} {'size KiB':>10} {'time':>6} {'size':>6}")
+    for label, events, images in scenarios:
+        log, assets = build(events, images, seed=events)
+        base = None
+        for name, policy in POLICIES:
+            best, size = min(export_once(log, assets, policy) for _ in range(args.repeat))
+            base = base or (best, size)
+            print(f"{label:<14} {name:<10} {best:>9.3f} {size / 1024:>10,.0f} "
+                  f"{best / base[0]:>5.2f}x {size / base[1]:>5.2f}x")
+        print()
+
+    print("Preset dictionary on meta/process-log.json (deflate level 6, reference only):")
+    for events in (50, 500, 20_000):
+        log, _ = build(events, 0, seed=events)
+        with zipfile.ZipFile(io.BytesIO(log.export("<p/>"))) as zf:
+            data = zf.read("meta/process-log.json")
+        plain, primed = deflate_size(data), deflate_size(data, TWFF_ZDICT)
+        print(f"  {events:>6,} events: {plain:>9,} → {primed:>9,} bytes ({primed / plain - 1:+.1%})")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
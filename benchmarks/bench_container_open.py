@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+bench_container_open.py — time to the process-log header of a large .twff
+
+Builds a container of about --mib MiB (deflated or, with --stored,
+uncompressed members) and compares, each in a fresh process so the page cache
+is the only warm state:
+
+  read + json.loads   ZipFile.read() of the whole log, then json.loads()
+  TwffContainer       central directory + first chunk of the log (mmap)
+  TwffContainer, no mmap
+
+Usage:
+    python benchmarks/bench_container_open.py [--mib 100] [--stored]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+
+from _common import synthetic_events
+
+from components.container import TwffContainer
+from twff_hash import compute_event_hash
+
+SESSION_ID = "bench-container-open"
+
+
+def write_container(path: str, target_bytes: int, stored: bool) -> int:
+    compression = zipfile.ZIP_STORED if stored else zipfile.ZIP_DEFLATED
+    prev, n = "", 0
+    with zipfile.ZipFile(path, "w", compression) as zf:
+        zf.writestr("content/document.xhtml", "<p>benchmark</p>")
+        with zf.open("meta/process-log.json", "w", force_zip64=True) as f:
+            f.write(('{\n  "version": "0.1.0",\n'
+                     f'  "session_id": "{SESSION_ID}",\n'
+                     '  "user_id": "anon-bench",\n  "events": [').encode())
+            while os.path.getsize(path) < target_bytes:
+                for etype, meta, ts in synthetic_events(50_000, seed=n):
+                    event = {"timestamp": ts, "type": etype, "meta": meta}
+                    event["_hash"] = prev = compute_event_hash(event, prev, SESSION_ID)
+                    f.write((("," if n else "") + "\n    "
+                             + json.dumps(event, indent=2).replace("\n", "\n    ")).encode())
+                    n += 1
+            f.write(b"\n  ]\n}")
+        zf.writestr("meta/manifest.xml", "<manifest/>")
+    return n
+
+
+def child(mode: str, path: str) -> None:
+    t0 = time.perf_counter()
+    if mode == "json":
+        with zipfile.ZipFile(path) as zf:
+            session_id = json.loads(zf.read("meta/process-log.json"))["session_id"]
+    else:
+        with TwffContainer(path, use_mmap=(mode == "mmap")) as twff:
+            session_id = twff.log.session_id
+    assert session_id == SESSION_ID
+    print(time.perf_counter() - t0)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--mib", type=int, default=100)
+    parser.add_argument("--stored", action="store_true")
+    parser.add_argument("--child", nargs=2, metavar=("MODE", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(*args.child)
+        return 0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "big.twff")
+        n = write_container(path, args.mib * 2**20, args.stored)
+        print(f"{os.path.getsize(path) / 2**20:,.0f} MiB container "
+              f"({'stored' if args.stored else 'deflated'}), {n:,} events\n")
+        print(f"{'mode':<24} {'ms to header':>13}")
+        for mode, label in (("json", "read + json.loads"), ("mmap", "TwffContainer"),
+                            ("file", "TwffContainer, no mmap")):
+            out = subprocess.run([sys.executable, __file__, "--child", mode, path],
+                                 capture_output=True, text=True, check=True).stdout
+            print(f"{label:<24} {float(out) * 1000:>13.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+bench_event_store.py — bytes per event: list-of-dicts vs ColumnarEventStore
+
+Usage:
+    python benchmarks/bench_event_store.py            # 10^3 .. 10^6 events
+    python benchmarks/bench_event_store.py --max 5    # stop at 10^5
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import tracemalloc
+
+from _common import synthetic_events
+
+from components.event_store import ColumnarEventStore
+
+
+def measure(n: int, columnar: bool) -> float:
+    source = list(synthetic_events(n))
+    gc.collect()
+    tracemalloc.start()
+    if columnar:
+        store = ColumnarEventStore()
+        for etype, meta, ts in source:
+            store.append({"timestamp": ts, "type": etype, "meta": meta})
+    else:
+        # Same shape ProcessLog.log_event builds: fresh dict, fresh meta dict, fresh ts string
+        store = []
+        for etype, meta, ts in source:
+            store.append({"timestamp": "".join(ts), "type": etype, "meta": dict(meta)})
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del store
+    return current / n
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--max", type=int, default=6, help="largest power of ten (default 6)")
+    args = parser.parse_args()
+
+    print(f"{'events':>10}  {'list[dict] B/ev':>16}  {'columnar B/ev':>14}  {'ratio':>6}")
+    for exp in range(3, args.max + 1):
+        n = 10 ** exp
+        dicts = measure(n, columnar=False)
+        cols  = measure(n, columnar=True)
+        print(f"{n:>10,}  {dicts:>16.1f}  {cols:>14.1f}  {dicts / cols:>5.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+bench_export_integrity.py — integrity cost at export: bulk re-hash vs append-time chain
+
+The v0.1 export re-serialised and hashed the whole events array; ProcessLog now
+chains each event in log_event() and export() only reads head_hash. Serialising
+the log itself is still O(n), so both the integrity step and the full export are
+reported.
+
+Usage:
+    python benchmarks/bench_export_integrity.py [--max 6]
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import time
+
+from _common import synthetic_events
+
+from components.process_log import ProcessLog
+
+
+def build(n: int) -> ProcessLog:
+    log = ProcessLog(user_id="anon-bench")
+    for etype, meta, _ts in synthetic_events(n - 2):
+        log.log_event(etype, meta)
+    return log
+
+
+def bulk_integrity(log: ProcessLog) -> str:
+    """The pre-chain v0.1 export step."""
+    events_json = json.dumps(list(log.events), sort_keys=True)
+    return hashlib.sha256((events_json + log.session_id).encode()).hexdigest()
+
+
+def timed(fn, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--max", type=int, default=6, help="largest power of ten (default 6)")
+    args = parser.parse_args()
+
+    print(f"{'events':>10}  {'bulk hash ms':>13}  {'chain head ms':>14}  {'full export ms':>15}")
+    for exp in range(3, args.max + 1):
+        n   = 10 ** exp
+        log = build(n)
+        bulk  = timed(lambda: bulk_integrity(log))
+        chain = timed(lambda: log.integrity(), repeat=1000)
+        full  = timed(lambda: log.export("<html/>"), repeat=1)
+        print(f"{n:>10,}  {bulk * 1e3:>13.2f}  {chain * 1e3:>14.4f}  {full * 1e3:>15.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
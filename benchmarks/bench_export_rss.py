@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+bench_export_rss.py — peak RSS of export(): in-memory JSON + BytesIO vs streaming export_to()
+
+Each mode runs in a fresh subprocess: build an N-event columnar log, record
+RSS, export, and report how far peak RSS (ru_maxrss) rose above the
+pre-export baseline. The "spill" mode builds the log with
+max_resident_events instead, so RSS before export is bounded as well.
+
+Usage:
+    python benchmarks/bench_export_rss.py [--events 1000000]
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+
+from _common import synthetic_events
+
+from components.process_log import ProcessLog
+
+MODES = ("legacy-bytes", "export-bytes", "export_to-file", "spill-export_to")
+
+SPILL_RESIDENT = 50_000
+
+
+def rss_kib() -> int:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * (os.sysconf("SC_PAGE_SIZE") // 1024)
+
+
+def child(mode: str, n: int) -> None:
+    if mode == "spill-export_to":
+        log = ProcessLog(user_id="anon-bench", max_resident_events=SPILL_RESIDENT)
+    else:
+        log = ProcessLog(user_id="anon-bench", columnar=True)
+    for etype, meta, _ts in synthetic_events(n - 2):
+        log.log_event(etype, meta)
+    before = rss_kib()
+    # ru_maxrss only ever grows; make sure the baseline is the current RSS.
+    baseline_peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    t0 = time.perf_counter()
+    if mode == "legacy-bytes":
+        # The previous export(): whole dict, json.dumps(indent=2), BytesIO, getvalue()
+        end_time = log.end_session()
+        d = log.to_dict(end_time)
+        d["_integrity"] = log.integrity()
+        buf = io.BytesIO()
+        with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr("content/document.xhtml", "<html/>")
+            zf.writestr("meta/process-log.json", json.dumps(d, indent=2))
+        size = len(buf.getvalue())
+    elif mode == "export-bytes":
+        size = len(log.export("<html/>"))
+    else:
+        with tempfile.TemporaryFile() as f:
+            log.export_to(f, "<html/>")
+            size = f.tell()
+    elapsed = time.perf_counter() - t0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({"mode": mode, "before_mib": before / 1024,
+                      "peak_rise_mib": (max(peak, baseline_peak) - max(before, 0)) / 1024,
+                      "zip_mib": size / 2**20, "seconds": elapsed}))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--child", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.events)
+        return 0
+
+    print(f"{'mode':<16} {'RSS before MiB':>15} {'peak rise MiB':>14} {'zip MiB':>8} {'seconds':>8}")
+    for mode in MODES:
+        out = subprocess.run([sys.executable, __file__, "--events", str(args.events), "--child", mode],
+                             capture_output=True, text=True, check=True).stdout
+        r = json.loads(out)
+        print(f"{mode:<16} {r['before_mib']:>15.1f} {r['peak_rise_mib']:>14.1f} "
+              f"{r['zip_mib']:>8.1f} {r['seconds']:>8.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+bench_journal.py — ProcessLog append throughput per journal fsync policy
+
+Usage:
+    python benchmarks/bench_journal.py [--events 20000] [--dir /path/on/target/disk]
+
+Run with --dir pointing at the filesystem the server will actually journal to;
+fsync cost is entirely a property of that device.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+
+from _common import fmt_rate, synthetic_events
+
+from components.journal import EventJournal
+from components.process_log import ProcessLog
+
+POLICIES = [
+    ("in-memory (no journal)", None),
+    ("journal, no fsync",      dict(fsync_every=0,    fsync_interval_ms=0)),
+    ("fsync every event",      dict(fsync_every=1,    fsync_interval_ms=0)),
+    ("fsync every 16",         dict(fsync_every=16,   fsync_interval_ms=0)),
+    ("fsync every 256",        dict(fsync_every=256,  fsync_interval_ms=0)),
+    ("fsync every 10 ms",      dict(fsync_every=0,    fsync_interval_ms=10)),
+    ("fsync every 200 ms",     dict(fsync_every=0,    fsync_interval_ms=200)),
+    ("default (64 / 200 ms)",  dict(fsync_every=64,   fsync_interval_ms=200)),
+]
+
+
+def run(n: int, directory: str, policy: dict | None) -> float:
+    events = list(synthetic_events(n))
+    path   = os.path.join(directory, "bench.ndjson")
+    if os.path.exists(path):
+        os.remove(path)
+    journal = EventJournal(path, **policy) if policy is not None else None
+    log     = ProcessLog(user_id="anon-bench", journal=journal)
+    t0 = time.perf_counter()
+    for etype, meta, _ts in events:
+        log.log_event(etype, meta)
+    if journal is not None:
+        journal.close()
+    return n / (time.perf_counter() - t0)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--events", type=int, default=20_000)
+    parser.add_argument("--dir", default=None, help="directory to journal into (default: tmp)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as directory:
+        print(f"{'policy':<24}  {'events/s':>10}")
+        for name, policy in POLICIES:
+            print(f"{name:<24}  {fmt_rate(run(args.events, directory, policy)):>10}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+bench_log_event.py — log_event() throughput: datetime timestamps vs MonotonicClock
+
+"before" replays the previous append path inline (datetime.utcnow().isoformat()
+per event, re-parsed by the columnar store); "after" is ProcessLog.log_event()
+as shipped. The timestamp step is also timed on its own.
+
+Usage:
+    python benchmarks/bench_log_event.py [--events 200000]
+"""
+from __future__ import annotations
+
+import argparse
+import datetime
+import time
+
+from _common import fmt_rate, synthetic_events
+
+from components import process_log as pl
+from components.clock import MonotonicClock, format_ns
+from twff_hash import compute_event_hash
+
+
+def legacy_log_event(log: pl.ProcessLog, event_type: str, meta: dict) -> dict:
+    event = {
+        "timestamp": datetime.datetime.utcnow().isoformat() + "Z",
+        "type": event_type,
+        "meta": meta or {},
+    }
+    event["_hash"] = log._head_hash = compute_event_hash(event, log._head_hash, log.session_id)
+    log.events.append(event)
+    return event
+
+
+def rate(fn, n: int) -> float:
+    t0 = time.perf_counter()
+    fn()
+    return n / (time.perf_counter() - t0)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--events", type=int, default=200_000)
+    args = parser.parse_args()
+    n      = args.events
+    events = [(t, m) for t, m, _ts in synthetic_events(n)]
+
+    def ts_legacy():
+        for _ in range(n):
+            datetime.datetime.utcnow().isoformat() + "Z"
+
+    clock = MonotonicClock()
+
+    def ts_clock():
+        for _ in range(n):
+            format_ns(clock.now_ns())
+
+    print(f"{'path':<40} {'ops/s':>10}")
+    print(f"{'timestamp: datetime.utcnow().isoformat()':<40} {fmt_rate(rate(ts_legacy, n)):>10}")
+    print(f"{'timestamp: MonotonicClock + format_ns':<40} {fmt_rate(rate(ts_clock, n)):>10}")
+
+    for columnar in (False, True):
+        label = "columnar" if columnar else "list"
+        before = pl.ProcessLog(user_id="anon-bench", columnar=columnar)
+        after  = pl.ProcessLog(user_id="anon-bench", columnar=columnar)
+        r_before = rate(lambda: [legacy_log_event(before, t, m) for t, m in events], n)
+        r_after  = rate(lambda: [after.log_event(t, m) for t, m in events], n)
+        print(f"{'log_event before (' + label + ')':<40} {fmt_rate(r_before):>10}")
+        print(f"{'log_event after  (' + label + ')':<40} {fmt_rate(r_after):>10}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+bench_segments.py — reading the tail of a long session, single vs segmented log
+
+Exports the same --events session twice, once with meta/process-log.json and
+once segmented (meta/process-log/part-NNNN.json, --segment-events per part).
+It then times, on each container:
+
+  header         open + session_id
+  tail window    events_between(t) for the time range of the last --tail events
+  full scan      every event
+  verify         full chain (stream_verify / segment_verify, one process)
+
+Usage:
+    python benchmarks/bench_segments.py [--events 500000] [--segment-events 50000]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+
+from _common import synthetic_events
+
+from components.container import TwffContainer
+from components.process_log import ProcessLog
+from segment_verify import verify_segmented
+from stream_verify import verify_stream
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - t0, result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--events", type=int, default=500_000)
+    parser.add_argument("--segment-events", type=int, default=50_000)
+    parser.add_argument("--tail", type=int, default=10_000)
+    args = parser.parse_args()
+
+    log = ProcessLog()
+    for etype, meta, _ in synthetic_events(args.events, seed=0):
+        log.log_event(etype, meta)
+    since = log.snapshot()[len(log.snapshot()) - args.tail]["timestamp"]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = {}
+        for label, seg in (("single", None), ("segmented", args.segment_events)):
+            path = paths[label] = os.path.join(tmp, f"{label}.twff")
+            t, _ = timed(lambda: open(path, "wb").write(
+                log.export("<p>benchmark</p>", segment_events=seg)))
+            print(f"{label:<10} export {t:6.2f} s, {os.path.getsize(path) / 2**20:6.1f} MiB")
+        print()
+
+        print(f"{'layout':<10} {'header ms':>10} {'tail ms':>10} {'tail ev':>9} "
+              f"{'full scan s':>12} {'verify s':>9}")
+        for label, path in paths.items():
+            with TwffContainer(path) as twff:
+                t_head, _ = timed(lambda: twff.log.session_id)
+                t_tail, n = timed(lambda: sum(1 for _ in twff.log.events_between(since)))
+                t_scan, _ = timed(lambda: sum(1 for _ in twff.log.events()))
+            t_ver, result = timed(lambda: verify_segmented(path, workers=1) if label == "segmented"
+                                  else verify_stream(path))
+            assert result.ok, result.detail
+            print(f"{label:<10} {t_head * 1000:>10.1f} {t_tail * 1000:>10.1f} {n:>9,} "
+                  f"{t_scan:>12.2f} {t_ver:>9.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
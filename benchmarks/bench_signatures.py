@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+bench_signatures.py — batch signature verification throughput (twff_sign.py)
+
+Exports --containers small signed .twff files (ProcessLog, --events each),
+then times twff_sign.verify_many() per worker count: signature only (tail
+read of _integrity) and with --chain (full chain re-verification), next to
+the raw Ed25519 verify rate with and without the parsed-key cache.
+
+Needs the `cryptography` package.
+
+Usage:
+    python benchmarks/bench_signatures.py [--containers 2000] [--events 200] [--workers 1,2,4,8]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+
+from _common import fmt_rate, synthetic_events
+
+import twff_sign
+from components.process_log import ProcessLog
+
+
+def write_containers(tmp: str, n: int, events: int) -> list[str]:
+    paths = []
+    for c in range(n):
+        log = ProcessLog()
+        for etype, meta, _ in synthetic_events(events, seed=c):
+            log.log_event(etype, meta)
+        log.log_event("session_end")
+        path = os.path.join(tmp, f"s{c:05d}.twff")
+        with open(path, "wb") as f:
+            f.write(log.export("<p>benchmark</p>"))
+        paths.append(path)
+    return paths
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--containers", type=int, default=2000)
+    parser.add_argument("--events", type=int, default=200)
+    parser.add_argument("--workers", default=",".join(
+        str(w) for w in (1, 2, 4, 8, 16, 32) if w <= (os.cpu_count() or 1)))
+    args = parser.parse_args()
+
+    if twff_sign.Ed25519PrivateKey is None:
+        print("cryptography not installed. Run: pip install cryptography")
+        return 2
+
+    with tempfile.TemporaryDirectory() as tmp:
+        twff_sign.generate_keypair(os.path.join(tmp, "author.key"))
+        key     = twff_sign.load_private_key(os.path.join(tmp, "author.key"))
+        trusted = twff_sign.load_trusted_keys([os.path.join(tmp, "author.pub")])
+        paths   = write_containers(tmp, args.containers, args.events)
+        for path in paths:
+            twff_sign.sign_container(path, key)
+        print(f"{len(paths):,} signed containers, {args.events:,} events each\n")
+
+        sig = twff_sign.sign_integrity({"head_hash": "0" * 64, "chain_length": 1}, key)
+        message = twff_sign.signed_message({"head_hash": "0" * 64, "chain_length": 1})
+        n = 5_000
+        t0 = time.perf_counter()
+        for _ in range(n):
+            twff_sign.Ed25519PublicKey.from_public_bytes(sig.public_key).verify(sig.value, message)
+        fresh = n / (time.perf_counter() - t0)
+        t0 = time.perf_counter()
+        for _ in range(n):
+            twff_sign._public_key(sig.public_key).verify(sig.value, message)
+        cached = n / (time.perf_counter() - t0)
+        print(f"Ed25519 verify: {fmt_rate(fresh)}/s parsing the key each time, "
+              f"{fmt_rate(cached)}/s with the key cache\n")
+
+        print(f"{'mode':<30} {'seconds':>8} {'containers/s':>13}")
+        for check_chain in (False, True):
+            for w in map(int, args.workers.split(",")):
+                t0 = time.perf_counter()
+                reports = list(twff_sign.verify_many(paths, w, trusted, check_chain))
+                t = time.perf_counter() - t0
+                assert all(r.ok for r in reports), [r.errors for r in reports if not r.ok][:3]
+                mode = f"{'chain + signature' if check_chain else 'signature only'}, {w} worker(s)"
+                print(f"{mode:<30} {t:>8.2f} {len(paths) / t:>13,.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
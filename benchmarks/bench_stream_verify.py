@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+bench_stream_verify.py — peak RSS and throughput: verify_process_log() vs stream_verify
+
+Writes a synthetic, correctly chained process-log.json of roughly --mib MiB
+(indent=2, as export() writes it), then verifies it in a fresh subprocess per
+mode and reports peak RSS (ru_maxrss) and events/s.
+
+Usage:
+    python benchmarks/bench_stream_verify.py [--mib 1024] [--skip-dict]
+
+--skip-dict skips json.load + verify_process_log(), which needs several times
+the file size in RAM.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from _common import fmt_rate, synthetic_events
+
+from verify_process_log import compute_event_hash, verify_process_log
+from stream_verify import verify_stream
+
+SESSION_ID = "bench-stream-verify"
+
+
+def write_log(path: str, target_bytes: int) -> int:
+    """Write a chained log of about target_bytes; returns the event count."""
+    prev, n = "", 0
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('{\n  "version": "0.1.0",\n'
+                f'  "session_id": "{SESSION_ID}",\n'
+                '  "user_id": "anon-bench",\n  "events": [')
+        while f.tell() < target_bytes:
+            for etype, meta, ts in synthetic_events(50_000, seed=n):
+                event = {"timestamp": ts, "type": etype, "meta": meta}
+                event["_hash"] = prev = compute_event_hash(event, prev, SESSION_ID)
+                f.write(("," if n else "") + "\n    "
+                        + json.dumps(event, indent=2).replace("\n", "\n    "))
+                n += 1
+        f.write("\n  ],\n  \"_integrity\": "
+                + json.dumps({"algorithm": "SHA-256-CHAIN", "chain_length": n,
+                              "head_hash": prev, "session_id": SESSION_ID}, indent=2)
+                .replace("\n", "\n  ")
+                + "\n}")
+    return n
+
+
+def child(mode: str, path: str) -> None:
+    t0 = time.perf_counter()
+    if mode == "dict":
+        with open(path) as f:
+            log = json.load(f)
+        ok, _ = verify_process_log(log)
+        events = len(log["events"])
+    else:
+        result = verify_stream(path)
+        ok, events = result.ok, result.events
+    elapsed = time.perf_counter() - t0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({"ok": ok, "events": events, "seconds": elapsed, "peak_mib": peak / 1024}))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--mib", type=int, default=1024)
+    parser.add_argument("--skip-dict", action="store_true")
+    parser.add_argument("--child", nargs=2, metavar=("MODE", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(*args.child)
+        return 0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "process-log.json")
+        n = write_log(path, args.mib * 2**20)
+        print(f"{os.path.getsize(path) / 2**20:,.0f} MiB, {n:,} events\n")
+        print(f"{'mode':<8} {'ok':>5} {'peak RSS MiB':>13} {'seconds':>8} {'events/s':>10}")
+        for mode in ([] if args.skip_dict else ["dict"]) + ["stream"]:
+            out = subprocess.run([sys.executable, __file__, "--child", mode, path],
+                                 capture_output=True, text=True, check=True).stdout
+            r = json.loads(out)
+            print(f"{mode:<8} {str(r['ok']):>5} {r['peak_mib']:>13.1f} {r['seconds']:>8.1f} "
+                  f"{fmt_rate(r['events'] / r['seconds']):>10}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+bench_tail_verify.py — re-verifying a growing log: full pass vs checkpoint
+
+Writes a chained process-log.json of --events events, verifies it once to get
+a Checkpoint, then re-exports it with --new more events (same prefix, as a
+re-export after more writing produces) and times stream_verify with and
+without the checkpoint.
+
+Usage:
+    python benchmarks/bench_tail_verify.py [--events 1000000] [--new 1000]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from _common import fmt_rate, synthetic_events
+
+from stream_verify import Checkpoint, verify_stream
+from twff_hash import compute_event_hash
+
+SESSION_ID = "bench-tail-verify"
+
+
+def write_log(path: str, events: list[dict]) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('{\n  "version": "0.1.0",\n'
+                f'  "session_id": "{SESSION_ID}",\n'
+                '  "user_id": "anon-bench",\n  "events": [')
+        for i, event in enumerate(events):
+            f.write(("," if i else "") + "\n    " + json.dumps(event, indent=2).replace("\n", "\n    "))
+        integrity = {"algorithm": "SHA-256-CHAIN", "chain_length": len(events),
+                     "head_hash": events[-1]["_hash"], "session_id": SESSION_ID}
+        f.write("\n  ],\n  \"_integrity\": "
+                + json.dumps(integrity, indent=2).replace("\n", "\n  ") + "\n}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--new", type=int, default=1_000)
+    args = parser.parse_args()
+
+    events, prev = [], ""
+    for etype, meta, ts in synthetic_events(args.events + args.new):
+        event = {"timestamp": ts, "type": etype, "meta": meta}
+        event["_hash"] = prev = compute_event_hash(event, prev, SESSION_ID)
+        events.append(event)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "process-log.json")
+        write_log(path, events[:args.events])
+        checkpoint = verify_stream(path).checkpoint
+        write_log(path, events)
+        print(f"{os.path.getsize(path) / 2**20:,.0f} MiB, {args.events:,} trusted + "
+              f"{args.new:,} new events\n")
+
+        print(f"{'mode':<28} {'seconds':>8} {'new events/s':>13}")
+        for name, cp in (("full pass", None),
+                         ("checkpoint (index, hash)", Checkpoint(checkpoint.index, checkpoint.hash)),
+                         ("checkpoint + offset", checkpoint)):
+            t0 = time.perf_counter()
+            result = verify_stream(path, checkpoint=cp)
+            t = time.perf_counter() - t0
+            assert result.ok, result.detail
+            print(f"{name:<28} {t:>8.3f} {fmt_rate(args.new / t):>13}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+stress_concurrent_ingest.py — many threads and coroutines appending while readers export
+
+Producers: OS threads (like run_in_executor callbacks) and asyncio coroutines
+(like NiceGUI handlers and ui.timer) call log_edit / log_event concurrently,
+with and without an EditCoalescer. Readers take snapshots, build to_dict() and
+verify the chain while appends continue; a final export() runs mid-stream.
+
+Every snapshot and the final container must verify per SPEC §5.2, contain
+each producer's events exactly once, and have strictly increasing timestamps.
+Exits 1 on any violation.
+
+Usage:
+    python benchmarks/stress_concurrent_ingest.py [--threads 16] [--tasks 64] [--per 2000]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import io
+import json
+import threading
+import time
+import zipfile
+
+from _common import fmt_rate
+from verify_process_log import verify_process_log
+
+from components.coalesce import EditCoalescer
+from components.process_log import ProcessLog
+
+
+def check(log_dict: dict, label: str) -> list[str]:
+    problems = []
+    ok, detail = verify_process_log(log_dict)
+    if not ok:
+        problems.append(f"{label}: {detail}")
+    if log_dict["_integrity"]["chain_length"] != len(log_dict["events"]):
+        problems.append(f"{label}: chain_length != len(events)")
+    ts = [e["timestamp"] for e in log_dict["events"]]
+    if any(a >= b for a, b in zip(ts, ts[1:])):
+        problems.append(f"{label}: timestamps not strictly increasing")
+    return problems
+
+
+def run(threads: int, tasks: int, per: int, coalesce: bool) -> list[str]:
+    log       = ProcessLog(user_id="anon-stress", coalescer=EditCoalescer() if coalesce else None)
+    problems  = []
+    stop      = threading.Event()
+    snapshots = 0
+
+    def thread_producer(tid: int) -> None:
+        for i in range(per):
+            if i % 10 == 0:
+                log.log_event("checkpoint", {"char_count_total": i, "producer": f"t{tid}", "seq": i})
+            else:
+                log.log_edit(i, i + 1, source=f"t{tid}")
+
+    async def task_producer(cid: int) -> None:
+        for i in range(per):
+            log.log_event("focus_change", {"duration_ms": i, "producer": f"c{cid}", "seq": i})
+            if i % 50 == 0:
+                await asyncio.sleep(0)
+
+    def reader() -> None:
+        nonlocal snapshots
+        while not stop.is_set():
+            snap = log.snapshot()
+            d = log.to_dict(snapshot=snap)
+            d["_integrity"] = log.integrity(snap)
+            problems.extend(check(d, f"snapshot@{len(snap)}"))
+            snapshots += 1
+
+    async def asyncio_side() -> None:
+        await asyncio.gather(*(task_producer(c) for c in range(tasks)))
+
+    readers = [threading.Thread(target=reader) for _ in range(2)]
+    workers = [threading.Thread(target=thread_producer, args=(t,)) for t in range(threads)]
+    for t in readers + workers:
+        t.start()
+    loop_thread = threading.Thread(target=lambda: asyncio.run(asyncio_side()))
+    loop_thread.start()
+
+    for t in workers:
+        t.join()
+    loop_thread.join()
+    data = log.export("<html/>")           # appends session_end, snapshots, serialises
+    stop.set()
+    for t in readers:
+        t.join()
+
+    d = json.loads(zipfile.ZipFile(io.BytesIO(data)).read("meta/process-log.json"))
+    problems.extend(check(d, "export"))
+
+    seen: dict[str, set] = {}
+    for e in d["events"]:
+        producer = e["meta"].get("producer")
+        if producer:
+            seq = seen.setdefault(producer, set())
+            if e["meta"]["seq"] in seq:
+                problems.append(f"export: duplicate event {producer}#{e['meta']['seq']}")
+            seq.add(e["meta"]["seq"])
+    expected_tagged = threads * ((per + 9) // 10) + tasks * per
+    got_tagged      = sum(len(s) for s in seen.values())
+    if got_tagged != expected_tagged:
+        problems.append(f"export: {got_tagged} tagged events, expected {expected_tagged}")
+    if not coalesce:
+        edits = sum(1 for e in d["events"] if e["type"] == "edit")
+        if edits != threads * per - threads * ((per + 9) // 10):
+            problems.append(f"export: {edits} edits, expected {threads * per - threads * ((per + 9) // 10)}")
+    print(f"  {'coalesced' if coalesce else 'raw':<10} {len(d['events']):>9,} events "
+          f"{snapshots:>5} verified snapshots")
+    return problems
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--tasks",   type=int, default=64)
+    parser.add_argument("--per",     type=int, default=2000)
+    args = parser.parse_args()
+
+    problems = []
+    for coalesce in (False, True):
+        t0 = time.perf_counter()
+        problems += run(args.threads, args.tasks, args.per, coalesce)
+        ops = (args.threads + args.tasks) * args.per
+        print(f"  {fmt_rate(ops / (time.perf_counter() - t0))} appends/s under contention")
+    for p in problems[:20]:
+        print("FAIL", p)
+    print("OK" if not problems else f"{len(problems)} problem(s)")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,400 @@
+"""
+binlog.py — Compact binary encoding of the process log (meta/process-log.bin)
+
+process-log.json stays the normative member; process-log.bin is an optional
+sidecar for bulk research pipelines. decode() rebuilds exactly the dict
+that json.loads(process-log.json) returns, so every event's _hash (and the
+whole SPEC §5.2 chain) verifies unchanged.
+
+Layout (integers little-endian):
+
+    b"TWFB" u8 version
+    u32 n   header JSON   — top-level fields before "events"
+    block*  b"B" u32 n  block JSON  column*
+    b"E"    u32 n   trailer JSON  — top-level fields after "events" (_integrity)
+
+A block holds up to `block_events` events in columns:
+
+    ts       timestamp delta from the previous event, microseconds
+    type     event-type code         (string table)
+    shape    meta-shape code         (shape table: ordered (key code, kind))
+    flags    per-event exceptions    (raw timestamp, no hash, extra keys, ...)
+    ints     integer / bool meta values, each a delta from the previous int
+             of the same event (so position_end is stored as the edit length)
+    strs     string meta values      (string table codes)
+    hashes   _hash as 32 raw bytes
+
+Each column is an array whose item width is the narrowest one that fits its
+values in that block (1, 2, 4 or 8 bytes). array.frombytes() reads it back
+at C speed, which per-value varints decoded in Python could not match. The
+block JSON carries new string-table and shape-table entries plus the rare
+values that fit no column (floats, nested objects, non-round-tripping
+timestamps, extra top-level keys). Tables carry over from block to block.
+
+Usage:
+    data = encode(json.load(open("process-log.json")))
+    log  = decode(data)                       # == the JSON document
+    for event in BinaryLogReader(data).events():
+        ...
+"""
+from __future__ import annotations
+
+import itertools
+import json
+import struct
+import sys
+from array import array
+from collections.abc import Iterator
+
+from components.clock import format_ns
+from components.event_store import _hash_bytes, iso_to_ns
+
+BINARY_LOG_MEMBER = "meta/process-log.bin"
+MAGIC   = b"TWFB"
+VERSION = 1
+
+_U32 = struct.Struct("<I")
+
+_KIND_INT  = "i"
+_KIND_BOOL = "b"
+_KIND_STR  = "s"
+_KIND_SIDE = "x"
+
+_RAW_TS    = 1   # timestamp does not round-trip through epoch-µs; kept verbatim
+_NO_HASH   = 2   # no canonical hex _hash; any _hash is among the extras
+_EXTRA     = 4   # top-level keys beyond timestamp/type/meta/_hash
+_NO_META   = 8   # event has no "meta" key
+_SIDE_META = 16  # meta is present but not an object
+_RAW_EVENT = 32  # no string type or no timestamp; the whole event is kept verbatim
+
+_INT64_MIN = -(2 ** 63)
+_INT64_MAX = 2 ** 63 - 1
+
+# Narrowest array typecode per item width, signed and unsigned.
+_SIGNED   = {array(t).itemsize: t for t in "qlihb"}
+_UNSIGNED = {array(t).itemsize: t for t in "QLIHB"}
+
+
+def _pack_column(values, signed: bool) -> bytes:
+    lo, hi = (min(values), max(values)) if len(values) else (0, 0)
+    for width in (1, 2, 4, 8):
+        bits = 8 * width
+        if signed and -(1 << (bits - 1)) <= lo and hi < (1 << (bits - 1)):
+            break
+        if not signed and hi < (1 << bits):
+            break
+    col = array((_SIGNED if signed else _UNSIGNED)[width], values)
+    if sys.byteorder == "big":
+        col.byteswap()
+    raw = col.tobytes()
+    return col.typecode.encode("ascii") + _U32.pack(len(raw)) + raw
+
+
+def _unpack_column(data, pos: int) -> tuple[array, int]:
+    typecode = chr(data[pos])
+    (size,) = _U32.unpack_from(data, pos + 1)
+    pos += 5
+    col = array(typecode)
+    col.frombytes(data[pos:pos + size])
+    if sys.byteorder == "big":
+        col.byteswap()
+    return col, pos + size
+
+
+# JSON strings may hold lone surrogates (browser text, paste previews). They
+# are not valid UTF-8, so both directions pass them through unchanged.
+def _json(obj) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8", "surrogatepass")
+
+
+def _loads(raw):
+    return json.loads(bytes(raw).decode("utf-8", "surrogatepass"))
+
+
+class BinaryLogWriter:
+    """
+    Streaming encoder: write(event) per event, then close(trailer). Memory
+    is bounded by one block.
+
+    Args:
+        fp:           Writable binary stream (e.g. a ZIP member opened for writing).
+        header:       Top-level fields that precede "events".
+        block_events: Events per block.
+    """
+
+    def __init__(self, fp, header: dict, block_events: int = 8192):
+        self._fp      = fp
+        self._block   = block_events
+        self._strings: dict[str, int] = {}
+        self._shapes: dict[tuple, int] = {}
+        self._prev_us = 0
+        self._reset()
+        raw = _json(header)
+        fp.write(MAGIC + bytes([VERSION]) + _U32.pack(len(raw)) + raw)
+
+    def _reset(self) -> None:
+        self._n       = 0
+        self._ts      = []
+        self._types   = []
+        self._shape   = []
+        self._flags   = []
+        self._ints    = []
+        self._strs    = []
+        self._hashes  = bytearray()
+        self._side    = []
+        self._new_strings = []
+        self._new_shapes  = []
+
+    def _intern(self, value: str) -> int:
+        code = self._strings.get(value)
+        if code is None:
+            code = self._strings[value] = len(self._strings)
+            self._new_strings.append(value)
+        return code
+
+    def write(self, event: dict) -> None:
+        if "timestamp" not in event or not isinstance(event.get("type"), str):
+            self._side.append(event)
+            self._ts.append(0)
+            self._types.append(0)
+            self._shape.append(0)
+            self._flags.append(_RAW_EVENT)
+            self._n += 1
+            if self._n == self._block:
+                self._flush()
+            return
+        flags = 0
+        ts    = event["timestamp"]
+        try:
+            us = iso_to_ns(ts) // 1000
+            if format_ns(us * 1000) != ts:
+                raise ValueError
+        except (TypeError, ValueError, AttributeError):
+            flags |= _RAW_TS
+            self._side.append(ts)
+            us = self._prev_us
+        self._ts.append(us - self._prev_us)
+        self._prev_us = us
+
+        self._types.append(self._intern(event["type"]))
+
+        meta  = event.get("meta")
+        shape = []
+        if "meta" not in event:
+            flags |= _NO_META
+        elif not isinstance(meta, dict):
+            flags |= _SIDE_META
+            self._side.append(meta)
+        else:
+            prev = 0
+            for key, value in meta.items():
+                kind = _KIND_SIDE
+                if type(value) in (int, bool) and _INT64_MIN <= value <= _INT64_MAX:
+                    if _INT64_MIN <= value - prev <= _INT64_MAX:
+                        kind = _KIND_INT if type(value) is int else _KIND_BOOL
+                elif type(value) is str:
+                    kind = _KIND_STR
+                if kind in (_KIND_INT, _KIND_BOOL):
+                    self._ints.append(int(value) - prev)
+                    prev = int(value)
+                elif kind == _KIND_STR:
+                    self._strs.append(self._intern(value))
+                else:
+                    self._side.append(value)
+                shape.append((self._intern(key), kind))
+        shape = tuple(shape)
+        code = self._shapes.get(shape)
+        if code is None:
+            code = self._shapes[shape] = len(self._shapes)
+            self._new_shapes.append(shape)
+        self._shape.append(code)
+
+        digest = _hash_bytes(event.get("_hash"))
+        if digest is None:
+            flags |= _NO_HASH
+        else:
+            self._hashes += digest
+        extra = {k: v for k, v in event.items()
+                 if k not in ("timestamp", "type", "meta") and not (k == "_hash" and digest)}
+        if extra:
+            flags |= _EXTRA
+            self._side.append(extra)
+
+        self._flags.append(flags)
+        self._n += 1
+        if self._n == self._block:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._n:
+            return
+        meta = _json({
+            "n":       self._n,
+            "strings": self._new_strings,
+            "shapes":  [[[k, kind] for k, kind in shape] for shape in self._new_shapes],
+            "side":    self._side,
+        })
+        parts = [b"B", _U32.pack(len(meta)), meta,
+                 _pack_column(self._ts, True),
+                 _pack_column(self._types, False),
+                 _pack_column(self._shape, False),
+                 _pack_column(self._flags, False),
+                 _pack_column(self._ints, True),
+                 _pack_column(self._strs, False),
+                 b"h", _U32.pack(len(self._hashes)), bytes(self._hashes)]
+        self._fp.write(b"".join(parts))
+        self._reset()
+
+    def close(self, trailer: dict | None = None) -> None:
+        """Flush the last block and write the trailer (e.g. {"_integrity": ...})."""
+        self._flush()
+        raw = _json(trailer or {})
+        self._fp.write(b"E" + _U32.pack(len(raw)) + raw)
+
+
+class BinaryLogReader:
+    """
+    Decoder over an encoded log held in memory (bytes, bytearray, mmap or a
+    memoryview, e.g. TwffContainer.view()).
+    """
+
+    def __init__(self, data):
+        self._data = memoryview(data)
+        if bytes(self._data[:4]) != MAGIC:
+            raise ValueError("not a TWFF binary log (bad magic)")
+        if self._data[4] != VERSION:
+            raise ValueError(f"unsupported TWFF binary log version {self._data[4]}")
+        (size,) = _U32.unpack_from(self._data, 5)
+        self.header: dict = _loads(self._data[9:9 + size])
+        self._first = 9 + size
+        self._trailer: dict | None = None
+
+    @property
+    def trailer(self) -> dict:
+        """Top-level fields after the events (found by skipping block frames)."""
+        if self._trailer is None:
+            for _ in self._frames():
+                pass
+        return self._trailer
+
+    def _frames(self) -> Iterator[tuple[int, int]]:
+        """Yield (block JSON start, block JSON size) per block; sets the trailer."""
+        data, pos = self._data, self._first
+        while True:
+            tag = data[pos]
+            (size,) = _U32.unpack_from(data, pos + 1)
+            if tag == ord("E"):
+                self._trailer = _loads(data[pos + 5:pos + 5 + size])
+                return
+            if tag != ord("B"):
+                raise ValueError(f"corrupt TWFF binary log at byte {pos}")
+            yield pos + 5, size
+            pos += 5 + size
+            for _ in range(6):
+                pos += 5 + _U32.unpack_from(data, pos + 1)[0]
+            pos += 5 + _U32.unpack_from(data, pos + 1)[0]
+
+    def _blocks(self) -> Iterator[tuple]:
+        """Decode blocks, keeping the string and shape tables across them."""
+        data = self._data
+        strings: list[str] = []
+        shapes: list[tuple] = []
+        for start, size in self._frames():
+            meta = _loads(data[start:start + size])
+            strings.extend(meta["strings"])
+            shapes.extend(tuple((strings[k], kind) for k, kind in shape) for shape in meta["shapes"])
+            pos = start + size
+            cols = []
+            for _ in range(6):
+                col, pos = _unpack_column(data, pos)
+                cols.append(col)
+            (hsize,) = _U32.unpack_from(data, pos + 1)
+            hashes = bytes(data[pos + 5:pos + 5 + hsize]).hex()
+            yield meta["n"], cols, hashes, meta["side"], strings, shapes
+
+    def timestamps_ns(self) -> array:
+        """
+        Epoch-ns of every event without materialising events. An event whose
+        timestamp is kept verbatim repeats the previous event's value.
+        """
+        out = array("q")
+        us = 0
+        for _, (ts, *_), _, _, _, _ in self._blocks():
+            block = list(itertools.accumulate(ts, initial=us))
+            out.extend(v * 1000 for v in block[1:])
+            us = block[-1]
+        return out
+
+    def event_types(self) -> list[str]:
+        """Type of every event, without materialising events."""
+        out = []
+        for _, (_, types, *_), _, _, strings, _ in self._blocks():
+            out.extend(strings[c] for c in types)
+        return out
+
+    def events(self) -> Iterator[dict]:
+        """Yield events equal to those in process-log.json."""
+        prev_us = 0
+        for n, (ts, types, shape_codes, flags, ints, strs), hashes, side, strings, shapes in self._blocks():
+            side = iter(side)
+            ip = sp = hp = 0
+            for i in range(n):
+                f  = flags[i]
+                if f & _RAW_EVENT:
+                    yield next(side)
+                    continue
+                us = prev_us + ts[i]
+                prev_us = us
+                if f & _RAW_TS:
+                    stamp = next(side)
+                else:
+                    stamp = format_ns(us * 1000)
+                event = {"timestamp": stamp, "type": strings[types[i]]}
+                if f & _SIDE_META:
+                    event["meta"] = next(side)
+                elif not f & _NO_META:
+                    meta = {}
+                    prev = 0
+                    for key, kind in shapes[shape_codes[i]]:
+                        if kind == _KIND_INT:
+                            prev += ints[ip]
+                            ip += 1
+                            meta[key] = prev
+                        elif kind == _KIND_STR:
+                            meta[key] = strings[strs[sp]]
+                            sp += 1
+                        elif kind == _KIND_BOOL:
+                            prev += ints[ip]
+                            ip += 1
+                            meta[key] = bool(prev)
+                        else:
+                            meta[key] = next(side)
+                    event["meta"] = meta
+                if not f & _NO_HASH:
+                    event["_hash"] = hashes[hp:hp + 64]
+                    hp += 64
+                if f & _EXTRA:
+                    event.update(next(side))
+                yield event
+
+    def to_dict(self) -> dict:
+        """The whole document, equal to json.loads(process-log.json)."""
+        return {**self.header, "events": list(self.events()), **self.trailer}
+
+
+def encode(log: dict, block_events: int = 8192) -> bytes:
+    """Encode a process-log dict (header fields, events, trailing fields)."""
+    import io
+
+    keys   = list(log)
+    split  = keys.index("events") if "events" in keys else len(keys)
+    buf    = io.BytesIO()
+    writer = BinaryLogWriter(buf, {k: log[k] for k in keys[:split]}, block_events)
+    for event in log.get("events", ()):
+        writer.write(event)
+    writer.close({k: log[k] for k in keys[split + 1:]})
+    return buf.getvalue()
+
+
+def decode(data) -> dict:
+    return BinaryLogReader(data).to_dict()
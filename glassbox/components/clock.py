@@ -0,0 +1,78 @@
+"""
+clock.py — Monotonic event clock and fast ISO-8601 rendering
+
+ProcessLog timestamps are integer epoch-nanoseconds taken from a wall-clock
+anchor advanced by time.monotonic_ns(), so:
+
+  - a wall clock stepped backwards (NTP, DST bugs, manual change) can never
+    reorder events;
+  - every timestamp is strictly greater than the previous one (1 µs apart at
+    minimum), so spec §4.2 chronological ordering holds even for events logged
+    in the same microsecond.
+
+The clock only re-anchors forwards, when the wall clock has run ahead of the
+monotonic estimate by more than RESYNC_TOLERANCE_NS.
+
+format_ns() renders "YYYY-MM-DDTHH:MM:SS.ffffffZ", caching the per-second
+prefix, which is several times cheaper than datetime.utcnow().isoformat().
+"""
+from __future__ import annotations
+
+import time
+
+_US = 1_000
+_S  = 1_000_000_000
+
+RESYNC_INTERVAL_NS  = 60 * _S
+RESYNC_TOLERANCE_NS = 1 * _S
+
+# (second, "YYYY-MM-DDTHH:MM:SS.") — one tuple so concurrent readers never
+# pair a second with another second's prefix.
+_prefix: tuple[int, str] = (-1, "")
+
+
+def format_ns(ns: int) -> str:
+    """Render epoch-ns as a UTC ISO-8601 string with microseconds and 'Z'."""
+    global _prefix
+    second, rem = divmod(ns, _S)
+    cached = _prefix
+    if cached[0] != second:
+        cached = _prefix = (second, time.strftime("%Y-%m-%dT%H:%M:%S.", time.gmtime(second)))
+    return f"{cached[1]}{rem // _US:06d}Z"
+
+
+def format_many(values) -> list[str]:
+    """Bulk-render an iterable of epoch-ns values."""
+    return [format_ns(ns) for ns in values]
+
+
+class MonotonicClock:
+    """
+    Strictly increasing epoch-ns clock, immune to backwards wall-clock jumps.
+
+    Args:
+        floor_ns: Timestamps will be strictly greater than this (used when
+                  resuming a recovered session).
+    """
+
+    def __init__(self, floor_ns: int = 0):
+        self._anchor()
+        self._last = floor_ns - floor_ns % _US
+
+    def now_ns(self) -> int:
+        mono = time.monotonic_ns()
+        ns   = self._wall0 + (mono - self._mono0)
+        if mono - self._mono0 >= RESYNC_INTERVAL_NS:
+            wall = time.time_ns()
+            if wall - ns > RESYNC_TOLERANCE_NS:
+                ns = wall
+            self._wall0, self._mono0 = ns, mono
+        ns -= ns % _US
+        if ns <= self._last:
+            ns = self._last + _US
+        self._last = ns
+        return ns
+
+    def _anchor(self) -> None:
+        self._wall0 = time.time_ns()
+        self._mono0 = time.monotonic_ns()
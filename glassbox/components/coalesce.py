@@ -0,0 +1,114 @@
+"""
+coalesce.py — Edit-burst coalescing for ProcessLog
+
+A keystroke-level integration calls ProcessLog.log_edit() once per character.
+EditCoalescer sits in front of the log and folds a burst of contiguous
+same-source edits into one `edit` event covering the union of their ranges:
+
+    position rule  the new edit touches or overlaps the burst's range
+                   (within `max_gap` characters on either side)
+    time rule      it arrives within `window_ms` of the previous edit and
+                   within `max_span_ms` of the burst's first edit
+
+The merged event keeps the spec §4.3 `edit` meta exactly —
+position_start, position_end, source — and the timestamp (epoch-ns) of the
+burst's first keystroke, so events stay chronologically ordered.
+"""
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+
+from components.clock import format_ns
+
+
+@dataclass
+class _Burst:
+    position_start: int
+    position_end:   int
+    source:         str
+    timestamp_ns:   int
+    first_ms:       float
+    last_ms:        float
+    edits:          int = 1
+
+
+@dataclass
+class EditCoalescer:
+    window_ms:   float = 1000.0
+    max_span_ms: float = 5000.0
+    max_gap:     int   = 0
+
+    edits_in:  int = field(default=0, init=False)
+    edits_out: int = field(default=0, init=False)
+    _burst: _Burst | None = field(default=None, init=False, repr=False)
+
+    #  Public
+
+    def offer(self, position_start: int, position_end: int, source: str,
+              timestamp_ns: int, now_ms: float | None = None) -> tuple[dict, int] | None:
+        """
+        Feed one raw edit.
+
+        Returns:
+            (meta, timestamp_ns) of a finished burst that must be logged now, or
+            None if the edit was absorbed into the open burst.
+        """
+        if now_ms is None:
+            now_ms = time.monotonic() * 1000
+        self.edits_in += 1
+
+        burst = self._burst
+        if burst is not None and self._joins(burst, position_start, position_end, source, now_ms):
+            burst.position_start = min(burst.position_start, position_start)
+            burst.position_end   = max(burst.position_end, position_end)
+            burst.last_ms        = now_ms
+            burst.edits         += 1
+            return None
+
+        finished    = self.flush()
+        self._burst = _Burst(position_start, position_end, source, timestamp_ns, now_ms, now_ms)
+        return finished
+
+    def flush(self) -> tuple[dict, int] | None:
+        """Close the open burst, if any. Returns (meta, timestamp_ns) to log."""
+        burst, self._burst = self._burst, None
+        if burst is None:
+            return None
+        self.edits_out += 1
+        return {
+            "position_start": burst.position_start,
+            "position_end":   burst.position_end,
+            "source":         burst.source,
+        }, burst.timestamp_ns
+
+    def pending(self) -> dict | None:
+        """The open burst as an (unhashed) event dict, for display only."""
+        burst = self._burst
+        if burst is None:
+            return None
+        return {
+            "timestamp": format_ns(burst.timestamp_ns),
+            "type": "edit",
+            "meta": {
+                "position_start": burst.position_start,
+                "position_end":   burst.position_end,
+                "source":         burst.source,
+            },
+        }
+
+    @property
+    def compression_ratio(self) -> float:
+        """Raw edits offered per edit event emitted."""
+        return self.edits_in / self.edits_out if self.edits_out else 0.0
+
+    #  Private
+
+    def _joins(self, burst: _Burst, start: int, end: int, source: str, now_ms: float) -> bool:
+        return (
+            source == burst.source
+            and now_ms - burst.last_ms  <= self.window_ms
+            and now_ms - burst.first_ms <= self.max_span_ms
+            and start <= burst.position_end + self.max_gap
+            and end   >= burst.position_start - self.max_gap
+        )
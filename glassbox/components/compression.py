@@ -0,0 +1,114 @@
+"""
+compression.py — Per-member compression policy for .twff containers
+
+ProcessLog.export() used to deflate every member at zlib's default level.
+A CompressionPolicy decides per member instead:
+
+    already-compressed media    .png .jpg .webp .pdf .mp4 … → ZIP_STORED
+    meta/process-log.json       deflate at log_level (bulk of the archive),
+    meta/process-log/*          as are the segments of a segmented log
+    small text members          xhtml, xml, json, … → deflate at text_level
+    anything else               deflate at default_level, or stored when a
+                                sample does not compress (sniff=True)
+
+Presets (benchmarks/bench_compression.py, 200,000-event export):
+
+    DEFAULT_POLICY    log at level 6                 same size as before
+    FAST_POLICY       log at level 1                 ~1/3 faster export, ~14% larger
+    SMALLEST_POLICY   level 9 throughout             ~15% slower export, ~2% smaller
+
+Every member remains standard ZIP deflate or stored, so any unzip tool can
+read the container (SPEC §3.2).
+"""
+from __future__ import annotations
+
+import os
+import time
+import zipfile
+import zlib
+from dataclasses import dataclass
+
+from twff_json import PROCESS_LOG_MEMBER, SEGMENT_PREFIX
+
+# Formats that carry their own compression; deflating them again only costs time.
+STORED_SUFFIXES = frozenset({
+    ".png", ".jpg", ".jpeg", ".gif", ".webp", ".avif", ".heic",
+    ".mp3", ".m4a", ".ogg", ".opus", ".mp4", ".m4v", ".webm", ".mov",
+    ".zip", ".gz", ".bz2", ".xz", ".zst", ".7z", ".pdf", ".woff", ".woff2",
+})
+
+TEXT_SUFFIXES = frozenset({
+    ".xhtml", ".html", ".xml", ".json", ".txt", ".md", ".tex", ".bib", ".css", ".svg", ".csv",
+})
+
+# sniff=True: store a member whose first _SNIFF_BYTES deflate to more than
+# this fraction of their size at level 1.
+_SNIFF_BYTES = 64 * 1024
+_SNIFF_RATIO = 0.95
+
+
+@dataclass(frozen=True)
+class CompressionPolicy:
+    """
+    Chooses ZIP compression per member name (and, with sniff, per content).
+
+    Args:
+        log_level:     Deflate level for meta/process-log.json or its segments (0 = store).
+        text_level:    Deflate level for small text members.
+        default_level: Deflate level for everything else.
+        sniff:         Store unknown members whose sample does not compress.
+    """
+    log_level:     int = 6
+    text_level:    int = 9
+    default_level: int = 6
+    sniff:         bool = True
+    stored_suffixes: frozenset[str] = STORED_SUFFIXES
+
+    def choose(self, name: str, data: bytes | None = None) -> tuple[int, int | None]:
+        """(compress_type, compresslevel) for a member."""
+        suffix = os.path.splitext(name)[1].lower()
+        if suffix in self.stored_suffixes:
+            return zipfile.ZIP_STORED, None
+        if name == PROCESS_LOG_MEMBER or name.startswith(SEGMENT_PREFIX):
+            level = self.log_level
+        elif suffix in TEXT_SUFFIXES:
+            level = self.text_level
+        else:
+            level = self.default_level
+            if self.sniff and data is not None and not _compresses(data):
+                return zipfile.ZIP_STORED, None
+        if level == 0:
+            return zipfile.ZIP_STORED, None
+        return zipfile.ZIP_DEFLATED, level
+
+    def zip_info(self, name: str, data: bytes | None = None,
+                 date_time: tuple[int, int, int, int, int, int] | None = None) -> zipfile.ZipInfo:
+        """
+        A ZipInfo for ZipFile.writestr() / ZipFile.open(..., "w") under this
+        policy, stamped with `date_time` (default: now, local time).
+        """
+        info = zipfile.ZipInfo(name, date_time or time.localtime(time.time())[:6])
+        info.create_system = 3               # Unix, matching external_attr; not the host OS
+        info.compress_type, level = self.choose(name, data)
+        # Private attribute: ZipFile.open(info, "w") has no compresslevel
+        # argument and takes the level from here (writestr() does too, when
+        # not given one). Renamed compress_level in Python 3.13, which keeps
+        # this spelling as an alias; tests/test_compression.py checks the
+        # level really reaches the compressor.
+        info._compresslevel = level
+        info.external_attr = 0o600 << 16     # what writestr(str, ...) sets
+        return info
+
+
+def _compresses(data: bytes) -> bool:
+    sample = data[:_SNIFF_BYTES]
+    if not sample:
+        return True
+    packed = zlib.compressobj(1, zlib.DEFLATED, -15)
+    size = len(packed.compress(sample)) + len(packed.flush())
+    return size < len(sample) * _SNIFF_RATIO
+
+
+DEFAULT_POLICY  = CompressionPolicy()
+FAST_POLICY     = CompressionPolicy(log_level=1, text_level=6, default_level=1)
+SMALLEST_POLICY = CompressionPolicy(log_level=9, text_level=9, default_level=9)
@@ -0,0 +1,190 @@
+"""
+container.py — Random-access reader for .twff containers
+
+TwffContainer opens a .twff once and reads only what is asked for. Opening
+parses the ZIP central directory and nothing else, so member names, sizes
+and compression methods are known without inflating anything. Each accessor
+decompresses its own member the first time it is used:
+
+    content      content/document.xhtml      (str)
+    log          meta/process-log.json       (ProcessLogReader: header now, events streamed;
+                 or meta/process-log/         a segmented log reads one part at a time)
+    manifest     meta/manifest.xml           (list of item dicts)
+    signatures   META-INF/signatures.xml     (str, or None when unsigned)
+
+A container on local disk is memory-mapped: the OS pages in the central
+directory and the member being read, and a stored (uncompressed) member can
+be viewed in place with view(). Anything else (a file object, bytes, or a
+path that cannot be mapped) is read through an ordinary file.
+
+Usage:
+    with TwffContainer("essay.twff") as twff:
+        print(twff.names())
+        print(twff.log.session_id, twff.log.start_time)   # inflates ~64 KiB
+        if twff.signatures is None:
+            print("unsigned")
+"""
+from __future__ import annotations
+
+import functools
+import io
+import mmap
+import os
+import struct
+import xml.etree.ElementTree as ET
+import zipfile
+
+from components.log_reader import ProcessLogReader
+
+CONTENT_MEMBER    = "content/document.xhtml"
+MANIFEST_MEMBER   = "meta/manifest.xml"
+SIGNATURES_MEMBER = "META-INF/signatures.xml"
+
+# ZIP local file header: fixed part, then file name and extra field.
+_LOCAL_HEADER = struct.Struct("<4s22xHH")
+
+
+class _MappedFile:
+    """The read-only file interface zipfile needs, over an mmap."""
+
+    def __init__(self, mapped: mmap.mmap):
+        self._map = mapped
+
+    def read(self, n: int = -1) -> bytes:
+        return self._map.read(n)
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        self._map.seek(offset, whence)
+        return self._map.tell()
+
+    def tell(self) -> int:
+        return self._map.tell()
+
+    def seekable(self) -> bool:
+        return True
+
+
+class TwffContainer:
+    """
+    Lazy, random-access view of a .twff container.
+
+    Args:
+        source:   Path, bytes, or a seekable binary file object.
+        use_mmap: Memory-map a path on local disk (default True).
+    """
+
+    def __init__(self, source, use_mmap: bool = True):
+        self.path   = source if isinstance(source, (str, os.PathLike)) else None
+        self._file  = None
+        self._map   = None
+        if self.path is not None:
+            self._file = open(self.path, "rb")
+            if use_mmap:
+                try:
+                    self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+                except (OSError, ValueError):   # empty file, pipe, unmappable FS
+                    self._map = None
+            fp = _MappedFile(self._map) if self._map is not None else self._file
+        elif isinstance(source, (bytes, bytearray, memoryview)):
+            fp = io.BytesIO(source)
+        else:
+            fp = source
+        try:
+            self._zip = zipfile.ZipFile(fp)
+        except BaseException:
+            self._release()
+            raise
+
+    #  Central directory
+
+    @property
+    def mapped(self) -> bool:
+        return self._map is not None
+
+    def names(self, prefix: str = "") -> list[str]:
+        """Member names in archive order, optionally under a prefix (e.g. "meta/")."""
+        return [n for n in self._zip.namelist() if n.startswith(prefix)]
+
+    def info(self, name: str) -> zipfile.ZipInfo:
+        """Central-directory entry (sizes, CRC, compression) for a member."""
+        return self._zip.getinfo(name)
+
+    def __contains__(self, name: str) -> bool:
+        try:
+            self._zip.getinfo(name)
+        except KeyError:
+            return False
+        return True
+
+    #  Members
+
+    def open(self, name: str):
+        """Stream a member, decompressing as it is read."""
+        return self._zip.open(name)
+
+    def read(self, name: str) -> bytes:
+        return self._zip.read(name)
+
+    def view(self, name: str) -> memoryview:
+        """
+        A member's bytes. Zero-copy for a stored member of a mapped container;
+        otherwise the member is read (and inflated) into a new buffer.
+        """
+        info = self._zip.getinfo(name)
+        if self._map is None or info.compress_type != zipfile.ZIP_STORED or info.flag_bits & 0x1:
+            return memoryview(self.read(name))
+        start = info.header_offset
+        magic, name_len, extra_len = _LOCAL_HEADER.unpack_from(self._map, start)
+        if magic != zipfile.stringFileHeader:
+            raise zipfile.BadZipFile(f"bad local header for {name!r}")
+        start += _LOCAL_HEADER.size + name_len + extra_len
+        return memoryview(self._map)[start:start + info.file_size]
+
+    #  Layout accessors (SPEC §3.2)
+
+    @functools.cached_property
+    def content(self) -> str:
+        return self.read(CONTENT_MEMBER).decode("utf-8")
+
+    @functools.cached_property
+    def log(self) -> ProcessLogReader:
+        """Process log reader sharing this container's archive."""
+        return ProcessLogReader(self.path, archive=self._zip)
+
+    @functools.cached_property
+    def manifest(self) -> list[dict]:
+        """<item> entries of meta/manifest.xml as attribute dicts ([] if absent)."""
+        if MANIFEST_MEMBER not in self:
+            return []
+        root = ET.fromstring(self.read(MANIFEST_MEMBER))
+        return [dict(item.attrib) for item in root.iter("item")]
+
+    @functools.cached_property
+    def signatures(self) -> str | None:
+        """META-INF/signatures.xml, or None for an unsigned container."""
+        if SIGNATURES_MEMBER not in self:
+            return None
+        return self.read(SIGNATURES_MEMBER).decode("utf-8")
+
+    #  Lifecycle
+
+    def close(self) -> None:
+        self._zip.close()
+        self._release()
+
+    def _release(self) -> None:
+        if self._map is not None:
+            try:
+                self._map.close()
+            except BufferError:
+                pass    # a view() is still alive; the map closes with it
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "TwffContainer":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -534,7 +534,7 @@ class Editor:
         dlg.open()
 
     def cmd_show_word_count(self) -> None:
-        ai_count = sum(1 for e in self.process_log.events if e["type"] == "ai_interaction")
+        ai_count = self.process_log.count("ai_interaction")
         with ui.dialog() as dlg, ui.card().classes("post-export-dialog"):
             ui.label("Document Stats").classes("dialog-title")
             with ui.column().classes("gap-1"):
@@ -635,9 +635,7 @@ class Editor:
                     ui.separator()
 
                     # Stats summary
-                    ai_count = sum(
-                        1 for e in self.process_log.events if e["type"] == "ai_interaction"
-                    )
+                    ai_count = self.process_log.count("ai_interaction")
                     ui.label("Session Stats").classes("text-xs font-bold uppercase tracking-wider text-gray-500")
                     ui.label(f"{self.word_count:,} words").classes("text-xs text-gray-600")
                     ui.label(f"{ai_count} AI interactions").classes("text-xs text-gray-600")
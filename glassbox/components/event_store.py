@@ -0,0 +1,439 @@
+"""
+event_store.py — Compact columnar storage for ProcessLog events
+
+ProcessLog keeps its events as a plain list of dicts by default. For long
+sessions (tens of thousands of edits) each of those dicts, its meta dict and
+its ISO timestamp string cost several hundred bytes of interpreter overhead.
+
+ColumnarEventStore keeps the same information in typed arrays instead:
+
+    timestamps   int64 epoch-nanoseconds          array('q')
+    event types  small enum code                  array('B')
+    meta shape   interned tuple of (key, kind)    array('H')
+    int fields   positions, counts, durations     array('q') pool
+    str fields   low-cardinality strings          array('I') pool of interned codes
+    rare fields  previews, floats, nested values  side table {index: {key: value}}
+    _hash        SPEC §5.2 chain hash             bytearray, 32 raw bytes per event
+
+It implements the read-only Sequence protocol plus append(), so callers that
+iterate ProcessLog.events, index it or take len() keep working unchanged.
+Events are materialised as fresh dicts on access; mutating a returned dict
+does not change the stored event.
+
+SpillingEventStore bounds memory instead: past a ceiling, older events are
+sealed into compressed on-disk segments and only the tail stays resident.
+"""
+from __future__ import annotations
+
+import bisect
+import datetime
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import weakref
+from array import array
+from collections.abc import Iterator, Sequence
+from dataclasses import asdict, dataclass
+
+from components.clock import format_many, format_ns
+
+# Spec §4.3 event types. Codes are positional; unknown types are appended.
+EVENT_TYPES = (
+    "session_start",
+    "session_end",
+    "edit",
+    "paste",
+    "ai_interaction",
+    "chat_interaction",
+    "focus_change",
+    "checkpoint",
+)
+
+# Meta keys whose string values come from a small vocabulary and are worth
+# interning (e.g. source="human", acceptance="fully_accepted").
+INTERNED_META_KEYS = frozenset({"source", "interaction_type", "model", "acceptance", "source_file"})
+
+_KIND_INT  = "i"
+_KIND_STR  = "s"
+_KIND_SIDE = "x"
+
+_INT64_MIN = -(2 ** 63)
+_INT64_MAX = 2 ** 63 - 1
+
+_NO_HASH = bytes(32)
+
+_EPOCH = datetime.datetime(1970, 1, 1)
+_US    = datetime.timedelta(microseconds=1)
+
+
+def iso_to_ns(ts: str) -> int:
+    """Parse a UTC ISO-8601 timestamp (trailing 'Z' optional) to epoch-ns."""
+    dt = datetime.datetime.fromisoformat(ts[:-1] if ts.endswith("Z") else ts)
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return ((dt - _EPOCH) // _US) * 1000
+
+
+# Render epoch-ns the way ProcessLog writes timestamps.
+ns_to_iso = format_ns
+
+
+def _hash_bytes(value) -> bytes | None:
+    """Raw digest for a lowercase 64-char hex _hash, else None (kept verbatim)."""
+    if not isinstance(value, str) or len(value) != 64:
+        return None
+    try:
+        digest = bytes.fromhex(value)
+    except ValueError:
+        return None
+    return digest if digest.hex() == value else None
+
+
+class ColumnarEventStore(Sequence):
+    """Array-backed, append-only store presenting a list-of-dicts view."""
+
+    def __init__(self, events: list[dict] | None = None):
+        self._types: list[str]          = list(EVENT_TYPES)
+        self._type_codes: dict[str, int] = {t: i for i, t in enumerate(self._types)}
+        self._shapes: list[tuple]        = []
+        self._shape_codes: dict[tuple, int] = {}
+        self._strings: list[str]         = []
+        self._string_codes: dict[str, int] = {}
+
+        self._ts      = array("q")
+        self._type    = array("B")
+        self._shape   = array("H")
+        self._ints    = array("q")
+        self._int_off = array("I")
+        self._strs    = array("I")
+        self._str_off = array("I")
+        self._hashes  = bytearray()
+
+        self._side: dict[int, dict]   = {}   # index -> rare meta fields
+        self._raw_ts: dict[int, str]  = {}   # index -> timestamp that does not round-trip
+        self._extra: dict[int, dict]  = {}   # index -> top-level keys beyond timestamp/type/meta
+        self._no_hash: set[int]       = set()  # indices stored without a _hash
+
+        for event in events or ():
+            self.append(event)
+
+    #  Sequence protocol
+
+    def __len__(self) -> int:
+        return len(self._type)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._materialise(i) for i in range(*index.indices(len(self)))]
+        n = len(self)
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("event index out of range")
+        return self._materialise(index)
+
+    def __iter__(self) -> Iterator[dict]:
+        for i in range(len(self)):
+            yield self._materialise(i)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (list, ColumnarEventStore)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    #  Mutation
+
+    def append(self, event: dict, timestamp_ns: int | None = None) -> None:
+        """
+        Store one event. ProcessLog passes timestamp_ns (the value its
+        timestamp string was rendered from) to skip re-parsing it.
+        """
+        index = len(self)
+        ts    = event["timestamp"]
+        etype = event["type"]
+        meta  = event.get("meta") or {}
+
+        if timestamp_ns is not None:
+            ns = timestamp_ns
+        else:
+            try:
+                ns = iso_to_ns(ts)
+                if ns_to_iso(ns) != ts:
+                    self._raw_ts[index] = ts
+            except (TypeError, ValueError):
+                ns = 0
+                self._raw_ts[index] = ts
+
+        type_code = self._type_codes.get(etype)
+        if type_code is None:
+            type_code = len(self._types)
+            self._types.append(etype)
+            self._type_codes[etype] = type_code
+
+        shape = []
+        side  = None
+        self._int_off.append(len(self._ints))
+        self._str_off.append(len(self._strs))
+        for key, value in meta.items():
+            if type(value) is int and _INT64_MIN <= value <= _INT64_MAX:
+                shape.append((key, _KIND_INT))
+                self._ints.append(value)
+            elif key in INTERNED_META_KEYS and isinstance(value, str):
+                shape.append((key, _KIND_STR))
+                self._strs.append(self._intern(value))
+            else:
+                shape.append((key, _KIND_SIDE))
+                if side is None:
+                    side = {}
+                side[key] = value
+
+        shape = tuple(shape)
+        shape_code = self._shape_codes.get(shape)
+        if shape_code is None:
+            shape_code = len(self._shapes)
+            self._shapes.append(shape)
+            self._shape_codes[shape] = shape_code
+
+        extra = {k: v for k, v in event.items() if k not in ("timestamp", "type", "meta")}
+        digest = _hash_bytes(extra.pop("_hash", None))
+        if digest is None:
+            digest = _NO_HASH
+            self._no_hash.add(index)
+            if "_hash" in event:
+                extra["_hash"] = event["_hash"]
+
+        self._ts.append(ns)
+        self._type.append(type_code)
+        self._shape.append(shape_code)
+        self._hashes += digest
+        if side:
+            self._side[index] = side
+        if extra:
+            self._extra[index] = extra
+
+    #  Column accessors (no dict materialisation)
+
+    def type_at(self, index: int) -> str:
+        return self._types[self._type[index]]
+
+    def timestamp_ns_at(self, index: int) -> int:
+        return self._ts[index]
+
+    def hash_at(self, index: int) -> str:
+        if index in self._no_hash:
+            return self._extra.get(index, {}).get("_hash", "")
+        return self._hashes[index * 32:(index + 1) * 32].hex()
+
+    def nbytes(self) -> int:
+        """Approximate heap footprint of the typed columns (excludes side tables)."""
+        return len(self._hashes) + sum(
+            col.itemsize * len(col)
+            for col in (self._ts, self._type, self._shape, self._ints,
+                        self._int_off, self._strs, self._str_off)
+        )
+
+    #  Private helpers ─
+
+    def _intern(self, value: str) -> int:
+        code = self._string_codes.get(value)
+        if code is None:
+            code = len(self._strings)
+            self._strings.append(value)
+            self._string_codes[value] = code
+        return code
+
+    def timestamps(self) -> list[str]:
+        """All timestamps rendered in one pass."""
+        rendered = format_many(self._ts)
+        for index, raw in self._raw_ts.items():
+            rendered[index] = raw
+        return rendered
+
+    def _materialise(self, index: int) -> dict:
+        ts = self._raw_ts.get(index)
+        if ts is None:
+            ts = ns_to_iso(self._ts[index])
+
+        meta = {}
+        ip   = self._int_off[index]
+        sp   = self._str_off[index]
+        side = self._side.get(index)
+        for key, kind in self._shapes[self._shape[index]]:
+            if kind == _KIND_INT:
+                meta[key] = self._ints[ip]
+                ip += 1
+            elif kind == _KIND_STR:
+                meta[key] = self._strings[self._strs[sp]]
+                sp += 1
+            else:
+                meta[key] = side[key]
+
+        event = {"timestamp": ts, "type": self._types[self._type[index]], "meta": meta}
+        extra = self._extra.get(index)
+        if extra:
+            event.update(extra)
+        if index not in self._no_hash:
+            event["_hash"] = self._hashes[index * 32:(index + 1) * 32].hex()
+        return event
+
+
+class EventSnapshot(Sequence):
+    """
+    Read-only view of the first `length` events of an append-only store
+    (list or ColumnarEventStore), paired with the head_hash covering them.
+
+    Taking one copies nothing; events appended afterwards are invisible to it.
+    """
+
+    def __init__(self, events: Sequence, length: int, head_hash: str):
+        self._events   = events
+        self._length   = length
+        self.head_hash = head_hash
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._events[i] for i in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("event index out of range")
+        return self._events[index]
+
+    def __iter__(self) -> Iterator[dict]:
+        events = self._events
+        for i in range(self._length):
+            yield events[i]
+
+
+@dataclass(frozen=True)
+class Segment:
+    """A sealed, compressed run of events on disk, anchored into the hash chain."""
+    path:      str
+    start:     int    # index of the first event in the segment
+    count:     int
+    prev_hash: str    # _hash of the event just before `start` ("" for the first)
+    head_hash: str    # _hash of the segment's last event
+
+
+class SpillingEventStore(Sequence):
+    """
+    Append-only store with a memory ceiling.
+
+    Once `max_resident` events are held in memory, the oldest
+    `segment_events` of them are sealed into a gzip NDJSON segment file and
+    dropped from memory; only the tail stays resident. Each segment records
+    its hash-chain anchors (prev_hash in, head_hash out) so it can be checked
+    on its own. Indexing and iteration read segments back transparently (one
+    decoded segment is cached), so to_dict(), export() and snapshots work
+    unchanged.
+
+    Args:
+        max_resident:   Events kept in memory before sealing.
+        segment_events: Events per sealed segment (default: max_resident // 2).
+        directory:      Parent for the spill directory (default: the system temp
+                        dir). Each store writes to its own fresh subdirectory,
+                        so logs sharing a directory never collide; it is
+                        removed when the store is closed or collected.
+    """
+
+    def __init__(self, max_resident: int = 50_000, segment_events: int | None = None,
+                 directory: str | None = None):
+        if max_resident < 1:
+            raise ValueError("max_resident must be >= 1")
+        self.max_resident   = max_resident
+        self.segment_events = min(max_resident, segment_events or max(1, max_resident // 2))
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+        self.directory = tempfile.mkdtemp(prefix="twff-segments-", dir=directory)
+        self._cleanup  = weakref.finalize(self, shutil.rmtree, self.directory, True)
+        # (segments, segment starts, sealed_count, tail) swapped as one tuple so
+        # lock-free readers always see a consistent split between disk and memory.
+        self._state: tuple[tuple[Segment, ...], tuple[int, ...], int, list[dict]] = ((), (), 0, [])
+        self._cache: tuple[Segment | None, list[dict]] = (None, [])
+
+    #  Sequence protocol
+
+    def __len__(self) -> int:
+        _, _, sealed, tail = self._state
+        return sealed + len(tail)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        segments, starts, sealed, tail = self._state
+        n = sealed + len(tail)
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("event index out of range")
+        if index >= sealed:
+            return tail[index - sealed]
+        segment = segments[bisect.bisect_right(starts, index) - 1]
+        return self._load(segment)[index - segment.start]
+
+    def __iter__(self) -> Iterator[dict]:
+        segments, _, _, tail = self._state
+        resident = len(tail)
+        for segment in segments:
+            yield from self._read(segment)
+        for i in range(resident):
+            yield tail[i]
+
+    #  Mutation
+
+    def append(self, event: dict) -> None:
+        segments, starts, sealed, tail = self._state
+        tail.append(event)
+        if len(tail) >= self.max_resident:
+            self._seal(segments, starts, sealed, tail)
+
+    @property
+    def segments(self) -> tuple[Segment, ...]:
+        return self._state[0]
+
+    @property
+    def resident(self) -> int:
+        """Events currently held in memory."""
+        return len(self._state[3])
+
+    def close(self) -> None:
+        """Delete this store's spill directory and its segments."""
+        self._cleanup()
+
+    #  Private helpers ─
+
+    def _seal(self, segments: tuple, starts: tuple, sealed: int, tail: list[dict]) -> None:
+        chunk = tail[:self.segment_events]
+        path  = os.path.join(self.directory, f"segment-{len(segments):06d}.ndjson.gz")
+        segment = Segment(
+            path=path,
+            start=sealed,
+            count=len(chunk),
+            prev_hash=segments[-1].head_hash if segments else "",
+            head_hash=chunk[-1].get("_hash", ""),
+        )
+        with gzip.open(path + ".tmp", "wt", encoding="utf-8") as f:
+            f.write(json.dumps(asdict(segment), separators=(",", ":")) + "\n")
+            for event in chunk:
+                f.write(json.dumps(event, separators=(",", ":")) + "\n")
+        os.replace(path + ".tmp", path)
+        self._state = (segments + (segment,), starts + (sealed,), sealed + len(chunk),
+                       tail[len(chunk):])
+
+    def _read(self, segment: Segment) -> Iterator[dict]:
+        with gzip.open(segment.path, "rt", encoding="utf-8") as f:
+            next(f)                                   # segment header
+            for line in f:
+                yield json.loads(line)
+
+    def _load(self, segment: Segment) -> list[dict]:
+        cached_segment, events = self._cache
+        if cached_segment != segment:
+            events = list(self._read(segment))
+            self._cache = (segment, events)
+        return events
@@ -0,0 +1,152 @@
+"""
+journal.py — Append-only NDJSON journal for ProcessLog
+
+Each logged event is written as one compact JSON line as soon as it is
+appended, so a crashed browser tab or restarted server loses nothing that
+reached the OS. Durability against power loss is group-committed: the file is
+fsync'd once every `fsync_every` events or once the oldest unsynced event is
+`fsync_interval_ms` old, whichever comes first. The time bound is kept by a
+timer armed on the first unsynced event, so it holds even if no further event
+is appended.
+
+Layout:
+
+    {"twff_journal": 1, "version": ..., "session_id": ..., ...}   ← header (+ "options")
+    {"timestamp": ..., "type": ..., "meta": {...}, "_hash": ...}   ← one per event
+    ...
+
+ProcessLog.recover(path) replays the journal, re-verifying the hash chain,
+and restores the ProcessLog settings recorded under the header's "options".
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+
+JOURNAL_FORMAT = 1
+
+_HEADER_FIELDS = ("version", "session_id", "user_id", "start_time", "content_source", "algorithm")
+
+
+class JournalError(ValueError):
+    """Raised when a journal cannot be replayed (bad header or broken chain)."""
+
+
+class EventJournal:
+    """
+    Writer side of the journal.
+
+    Args:
+        path:              NDJSON file to create or append to.
+        fsync_every:       fsync after this many unsynced events (0 = never by count).
+        fsync_interval_ms: fsync when the oldest unsynced event is at least this old
+                           (0 = never by time).
+    """
+
+    def __init__(self, path: str, fsync_every: int = 64, fsync_interval_ms: float = 200.0):
+        self.path              = path
+        self.fsync_every       = fsync_every
+        self.fsync_interval_ms = fsync_interval_ms
+        self._file             = open(path, "ab", buffering=0)
+        self._pending          = 0
+        self._last_sync        = time.monotonic()
+        self._timer: threading.Timer | None = None
+        # append() and the interval timer both sync; one at a time.
+        self._lock             = threading.Lock()
+
+    @property
+    def is_empty(self) -> bool:
+        return self._file.tell() == 0
+
+    def write_header(self, header: dict) -> None:
+        line = {"twff_journal": JOURNAL_FORMAT}
+        line.update({k: header[k] for k in _HEADER_FIELDS})
+        if "options" in header:
+            line["options"] = header["options"]
+        self._write(line)
+        self.sync()
+
+    def append(self, event: dict) -> None:
+        with self._lock:
+            self._write(event)
+            self._pending += 1
+            if self.fsync_every and self._pending >= self.fsync_every:
+                self._sync()
+            elif (self.fsync_interval_ms
+                  and (time.monotonic() - self._last_sync) * 1000 >= self.fsync_interval_ms):
+                self._sync()
+            elif self.fsync_interval_ms and self._timer is None:
+                self._timer = threading.Timer(self.fsync_interval_ms / 1000, self._on_timer)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def sync(self) -> None:
+        """Force everything written so far to stable storage."""
+        with self._lock:
+            self._sync()
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._file.closed:
+                if self._pending:
+                    self._sync()
+                self._file.close()
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+    def _on_timer(self) -> None:
+        with self._lock:
+            self._timer = None
+            if self._pending and not self._file.closed:
+                self._sync()
+
+    def _sync(self) -> None:
+        os.fsync(self._file.fileno())
+        self._pending   = 0
+        self._last_sync = time.monotonic()
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _write(self, obj: dict) -> None:
+        self._file.write(json.dumps(obj, separators=(",", ":")).encode("utf-8") + b"\n")
+
+
+def read_journal(path: str) -> tuple[dict, list[dict], int]:
+    """
+    Parse a journal file.
+
+    A torn final line (crash mid-write) is dropped; any other undecodable line
+    raises JournalError.
+
+    Returns:
+        (header, events, valid_bytes) — valid_bytes is the length of the intact
+        prefix, so the writer can truncate a torn tail before appending again.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+
+    lines  = data.split(b"\n")
+    # Everything after the last newline is either empty or a torn write.
+    tail   = lines.pop()
+    valid  = len(data) - len(tail)
+    if not lines:
+        raise JournalError(f"{path}: empty journal")
+
+    try:
+        header = json.loads(lines[0])
+    except json.JSONDecodeError as e:
+        raise JournalError(f"{path}: unreadable header: {e}") from None
+    if header.get("twff_journal") != JOURNAL_FORMAT:
+        raise JournalError(f"{path}: not a TWFF journal (format {header.get('twff_journal')!r})")
+
+    events = []
+    for lineno, line in enumerate(lines[1:], start=2):
+        try:
+            events.append(json.loads(line))
+        except json.JSONDecodeError as e:
+            raise JournalError(f"{path}:{lineno}: corrupt event line: {e}") from None
+    return header, events, valid
@@ -0,0 +1,189 @@
+"""
+log_reader.py — Lazy reader for existing .twff containers
+
+ProcessLog.open(path) returns a ProcessLogReader. Header fields (everything
+that precedes "events" in meta/process-log.json — version, session_id,
+user_id, start_time, end_time, content_source) are available as soon as the
+reader is constructed; events come from a generator that inflates and decodes
+the ZIP member a chunk at a time, so a multi-megabyte log is never held in
+memory. Fields written after the events array (_integrity) are read by
+scanning past the events without keeping them.
+
+Usage:
+    with ProcessLog.open("essay.twff") as log:
+        print(log.session_id, log.start_time)
+        pastes = sum(1 for e in log.events() if e["type"] == "paste")
+        print(log.integrity["head_hash"])
+
+A bare process-log.json path is accepted too, and so is a container whose
+log is split into meta/process-log/part-NNNN.json segments (SPEC §3.5).
+There the header and _integrity come from meta/process-log/index.json, and
+segments / events_between() let a caller read only the parts it needs:
+
+    with ProcessLog.open("essay.twff") as log:
+        for event in log.events_between("2026-02-16T14:00:00Z", "2026-02-16T15:00:00Z"):
+            ...
+"""
+from __future__ import annotations
+
+import json
+import zipfile
+from collections.abc import Iterator
+
+from components.event_store import iso_to_ns
+
+from twff_json import PROCESS_LOG_MEMBER, SEGMENT_INDEX_MEMBER, JsonStream
+
+# Index fields that describe the segmentation rather than the session.
+_INDEX_FIELDS = ("segment_events", "segments", "_integrity")
+
+
+class ProcessLogReader:
+    """
+    Read-only, streaming view of the process log inside a .twff container.
+
+    Pass `archive` to read from an already open ZipFile (TwffContainer does);
+    the reader then leaves closing it to its owner.
+    """
+
+    def __init__(self, path: str | None, archive: zipfile.ZipFile | None = None):
+        self.path    = path
+        self._owns   = archive is None
+        self._zip    = archive if archive is not None else (
+            zipfile.ZipFile(path) if zipfile.is_zipfile(path) else None)
+        self._trailer: dict | None = None
+        self.header: dict = {}
+        self.segments: list[dict] = []
+        self.segmented = False
+        if self._zip is not None and _has_member(self._zip, SEGMENT_INDEX_MEMBER) \
+                and not _has_member(self._zip, PROCESS_LOG_MEMBER):
+            index = json.loads(self._zip.read(SEGMENT_INDEX_MEMBER))
+            self.header   = {k: v for k, v in index.items() if k not in _INDEX_FIELDS}
+            self.segments = index.get("segments") or []
+            self.segmented = True
+            self._trailer = {"_integrity": index.get("_integrity") or {}}
+            return
+        with self._open() as raw:
+            stream = JsonStream(raw)
+            for key in stream.members():
+                if key == "events":
+                    break
+                self.header[key] = stream.value()
+
+    #  Header fields
+
+    @property
+    def version(self) -> str:
+        return self.header.get("version", "")
+
+    @property
+    def session_id(self) -> str:
+        return self.header.get("session_id", "")
+
+    @property
+    def user_id(self) -> str:
+        return self.header.get("user_id", "")
+
+    @property
+    def start_time(self) -> str:
+        return self.header.get("start_time", "")
+
+    @property
+    def end_time(self) -> str:
+        return self.header.get("end_time", "")
+
+    @property
+    def content_source(self) -> str:
+        return self.header.get("content_source", "")
+
+    @property
+    def integrity(self) -> dict:
+        """The _integrity block. Scans past the events (not kept) on first use."""
+        return self.trailer.get("_integrity") or self.header.get("_integrity") or {}
+
+    @property
+    def trailer(self) -> dict:
+        """Top-level fields that follow the events array."""
+        if self._trailer is None:
+            for _ in self.events():
+                pass
+        return self._trailer
+
+    #  Events
+
+    def events(self) -> Iterator[dict]:
+        """Yield events in log order, decoding the member incrementally."""
+        if self.segmented:
+            for segment in self.segments:
+                yield from self.segment_events(segment)
+            return
+        with self._open() as raw:
+            stream  = JsonStream(raw)
+            trailer = {}
+            seen_events = False
+            for key in stream.members():
+                if key != "events":
+                    value = stream.value()
+                    if seen_events:
+                        trailer[key] = value
+                    continue
+                seen_events = True
+                yield from stream.items()
+            self._trailer = trailer
+
+    def segment_events(self, segment: dict) -> Iterator[dict]:
+        """Yield the events of one entry of `segments`, reading only its member."""
+        with self._zip.open(segment["href"]) as raw:
+            stream = JsonStream(raw)
+            for key in stream.members():
+                if key == "events":
+                    yield from stream.items()
+                else:
+                    stream.value()
+
+    def events_between(self, start: str | None = None, end: str | None = None) -> Iterator[dict]:
+        """
+        Yield events with start <= timestamp <= end (ISO-8601, either bound
+        optional). A segmented log skips every segment outside the range.
+        """
+        lo = iso_to_ns(start) if start else None
+        hi = iso_to_ns(end) if end else None
+
+        def inside(ts: str) -> bool:
+            ns = iso_to_ns(ts)
+            return (lo is None or ns >= lo) and (hi is None or ns <= hi)
+
+        if not self.segmented:
+            yield from (e for e in self.events() if inside(e["timestamp"]))
+            return
+        for segment in self.segments:
+            if lo is not None and iso_to_ns(segment["end_time"]) < lo:
+                continue
+            if hi is not None and iso_to_ns(segment["start_time"]) > hi:
+                break
+            yield from (e for e in self.segment_events(segment) if inside(e["timestamp"]))
+
+    #  Lifecycle
+
+    def close(self) -> None:
+        if self._zip is not None and self._owns:
+            self._zip.close()
+
+    def __enter__(self) -> "ProcessLogReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _open(self):
+        if self._zip is not None:
+            return self._zip.open(PROCESS_LOG_MEMBER)
+        return open(self.path, "rb")
+
+
+def _has_member(archive: zipfile.ZipFile, name: str) -> bool:
+    try:
+        archive.getinfo(name)
+    except KeyError:
+        return False
+    return True
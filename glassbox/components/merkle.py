@@ -0,0 +1,92 @@
+"""
+merkle.py — Incremental Merkle tree over process-log events (SPEC §5.7)
+
+Optional companion to the SPEC §5.2 chain. The chain proves a whole log; the
+tree lets a reviewer check ONE event against a published root with O(log n)
+hashes and without the rest of the log.
+
+Hashing follows RFC 9162 (Certificate Transparency v2) §2.1 so the tree shape
+and proof format are the standard ones:
+
+    leaf := SHA-256( 0x00 || UTF-8( JSON.compact_sorted(event_payload) + "|" + session_id ) )
+    node := SHA-256( 0x01 || left || right )
+
+where event_payload is the event without `_hash`, exactly as in §5.2. Both
+hashes come from twff_hash, which verify_merkle_proof.py uses too.
+
+MerkleTree stores every complete subtree hash as it is formed (one bytearray
+per level, ~64 bytes per event in total), so append is amortised O(1) and
+the root or an inclusion proof for any earlier tree size is O(log n).
+"""
+from __future__ import annotations
+
+from twff_hash import (
+    MERKLE_ALGORITHM as ALGORITHM,
+    MERKLE_EMPTY_ROOT,
+    merkle_leaf as leaf_hash,
+    merkle_node as node_hash,
+)
+
+_SIZE = 32
+
+
+class MerkleTree:
+    """Append-only RFC 9162 Merkle tree with historical roots and proofs."""
+
+    def __init__(self):
+        # _levels[k] holds the hashes of the complete 2**k-leaf subtrees, in order.
+        self._levels: list[bytearray] = [bytearray()]
+
+    def __len__(self) -> int:
+        return len(self._levels[0]) // _SIZE
+
+    def append(self, leaf: bytes) -> None:
+        level = 0
+        self._levels[0] += leaf
+        # Each time a level gains an even count, the last pair completes a parent.
+        while len(self._levels[level]) // _SIZE % 2 == 0:
+            hashes = self._levels[level]
+            parent = node_hash(hashes[-2 * _SIZE:-_SIZE], hashes[-_SIZE:])
+            level += 1
+            if level == len(self._levels):
+                self._levels.append(bytearray())
+            self._levels[level] += parent
+
+    def root(self, size: int | None = None) -> bytes:
+        """Root of the first `size` leaves (default: all). Empty tree → SHA-256("")."""
+        n = len(self) if size is None else size
+        if n == 0:
+            return MERKLE_EMPTY_ROOT
+        return self._subtree(0, n)
+
+    def inclusion_proof(self, index: int, size: int | None = None) -> list[bytes]:
+        """Audit path for leaf `index` in the tree of the first `size` leaves."""
+        n = len(self) if size is None else size
+        if not 0 <= index < n <= len(self):
+            raise IndexError(f"leaf {index} not in tree of size {n}")
+        path: list[bytes] = []
+        start = 0
+        # Walk down from the root, collecting the sibling at each split
+        # (RFC 9162 §2.1.3.1), then return them leaf-first.
+        while n > 1:
+            k = 1 << ((n - 1).bit_length() - 1)
+            if index < k:
+                path.append(self._subtree(start + k, n - k))
+                n = k
+            else:
+                path.append(self._subtree(start, k))
+                start, index, n = start + k, index - k, n - k
+        path.reverse()
+        return path
+
+    def leaf(self, index: int) -> bytes:
+        return bytes(self._levels[0][index * _SIZE:(index + 1) * _SIZE])
+
+    def _subtree(self, start: int, n: int) -> bytes:
+        """Hash of leaves [start, start + n). Perfect, aligned subtrees are stored."""
+        if n & (n - 1) == 0:
+            level = n.bit_length() - 1
+            i = (start >> level) * _SIZE
+            return bytes(self._levels[level][i:i + _SIZE])
+        k = 1 << ((n - 1).bit_length() - 1)
+        return node_hash(self._subtree(start, k), self._subtree(start + k, n - k))
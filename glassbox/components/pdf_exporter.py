@@ -160,7 +160,7 @@ class PDFExporter:
         )
 
         stats = self._stats()
-        ai_events = [e for e in self.process_log.events if e["type"] == "ai_interaction"]
+        ai_events = self.process_log.of_type("ai_interaction")
         ai_rows = "".join(
             f"<tr><td>{e['timestamp'][11:19]}</td>"
             f"<td>{e.get('meta',{}).get('interaction_type','—')}</td>"
@@ -317,7 +317,7 @@ class PDFExporter:
             f"{self.process_log.session_id[:8]}… · {self.process_log.start_time} UTC", code_s))
 
         story.append(Paragraph("AI Interaction Log", ap_sub))
-        ai_events = [e for e in self.process_log.events if e["type"] == "ai_interaction"]
+        ai_events = self.process_log.of_type("ai_interaction")
         if ai_events:
             hdr = [Paragraph(f"<b>{t}</b>", base["Normal"])
                    for t in ("Time","Type","Model","Output","Acceptance")]
@@ -419,18 +419,19 @@ class PDFExporter:
     # ── Stats helper ─
 
     def _stats(self) -> dict:
-        evts = self.process_log.events
+        log  = self.process_log
+        snap = log.snapshot()
         try:
-            start = self._ts(self.process_log.start_time)
-            ends  = [e for e in evts if e["type"] == "session_end"]
-            end   = self._ts(ends[-1]["timestamp"]) if ends else datetime.datetime.utcnow()
+            start = self._ts(log.start_time)
+            last  = log.last("session_end", snap)
+            end   = self._ts(last["timestamp"]) if last else datetime.datetime.utcnow()
             mins  = max(1, int((end - start).total_seconds() / 60))
         except Exception:
             mins = 0
         return {
-            "ai":    sum(1 for e in evts if e["type"] == "ai_interaction"),
-            "paste": sum(1 for e in evts if e["type"] == "paste"),
-            "edits": sum(1 for e in evts if e["type"] == "edit"),
+            "ai":    log.count("ai_interaction", snap),
+            "paste": log.count("paste", snap),
+            "edits": log.count("edit", snap),
             "mins":  mins,
         }
 
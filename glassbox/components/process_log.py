@@ -4,12 +4,37 @@ process_log.py — TWFF ProcessLog
 Core TWFF session recording logic, fully decoupled from NiceGUI / any UI framework.
 This module can be imported by the browser extension, LMS plugin, CLI tools, etc.
 """
-import datetime
+import bisect
+import collections
+import copy
+import functools
 import hashlib
 import io
+import itertools
 import json
+import mimetypes
+import threading
 import uuid
 import zipfile
+from array import array
+from xml.sax.saxutils import quoteattr
+
+from components.binlog import BINARY_LOG_MEMBER, BinaryLogWriter
+from components.clock import MonotonicClock, format_ns
+from components.coalesce import EditCoalescer
+from components.compression import DEFAULT_POLICY, CompressionPolicy
+from components.event_store import (
+    ColumnarEventStore,
+    EventSnapshot,
+    SpillingEventStore,
+    iso_to_ns,
+)
+from components.journal import EventJournal, JournalError, read_journal
+from components.log_reader import ProcessLogReader
+from components.merkle import ALGORITHM as MERKLE_ALGORITHM, MerkleTree, leaf_hash
+
+from twff_hash import DEFAULT_ALGORITHM, canonical_json, chain_hasher, payload_json
+from twff_json import PROCESS_LOG_MEMBER, SEGMENT_INDEX_MEMBER, SEGMENT_PREFIX
 
 #  Annotation type registry
 # Single source of truth. Drives: CSS class names, legend labels, log event types.
@@ -45,27 +70,243 @@ ANNOTATION_TYPES = {
 }
 
 
+# Events serialised per write to the ZIP member in export_to().
+_EXPORT_CHUNK_EVENTS = 512
+# Entry time of every member in a reproducible export: the earliest ZIP date.
+REPRODUCIBLE_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+
+def _event_chunks(events, anchor_every: int = 0, offsets: dict | None = None, base: int = 0):
+    """
+    Yield the elements of an events array, formatted exactly like indent=2
+    inside process-log.json, as UTF-8 chunks of _EXPORT_CHUNK_EVENTS events.
+    With anchor_every, the byte offset (counted from `base`) of every
+    anchor_every-th event is stored in offsets[index].
+    """
+    written = base
+    batch   = []
+    for i, event in enumerate(events):
+        sep = "\n    " if i == 0 else ",\n    "
+        if anchor_every and i % anchor_every == 0:
+            if batch:
+                chunk = "".join(batch).encode("utf-8")
+                yield chunk
+                written += len(chunk)
+                batch.clear()
+            offsets[i] = written + len(sep)
+        batch.append(sep + json.dumps(event, indent=2).replace("\n", "\n    "))
+        if len(batch) == _EXPORT_CHUNK_EVENTS:
+            chunk = "".join(batch).encode("utf-8")
+            yield chunk
+            written += len(chunk)
+            batch.clear()
+    if batch:
+        yield "".join(batch).encode("utf-8")
+
+
+def _counted(events, types: collections.Counter):
+    """Pass events through, counting their types into `types`."""
+    for event in events:
+        types[event["type"]] += 1
+        yield event
+
+
 class ProcessLog:
     """
     TWFF v0.1 process log.
 
     Instantiate once per writing session. Call log_event() as the user writes.
     Call export() to produce a .twff ZIP container as bytes.
+
+    Every event is chained into the SPEC §5.2 hash chain as it is appended, so
+    head_hash is always current and export() never re-hashes the log.
+
+    Pass columnar=True to keep events in a ColumnarEventStore (typed arrays)
+    instead of a list of dicts — same read API, a fraction of the memory for
+    long sessions. Pass max_resident_events=N instead to cap memory: older
+    events are sealed into compressed on-disk segments (SpillingEventStore)
+    and export() streams across them.
+
+    Pass an EventJournal to mirror every event to an append-only NDJSON file;
+    ProcessLog.recover(path) rebuilds the session from it after a crash, with
+    the settings it was started with. close() (or a with block) syncs the
+    journal and releases spilled segments.
+
+    Pass an EditCoalescer to fold keystroke-level log_edit() calls into one
+    edit event per burst of contiguous typing.
+
+    Timestamps come from a MonotonicClock (strictly increasing epoch-ns, immune
+    to the wall clock stepping backwards) and are rendered with format_ns().
+
+    Thread- and asyncio-safe: producers push requests onto a lock-free deque
+    and whichever producer holds the sequencer lock drains it, assigning
+    timestamps, order and hashes for everyone queued behind it (flat
+    combining). Readers call snapshot() for a consistent, zero-copy view.
+
+    Per-type position indexes are maintained on append, so count(),
+    of_type() and last() answer "how many AI interactions", "all pastes" or
+    "the last session_end" in O(1)/O(k) instead of rescanning the log.
+
+    Pass merkle=True to also maintain an RFC 9162 Merkle tree over the events
+    (SPEC §5.7): _integrity gains a "merkle" root and inclusion_proof(i)
+    yields a proof that one event is in the log, checkable in O(log n).
+
+    Pass anchor_every=N to record the chain hash entering every N-th event
+    (SPEC §5.8). export() lists these anchors, with their byte offsets in
+    process-log.json, in _integrity so verifiers can check the segments
+    between anchors in parallel and resume from the last good one. A
+    segmented export leaves them out; its parts carry their own anchors.
+
+    algorithm selects the chain digest (SPEC §5.9), e.g. "BLAKE2B-256-CHAIN";
+    the default SHA-256-CHAIN is what every v0.1 verifier expects.
     """
 
     SPEC_VERSION = "0.1.0"
 
-    def __init__(self, user_id: str | None = None):
+    def __init__(self, user_id: str | None = None, columnar: bool = False,
+                 journal: EventJournal | None = None,
+                 coalescer: EditCoalescer | None = None,
+                 max_resident_events: int | None = None,
+                 spill_dir: str | None = None,
+                 merkle: bool = False,
+                 anchor_every: int | None = None,
+                 algorithm: str = DEFAULT_ALGORITHM):
         self.session_id: str = str(uuid.uuid4())
         # Per spec: user_id is user-generated, anonymous, rotatable.
         # If none supplied, generate an ephemeral one for this session.
         self.user_id: str = user_id or self._generate_ephemeral_id()
-        self.start_time: str = datetime.datetime.utcnow().isoformat() + "Z"
-        self.events: list[dict] = []
+        self._clock = MonotonicClock()
+        self.start_time: str = format_ns(self._clock.now_ns())
+        if columnar and max_resident_events:
+            raise ValueError("columnar and max_resident_events are mutually exclusive")
+        self.events: list[dict] | ColumnarEventStore | SpillingEventStore
+        if max_resident_events:
+            self.events = SpillingEventStore(max_resident_events, directory=spill_dir)
+        else:
+            self.events = ColumnarEventStore() if columnar else []
+        self._columnar = columnar
+        self._max_resident_events = max_resident_events
         self._content_source = "content/document.xhtml"
+        self._head_hash: str = ""
+        self._algorithm = algorithm
+        self._chain_hash = chain_hasher(algorithm)
+        self._by_type: dict[str, array] = {}
+        self._merkle = MerkleTree() if merkle else None
+        self._anchor_every = anchor_every
+        self._anchors: list[tuple[int, str]] = []
+        self._journal = journal
+        self._coalescer = coalescer
+        self._inbox: collections.deque = collections.deque()
+        self._lock = threading.Lock()
+
+        if journal is not None:
+            if not journal.is_empty:
+                raise JournalError(f"{journal.path}: journal already in use; use ProcessLog.recover()")
+            journal.write_header({**self._header(), "options": self._options()})
 
         self.log_event("session_start")
 
+    @classmethod
+    def recover(cls, path: str, columnar: bool | None = None,
+                fsync_every: int = 64, fsync_interval_ms: float = 200.0,
+                merkle: bool | None = None, anchor_every: int | None = None,
+                max_resident_events: int | None = None, spill_dir: str | None = None,
+                coalescer: EditCoalescer | None = None) -> "ProcessLog":
+        """
+        Rebuild a ProcessLog from its journal and keep journaling to it.
+
+        Every replayed event's _hash is re-derived; a torn final line left by a
+        crash is discarded. Raises JournalError if the chain does not verify.
+
+        The store, Merkle, anchor and coalescer settings the session was
+        started with are read from the journal header; an argument other than
+        None overrides one (0 turns anchor_every or max_resident_events off).
+        An edit burst still open at the crash was never journaled and is lost.
+        """
+        header, events, valid_bytes = read_journal(path)
+        options = header.get("options") or {}
+        if columnar is None:
+            columnar = options.get("columnar", False)
+        if merkle is None:
+            merkle = options.get("merkle", False)
+        if anchor_every is None:
+            anchor_every = options.get("anchor_every")
+        if max_resident_events is None:
+            max_resident_events = options.get("max_resident_events")
+        if coalescer is None and options.get("coalescer") is not None:
+            coalescer = EditCoalescer(**options["coalescer"])
+        if columnar and max_resident_events:
+            raise ValueError("columnar and max_resident_events are mutually exclusive")
+
+        log = cls.__new__(cls)
+        log.session_id      = header["session_id"]
+        log.user_id         = header["user_id"]
+        log.start_time      = header["start_time"]
+        log._content_source = header["content_source"]
+        if max_resident_events:
+            log.events      = SpillingEventStore(max_resident_events, directory=spill_dir)
+        else:
+            log.events      = ColumnarEventStore() if columnar else []
+        log._head_hash      = ""
+        log._algorithm      = header.get("algorithm", DEFAULT_ALGORITHM)
+        log._chain_hash     = chain_hasher(log._algorithm)
+        log._by_type        = {}
+        log._merkle         = MerkleTree() if merkle else None
+        log._anchor_every   = anchor_every
+        log._anchors        = []
+        log._coalescer      = coalescer
+        log._columnar       = columnar
+        log._max_resident_events = max_resident_events
+        log._inbox          = collections.deque()
+        log._lock           = threading.Lock()
+
+        for i, event in enumerate(events):
+            payload  = payload_json(event)
+            expected = log._chain_hash(payload, log._head_hash, log.session_id)
+            if event.get("_hash") != expected:
+                raise JournalError(f"{path}: hash chain broken at event {i} ({event.get('type')!r})")
+            if anchor_every and i % anchor_every == 0:
+                log._anchors.append((i, log._head_hash))
+            log._head_hash = expected
+            if log._merkle is not None:
+                log._merkle.append(leaf_hash(payload, log.session_id))
+            log._by_type.setdefault(event["type"], array("I")).append(len(log.events))
+            log.events.append(event)
+
+        last_ts    = events[-1]["timestamp"] if events else log.start_time
+        log._clock = MonotonicClock(floor_ns=iso_to_ns(last_ts))
+
+        with open(path, "r+b") as f:
+            f.truncate(valid_bytes)
+        log._journal = EventJournal(path, fsync_every=fsync_every,
+                                    fsync_interval_ms=fsync_interval_ms)
+        return log
+
+    def close(self) -> None:
+        """
+        Log any open edit burst, then sync and close the journal and delete
+        spilled segments. Does not end the session; the log is unusable after.
+        """
+        self.flush_edits()
+        if self._journal is not None:
+            self._journal.close()
+        if isinstance(self.events, SpillingEventStore):
+            self.events.close()
+
+    def __enter__(self) -> "ProcessLog":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @staticmethod
+    def open(path: str) -> ProcessLogReader:
+        """
+        Open an existing .twff container (or bare process-log.json) for reading.
+        Header fields are available immediately; events() streams the log.
+        """
+        return ProcessLogReader(path)
+
     #  Public API
 
     def log_event(self, event_type: str, meta: dict | None = None) -> dict:
@@ -76,18 +317,18 @@ class ProcessLog:
             event_type: One of the TWFF event type strings (session_start, edit,
                         paste, ai_interaction, chat_interaction, focus_change,
                         checkpoint, session_end).
-            meta:       Type-specific metadata dict per the spec schema.
+            meta:       Type-specific metadata dict per the spec schema. It is
+                        copied, so changing it afterwards cannot break the chain.
 
         Returns:
-            The event dict that was appended.
+            The event dict that was appended, including its chained _hash.
         """
-        event = {
-            "timestamp": datetime.datetime.utcnow().isoformat() + "Z",
-            "type": event_type,
-            "meta": meta or {},
-        }
-        self.events.append(event)
-        return event
+        if meta:
+            # Copied here, outside the sequencer lock. Nested values are rare,
+            # so only they pay for a deep copy.
+            meta = {k: copy.deepcopy(v) if isinstance(v, (dict, list)) else v
+                    for k, v in meta.items()}
+        return self._submit(self._seq_event, event_type, meta)
 
     def log_checkpoint(self, char_count: int, word_count: int, cursor_position: int) -> dict:
         return self.log_event("checkpoint", {
@@ -97,11 +338,21 @@ class ProcessLog:
         })
 
     def log_edit(self, position_start: int, position_end: int, source: str = "human") -> dict:
-        return self.log_event("edit", {
-            "position_start": position_start,
-            "position_end": position_end,
-            "source": source,
-        })
+        """
+        Record an edit. With a coalescer, the edit may be merged into the open
+        burst; the returned dict is then the burst so far (not yet hashed).
+        """
+        if self._coalescer is None:
+            return self.log_event("edit", {
+                "position_start": position_start,
+                "position_end": position_end,
+                "source": source,
+            })
+        return self._submit(self._seq_edit, position_start, position_end, source)
+
+    def flush_edits(self) -> dict | None:
+        """Log the coalescer's open edit burst now. Returns the logged event, if any."""
+        return self._submit(self._seq_flush_edits)
 
     def log_paste(self, char_count: int, position_start: int, position_end: int,
                   source: str = "external", preview: str = "") -> dict:
@@ -131,58 +382,202 @@ class ProcessLog:
     def log_focus_change(self, duration_ms: int) -> dict:
         return self.log_event("focus_change", {"duration_ms": duration_ms})
 
+    @property
+    def head_hash(self) -> str:
+        """_hash of the most recent event — the current head of the chain."""
+        return self._head_hash
+
+    def snapshot(self) -> EventSnapshot:
+        """
+        A consistent, read-only view of the events logged so far, with the
+        head_hash that covers exactly those events. O(1): nothing is copied.
+        """
+        with self._lock:
+            return EventSnapshot(self.events, len(self.events), self._head_hash)
+
+    def count(self, event_type: str, snapshot: EventSnapshot | None = None) -> int:
+        """Number of events of this type (as of snapshot, default now)."""
+        positions = self._by_type.get(event_type)
+        if positions is None:
+            return 0
+        if snapshot is None:
+            return len(positions)
+        return bisect.bisect_left(positions, len(snapshot))
+
+    def of_type(self, event_type: str, snapshot: EventSnapshot | None = None) -> list[dict]:
+        """All events of this type, in log order. O(k) for k matches."""
+        snap = snapshot if snapshot is not None else self.snapshot()
+        positions = self._by_type.get(event_type, ())
+        return [snap[i] for i in positions[:self.count(event_type, snap)]]
+
+    def last(self, event_type: str, snapshot: EventSnapshot | None = None) -> dict | None:
+        """The most recent event of this type, or None. O(1)."""
+        snap = snapshot if snapshot is not None else self.snapshot()
+        n = self.count(event_type, snap)
+        return snap[self._by_type[event_type][n - 1]] if n else None
+
+    def integrity(self, snapshot: EventSnapshot | None = None) -> dict:
+        """The SPEC §5.3 _integrity block for a snapshot (default: now). O(1)."""
+        snap = snapshot if snapshot is not None else self.snapshot()
+        block = {
+            "algorithm":    self._algorithm,
+            "chain_length": len(snap),
+            "head_hash":    snap.head_hash,
+            "session_id":   self.session_id,
+            "note":         "Per-event chained hash. Verify using spec §5.2.",
+        }
+        if self._anchor_every:
+            block["anchor_interval"] = self._anchor_every
+            block["anchors"] = [{"index": i, "hash": h}
+                                for i, h in self._anchors if i < len(snap)]
+        if self._merkle is not None:
+            block["merkle"] = {
+                "algorithm": MERKLE_ALGORITHM,
+                "tree_size": len(snap),
+                "root":      self._merkle.root(len(snap)).hex(),
+            }
+        return block
+
+    def inclusion_proof(self, index: int, snapshot: EventSnapshot | None = None) -> dict:
+        """
+        A SPEC §5.7 proof that event `index` is in the log (as of snapshot,
+        default now). Check it with spec/verification/verify_merkle_proof.py.
+        Requires merkle=True.
+        """
+        if self._merkle is None:
+            raise ValueError("inclusion proofs need ProcessLog(merkle=True)")
+        snap = snapshot if snapshot is not None else self.snapshot()
+        return {
+            "algorithm":  MERKLE_ALGORITHM,
+            "session_id": self.session_id,
+            "tree_size":  len(snap),
+            "root":       self._merkle.root(len(snap)).hex(),
+            "index":      index,
+            "event":      snap[index],
+            "path":       [h.hex() for h in self._merkle.inclusion_proof(index, len(snap))],
+        }
+
     def end_session(self) -> str:
-        """Finalise the session. Returns end_time ISO string."""
-        end_time = datetime.datetime.utcnow().isoformat() + "Z"
-        self.log_event("session_end")
-        return end_time
+        """Finalise the session. Returns end_time ISO string (the session_end timestamp)."""
+        event = self.log_event("session_end")
+        if self._journal is not None:
+            self._journal.sync()
+        return event["timestamp"]
 
-    def to_dict(self, end_time: str | None = None) -> dict:
-        """Return the process log as a spec-compliant dict."""
+    def to_dict(self, end_time: str | None = None,
+                snapshot: EventSnapshot | None = None) -> dict:
+        """Return the process log (as of snapshot, default now) as a spec-compliant dict."""
+        snap = snapshot if snapshot is not None else self.snapshot()
         return {
             "version": self.SPEC_VERSION,
             "session_id": self.session_id,
             "user_id": self.user_id,
             "start_time": self.start_time,
-            "end_time": end_time or datetime.datetime.utcnow().isoformat() + "Z",
+            "end_time": end_time or format_ns(self._clock.now_ns()),
             "content_source": self._content_source,
-            "events": self.events,
+            "events": list(snap),
         }
 
-    def export(self, xhtml_content: str) -> bytes:
+    def export(self, xhtml_content: str, assets: dict[str, bytes] | None = None,
+               compression: CompressionPolicy = DEFAULT_POLICY,
+               binary_sidecar: bool = False, segment_events: int | None = None,
+               reproducible: bool = False) -> bytes:
         """
         Package content + process log into a TWFF ZIP container.
 
         Args:
-            xhtml_content: The final document as XHTML string.
+            xhtml_content:  The final document as XHTML string.
+            assets:         Extra members by path, e.g. {"content/images/fig1.png": b"..."}.
+            compression:    Per-member compression policy.
+            binary_sidecar: Also write meta/process-log.bin (components/binlog.py).
+            segment_events: Split the log into meta/process-log/part-NNNN.json
+                            members of at most this many events (SPEC §3.5).
+            reproducible:   Byte-identical output for identical sessions (see export_to).
 
         Returns:
             Raw bytes of the .twff ZIP file.
         """
-        end_time = self.end_session()
-        process_log_dict = self.to_dict(end_time)
-
-        # Compute integrity hash of the events array
-        events_json = json.dumps(self.events, sort_keys=True)
-        salt = self.session_id
-        integrity_hash = hashlib.sha256((events_json + salt).encode()).hexdigest()
-        process_log_dict["_integrity"] = {
-            "algorithm": "SHA-256",
-            "salt": "session_id",
-            "hash": integrity_hash,
-            "note": "Hash of events array concatenated with session_id salt."
-        }
-
-        manifest = self._build_manifest()
-
         buf = io.BytesIO()
-        with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zf:
-            zf.writestr("content/document.xhtml", xhtml_content)
-            zf.writestr("meta/process-log.json", json.dumps(process_log_dict, indent=2))
-            zf.writestr("meta/manifest.xml", manifest)
-        buf.seek(0)
+        self.export_to(buf, xhtml_content, assets, compression, binary_sidecar, segment_events,
+                       reproducible)
         return buf.getvalue()
 
+    def export_to(self, fileobj, xhtml_content: str, assets: dict[str, bytes] | None = None,
+                  compression: CompressionPolicy = DEFAULT_POLICY,
+                  binary_sidecar: bool = False, segment_events: int | None = None,
+                  reproducible: bool = False) -> None:
+        """
+        Stream the TWFF ZIP container to any writable binary stream (file,
+        socket file, HTTP response body). The stream need not be seekable.
+
+        meta/process-log.json is serialised and deflated a chunk of events at
+        a time, so peak memory stays flat regardless of session length. Output
+        is byte-identical to json.dumps(log, indent=2).
+
+        Each member is stored or deflated as `compression` decides; assets
+        (content/images/, content/assets/, ...) are listed in the manifest.
+
+        With binary_sidecar, meta/process-log.bin carries the same log in the
+        compact binary encoding, including the identical _integrity block.
+
+        With segment_events, meta/process-log.json is replaced by bounded
+        meta/process-log/part-NNNN.json members and an index.json that gives
+        each part's time range, event count, type counts and chain anchor.
+
+        With reproducible, the same session, content and assets always give
+        the same bytes, so containers can be deduplicated by digest: every
+        entry is dated REPRODUCIBLE_DATE_TIME, assets are written (and listed
+        in the manifest) in name order, and a log that already ends with
+        session_end is not ended a second time. The JSON members need nothing
+        extra, as their formatting depends only on the events. Identical bytes
+        also assume the same zlib build and the same kind of stream: a
+        non-seekable stream gets ZIP data descriptors, a seekable one does not.
+
+        Raises ValueError, before anything is logged or written, if an asset
+        name is not a plain path under content/ or names the document itself.
+        """
+        if segment_events is not None and segment_events < 1:
+            raise ValueError("segment_events must be at least 1")
+        assets   = assets or {}
+        self._check_asset_names(assets)
+        # An open edit burst belongs to the log being exported; once flushed,
+        # it also decides whether the log still ends with session_end.
+        self.flush_edits()
+        snap     = self.snapshot()
+        if reproducible and len(snap) and snap[len(snap) - 1]["type"] == "session_end":
+            end_time = snap[len(snap) - 1]["timestamp"]
+        else:
+            end_time = self.end_session()
+            snap     = self.snapshot()
+        if reproducible:
+            assets = dict(sorted(assets.items()))
+            zip_info = functools.partial(compression.zip_info, date_time=REPRODUCIBLE_DATE_TIME)
+        else:
+            zip_info = compression.zip_info
+        parts    = -(-len(snap) // segment_events) if segment_events else 0
+        manifest = self._build_manifest(assets, binary_sidecar, parts)
+        trailer  = {}
+
+        with zipfile.ZipFile(fileobj, "w", zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr(zip_info("content/document.xhtml"), xhtml_content)
+            for name, data in assets.items():
+                zf.writestr(zip_info(name, data), data)
+            if segment_events:
+                self._write_segments(zf, zip_info, end_time, snap, segment_events, trailer)
+            else:
+                # A streamed member's size is unknown when its header is
+                # written, so every one is ZIP64 in case it passes 4 GiB.
+                with zf.open(zip_info(PROCESS_LOG_MEMBER), "w", force_zip64=True) as member:
+                    for chunk in self._iter_json(end_time, snap, trailer):
+                        member.write(chunk)
+            if binary_sidecar:
+                with zf.open(zip_info(BINARY_LOG_MEMBER), "w", force_zip64=True) as member:
+                    writer = BinaryLogWriter(member, self._export_header(end_time))
+                    for event in snap:
+                        writer.write(event)
+                    writer.close(trailer)
+            zf.writestr(zip_info("meta/manifest.xml"), manifest)
+
     #  Private helpers ─
 
     @staticmethod
@@ -194,13 +589,198 @@ class ProcessLog:
         raw = str(uuid.uuid4())
         return "anon-" + hashlib.sha256(raw.encode()).hexdigest()[:12]
 
-    def _build_manifest(self) -> str:
+    def _submit(self, op, *args):
+        """Queue a sequencer op, then drain the queue (ours included) under the lock."""
+        slot = [op, args, None, None]          # op, args, result, exception
+        self._inbox.append(slot)
+        with self._lock:
+            inbox = self._inbox
+            while inbox:
+                pending = inbox.popleft()
+                try:
+                    pending[2] = pending[0](*pending[1])
+                except Exception as exc:       # re-raised in the submitting thread
+                    pending[3] = exc
+        if slot[3] is not None:
+            raise slot[3]
+        return slot[2]
+
+    # Sequencer ops — only ever called by _submit() with the lock held.
+
+    def _seq_event(self, event_type: str, meta: dict | None) -> dict:
+        if self._coalescer is not None:
+            self._seq_flush_edits()
+        return self._append(event_type, meta, self._clock.now_ns())
+
+    def _seq_edit(self, position_start: int, position_end: int, source: str) -> dict:
+        finished = self._coalescer.offer(position_start, position_end, source,
+                                         self._clock.now_ns())
+        if finished is not None:
+            self._append("edit", *finished)
+        return self._coalescer.pending()
+
+    def _seq_flush_edits(self) -> dict | None:
+        finished = self._coalescer.flush() if self._coalescer is not None else None
+        if finished is None:
+            return None
+        return self._append("edit", *finished)
+
+    def _append(self, event_type: str, meta: dict | None, timestamp_ns: int) -> dict:
+        """Chain, store and journal one event. Every append goes through here."""
+        event = {
+            "timestamp": format_ns(timestamp_ns),
+            "type": event_type,
+            "meta": meta or {},
+        }
+        payload = canonical_json(event)
+        if self._anchor_every and len(self.events) % self._anchor_every == 0:
+            self._anchors.append((len(self.events), self._head_hash))
+        event["_hash"] = self._head_hash = self._chain_hash(payload, self._head_hash, self.session_id)
+        if self._merkle is not None:
+            self._merkle.append(leaf_hash(payload, self.session_id))
+        positions = self._by_type.get(event_type)
+        if positions is None:
+            positions = self._by_type[event_type] = array("I")
+        positions.append(len(self.events))
+        if self._columnar:
+            self.events.append(event, timestamp_ns)
+        else:
+            self.events.append(event)
+        if self._journal is not None:
+            self._journal.append(event)
+        return event
+
+    def _export_header(self, end_time: str) -> dict:
+        return {
+            "version": self.SPEC_VERSION,
+            "session_id": self.session_id,
+            "user_id": self.user_id,
+            "start_time": self.start_time,
+            "end_time": end_time,
+            "content_source": self._content_source,
+        }
+
+    def _iter_json(self, end_time: str, snap: EventSnapshot, trailer: dict | None = None):
+        """
+        Yield process-log.json as UTF-8 chunks, formatted exactly like indent=2.
+        Byte offsets of anchored events are recorded on the way and written
+        into the trailing _integrity block, which is also stored in `trailer`.
+        """
+        header = self._export_header(end_time)
+        head = (json.dumps(header, indent=2)[:-2] + ',\n  "events": [').encode("utf-8")
+        yield head
+
+        offsets = {}
+        yield from _event_chunks(snap, self._anchor_every or 0, offsets, len(head))
+
+        block = self.integrity(snap)
+        for anchor in block.get("anchors", ()):
+            anchor["offset"] = offsets[anchor["index"]]
+        if trailer is not None:
+            trailer["_integrity"] = block
+        integrity = json.dumps(block, indent=2).replace("\n", "\n  ")
+        yield (("\n  ]" if len(snap) else "]") + ',\n  "_integrity": ' + integrity + "\n}").encode("utf-8")
+
+    def _write_segments(self, zf: zipfile.ZipFile, zip_info, end_time: str,
+                        snap: EventSnapshot, segment_events: int, trailer: dict) -> None:
+        """
+        Write the SPEC §3.5 segmented layout: one part per `segment_events`
+        events, each formatted like process-log.json, then the index.
+        """
+        events   = iter(snap)
+        segments = []
+        anchor   = ""
+        for number, first in enumerate(range(0, len(snap), segment_events), start=1):
+            href  = f"{SEGMENT_PREFIX}part-{number:04d}.json"
+            count = min(segment_events, len(snap) - first)
+            types = collections.Counter()
+            head  = json.dumps({"session_id": self.session_id, "first_index": first}, indent=2)
+            with zf.open(zip_info(href), "w", force_zip64=True) as member:
+                member.write((head[:-2] + ',\n  "events": [').encode("utf-8"))
+                for chunk in _event_chunks(_counted(itertools.islice(events, count), types)):
+                    member.write(chunk)
+                member.write(b"\n  ]\n}")
+            last = snap[first + count - 1]
+            segments.append({
+                "href":        href,
+                "first_index": first,
+                "count":       count,
+                "start_time":  snap[first]["timestamp"],
+                "end_time":    last["timestamp"],
+                "types":       dict(types),
+                "anchor":      anchor,
+            })
+            anchor = last["_hash"]
+
+        # The parts' own anchors take the place of §5.8 anchors, which would
+        # have no process-log.json to give offsets into.
+        integrity = self.integrity(snap)
+        integrity.pop("anchor_interval", None)
+        integrity.pop("anchors", None)
+        trailer["_integrity"] = integrity
+        index = {**self._export_header(end_time), "segment_events": segment_events,
+                 "segments": segments, **trailer}
+        zf.writestr(zip_info(SEGMENT_INDEX_MEMBER), json.dumps(index, indent=2))
+
+    def _header(self) -> dict:
+        return {
+            "version": self.SPEC_VERSION,
+            "session_id": self.session_id,
+            "user_id": self.user_id,
+            "start_time": self.start_time,
+            "content_source": self._content_source,
+            "algorithm": self._algorithm,
+        }
+
+    def _options(self) -> dict:
+        """Settings recover() restores from the journal header."""
+        coalescer = self._coalescer
+        return {
+            "columnar":            self._columnar,
+            "max_resident_events": self._max_resident_events,
+            "merkle":              self._merkle is not None,
+            "anchor_every":        self._anchor_every,
+            "coalescer":           None if coalescer is None else {
+                "window_ms":   coalescer.window_ms,
+                "max_span_ms": coalescer.max_span_ms,
+                "max_gap":     coalescer.max_gap,
+            },
+        }
+
+    def _check_asset_names(self, assets: dict[str, bytes]) -> None:
+        """Assets live under content/; anything else could shadow a log or manifest member."""
+        for name in assets:
+            parts = name.split("/")
+            if (parts[0] != "content" or len(parts) < 2 or "\\" in name
+                    or any(part in ("", ".", "..") for part in parts)):
+                raise ValueError(f"asset {name!r} must be a plain path under content/")
+            if name == self._content_source:
+                raise ValueError(f"asset {name!r} duplicates the document member")
+
+    def _build_manifest(self, assets: dict[str, bytes] | None = None,
+                        binary_sidecar: bool = False, parts: int = 0) -> str:
+        items = "".join(
+            f'  <item id="asset{i}" href={quoteattr(name)}'
+            f' media-type={quoteattr(mimetypes.guess_type(name)[0] or "application/octet-stream")}/>\n'
+            for i, name in enumerate(assets or (), start=1)
+        )
+        if parts:
+            log_items = (
+                f'  <item id="log" href="{SEGMENT_INDEX_MEMBER}" media-type="application/json"/>\n'
+                + "".join(f'  <item id="log-part{n}" href="{SEGMENT_PREFIX}part-{n:04d}.json"'
+                          ' media-type="application/json"/>\n' for n in range(1, parts + 1))
+            )
+        else:
+            log_items = (f'  <item id="log" href="{PROCESS_LOG_MEMBER}"'
+                         ' media-type="application/json"/>\n')
+        if binary_sidecar:
+            log_items += (f'  <item id="log-bin" href="{BINARY_LOG_MEMBER}"'
+                          ' media-type="application/octet-stream"/>\n')
         return (
             '<?xml version="1.0" encoding="UTF-8"?>\n'
             "<manifest>\n"
             '  <item id="content" href="content/document.xhtml"'
             ' media-type="application/xhtml+xml"/>\n'
-            '  <item id="log" href="meta/process-log.json"'
-            ' media-type="application/json"/>\n'
+            + log_items + items +
             "</manifest>"
         )
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+anchor_verify.py — Segment-parallel, resumable SPEC §5.2 verification (SPEC §5.8)
+
+A log exported with chain anchors lists, in `_integrity.anchors`, the chain
+hash entering every N-th event and that event's byte offset in
+process-log.json. Each segment between two anchors can therefore be checked
+on its own: a worker seeks to the segment's first event, re-derives the chain
+from the anchor hash and must arrive exactly at the next anchor's hash (or at
+`head_hash` for the last segment). The segments are verified in a process
+pool. Offsets are not hashed, so they are checked too: anchor 0 must sit at
+the start of the events array and each segment must end exactly at the next
+anchor's offset, so together the segments cover the whole array with no gaps.
+
+After a failure (or an interrupted run), verification can resume from the
+last good anchor instead of from event 0.
+
+Logs without anchors fall back to the sequential stream_verify pass, and a
+segmented container (SPEC §3.5) is handed to segment_verify.py.
+
+Usage:
+    python spec/verification/anchor_verify.py big.twff --workers 8
+    python spec/verification/anchor_verify.py big.twff --resume-from 4200000
+
+Exit codes:
+    0  — every chain intact
+    1  — one or more files failed
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import zipfile
+from dataclasses import dataclass
+
+from segment_verify import is_segmented, read_index, verify_segmented
+from stream_verify import open_log, verify_stream
+from twff_hash import CHAIN_ALGORITHMS, canonical_json, chain_algorithm, chain_hasher
+from twff_json import PROCESS_LOG_MEMBER, JsonStream
+from validate_examples import fail, head, ok
+
+# Bytes read from the end of process-log.json when looking for _integrity;
+# doubled until the whole block fits.
+_TAIL_BYTES = 1 << 20
+
+
+@dataclass
+class AnchoredResult:
+    """
+    Outcome of an anchored verification.
+
+    `last_good_anchor` is the highest anchor index before which every event
+    verified; pass it back as resume_from to continue after a failure.
+    """
+    ok:               bool
+    detail:           str
+    events:           int
+    segments:         int = 0
+    index:            int | None = None
+    offset:           int | None = None
+    last_good_anchor: int = 0
+
+
+def verify_anchored(path: str, member: str = PROCESS_LOG_MEMBER,
+                    workers: int | None = None, resume_from: int = 0) -> AnchoredResult:
+    """
+    Verify a process log segment by segment across `workers` processes.
+
+    Args:
+        path:        .twff container or bare process-log.json.
+        member:      Process-log member name inside a container.
+        workers:     Pool size (default: all cores; 1 = in this process).
+        resume_from: Anchor index to start at; events before it are trusted.
+    """
+    if member == PROCESS_LOG_MEMBER and is_segmented(path):
+        # Each part already starts at an anchor; segment_verify checks them in parallel.
+        if resume_from:
+            raise ValueError(f"{path}: segmented container; resume with segment_verify.py --segments")
+        chain = verify_segmented(path, workers=workers)
+        return AnchoredResult(chain.ok, chain.detail, chain.events, index=chain.index)
+
+    session_id, events_at = _read_layout(path, member)
+    integrity  = read_integrity(path, member)
+    anchors    = integrity.get("anchors") if isinstance(integrity, dict) else None
+    if not anchors or any("offset" not in a for a in anchors):
+        if resume_from:
+            raise ValueError(f"{path}: no chain anchors to resume from")
+        chain = verify_stream(path, member)
+        return AnchoredResult(chain.ok, chain.detail, chain.events, 1, chain.index, chain.offset)
+
+    indexes = [a["index"] for a in anchors]
+    if indexes[0] != 0 or anchors[0]["hash"] != "" or indexes != sorted(set(indexes)):
+        return AnchoredResult(False, "_integrity.anchors must start at event 0 and be strictly "
+                                     "increasing", 0)
+    if resume_from not in indexes:
+        raise ValueError(f"{path}: {resume_from} is not an anchor index")
+    if anchors[0]["offset"] != events_at:
+        return AnchoredResult(False, f"Anchor 0 is at byte {anchors[0]['offset']} but the events "
+                                     f"array starts at byte {events_at}", 0)
+
+    algorithm = chain_algorithm(integrity)
+    if algorithm not in CHAIN_ALGORITHMS:
+        return AnchoredResult(False, f"Unsupported chain algorithm {algorithm!r}", 0)
+
+    chain_length = integrity.get("chain_length", 0)
+    head_hash    = integrity.get("head_hash", "")
+    tasks = []
+    for j, anchor in enumerate(anchors):
+        if anchor["index"] < resume_from:
+            continue
+        last = j + 1 == len(anchors)
+        end  = chain_length if last else anchors[j + 1]["index"]
+        tasks.append((path, member, session_id, anchor["index"], end - anchor["index"],
+                      anchor["offset"], anchor["hash"],
+                      head_hash if last else anchors[j + 1]["hash"],
+                      None if last else anchors[j + 1]["offset"], algorithm))
+
+    workers = max(1, min(workers or os.cpu_count() or 1, len(tasks)))
+    checked = 0
+    if workers == 1:
+        results = map(_verify_segment, tasks)
+        pool = None
+    else:
+        pool = multiprocessing.Pool(workers)
+        results = pool.imap(_verify_segment, tasks)
+    try:
+        # In order, so the first failure found is the earliest one.
+        for task, (seg_ok, count, detail, index, offset) in zip(tasks, results):
+            checked += count
+            if not seg_ok:
+                return AnchoredResult(False, detail, checked, len(tasks), index, offset,
+                                      last_good_anchor=task[3])
+    finally:
+        if pool is not None:
+            pool.terminate()
+
+    return AnchoredResult(True, f"Log intact — {checked} events verified in "
+                                f"{len(tasks)} segment(s).",
+                          checked, len(tasks), last_good_anchor=anchors[-1]["index"])
+
+
+def _verify_segment(task) -> tuple[bool, int, str, int | None, int | None]:
+    """
+    Check one segment; returns (ok, events_checked, detail, bad_index, bad_offset).
+
+    The segment must end exactly where the next one starts (`end_offset`, the
+    next anchor's offset) or, for the last one, at the end of the events
+    array. The offsets are not covered by any hash, so without this an event
+    inserted between two segments would never be read.
+    """
+    path, member, session_id, start, count, offset, prev_hash, end_hash, end_offset, algorithm = task
+    last = end_offset is None
+    chain_hash = chain_hasher(algorithm)
+    k = 0
+    with open_log(path, member) as raw:
+        raw.seek(offset)
+        stream = JsonStream(raw)
+        try:
+            for k in range(count):
+                mark  = stream.mark()
+                event = stream.value()
+                if not isinstance(event, dict):
+                    raise ValueError(f"event {start + k} is not an object")
+                stored   = event.pop("_hash", "")
+                expected = chain_hash(canonical_json(event), prev_hash, session_id)
+                if stored and stored != expected:
+                    at = offset + stream.byte_offset(mark)
+                    return False, k, (
+                        f"Hash mismatch at event {start + k} (type={event.get('type')!r}) "
+                        f"at byte {at}. Expected {expected[:16]}…, got {stored[:16]}…"
+                    ), start + k, at
+                prev_hash = stored or expected
+                sep = stream.next_char()
+                if sep != ("]" if last and k + 1 == count else ","):
+                    raise ValueError(f"unexpected {sep!r} after event {start + k}")
+            if not last:
+                at = offset + stream.byte_offset(stream.mark())
+                if at != end_offset:
+                    return False, count, (
+                        f"Segment {start}–{start + count} ends at byte {at} but anchor "
+                        f"{start + count} is at byte {end_offset}"
+                    ), start + count, at
+        except ValueError as e:
+            at = offset + stream.position()
+            return False, k, f"Unreadable segment at event {start + k} near byte {at}: {e}", start + k, at
+        finally:
+            stream.detach()
+
+    if prev_hash != end_hash:
+        what = "_integrity.head_hash" if last else f"anchor {start + count}"
+        return False, count, (f"Segment {start}–{start + count} does not join {what}. "
+                              f"Expected {end_hash[:16]}…, got {prev_hash[:16]}…"), None, None
+    return True, count, "", None, None
+
+
+def _read_layout(path: str, member: str) -> tuple[str, int]:
+    """session_id and the byte offset of the first event (or of "]" when there are none)."""
+    session_id = None
+    with open_log(path, member) as raw:
+        stream = JsonStream(raw)
+        try:
+            for key in stream.members():
+                if key == "events":
+                    if session_id is None:
+                        break
+                    stream.expect("[")
+                    return session_id, stream.byte_offset(stream.mark())
+                value = stream.value()
+                if key == "session_id":
+                    session_id = value
+        finally:
+            stream.detach()
+    raise ValueError(f"{path}: session_id must precede events for anchored verification")
+
+
+def read_integrity(path: str, member: str = PROCESS_LOG_MEMBER) -> dict:
+    """
+    Read the trailing _integrity block from the end of the log, or from
+    meta/process-log/index.json for a segmented container (SPEC §3.5).
+    """
+    if member == PROCESS_LOG_MEMBER and is_segmented(path):
+        return read_index(path).get("_integrity") or {}
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as zf:
+            size = zf.getinfo(member).file_size
+    else:
+        size = os.path.getsize(path)
+
+    want = _TAIL_BYTES
+    while True:
+        start = max(0, size - want)
+        with open_log(path, member) as raw:
+            raw.seek(start)
+            tail = raw.read()
+        at = tail.rfind(b'"_integrity"')
+        if at >= 0:
+            try:
+                return json.loads(b"{" + tail[at:]).get("_integrity") or {}
+            except json.JSONDecodeError:
+                pass        # block cut by the window, or not the last member
+        if start == 0:
+            return {}
+        want *= 2
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Segment-parallel TWFF chain verifier")
+    parser.add_argument("files", nargs="+", help=".twff containers or process-log.json files")
+    parser.add_argument("--workers", "-j", type=int, default=None,
+                        help="Worker processes (default: all cores)")
+    parser.add_argument("--resume-from", type=int, default=0, metavar="INDEX",
+                        help="Anchor index to resume at (events before it are trusted)")
+    args = parser.parse_args()
+
+    print(head(f"TWFF anchored chain verifier — {len(args.files)} file(s)"))
+    failed = 0
+    for path in args.files:
+        try:
+            result = verify_anchored(path, workers=args.workers, resume_from=args.resume_from)
+        except (OSError, ValueError, KeyError) as e:
+            result = AnchoredResult(False, str(e), 0)
+        if result.ok:
+            print(ok(f"{path}: {result.detail}"))
+        else:
+            failed += 1
+            print(fail(f"{path}: {result.detail}"))
+            if result.segments:
+                print(f"    resume with --resume-from {result.last_good_anchor}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
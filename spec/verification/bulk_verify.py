@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+bulk_verify.py — Parallel verification of many TWFF containers
+
+Fans .twff containers (and bare process-log.json files) out across a process
+pool. Each worker makes one streaming pass per container (stream_verify, or
+segment_verify for a segmented log) that runs the same three checks as
+validate_examples.py:
+
+  1. JSON Schema    header against definitions/process_log, each event
+                    against definitions/event (spec/v0.1/schema.json)
+  2. Hash chain     SPEC §5.2 per-event chain and _integrity.head_hash
+  3. Structure      session_start first, session_end last, chronological order
+
+and, with --signatures, checks META-INF/signatures.xml against the verified
+_integrity block in the same pass (twff_sign.py; needs cryptography).
+
+Results are printed as each container finishes, followed by throughput in
+containers/s and events/s.
+
+With --cache, reports are kept in a shared VerificationCache (SQLite, keyed
+by the container's SHA-256 plus validator and schema versions), so an
+unchanged resubmission costs one hash of the file.
+
+Usage:
+    python spec/verification/bulk_verify.py submissions/            # every .twff below
+    python spec/verification/bulk_verify.py a.twff b.twff --workers 8
+    python spec/verification/bulk_verify.py submissions/ --json > results.ndjson
+    python spec/verification/bulk_verify.py submissions/ --cache   # ~/.cache/twff/verify.sqlite
+    python spec/verification/bulk_verify.py submissions/ --signatures --trusted-keys keys/
+
+Exit codes:
+    0  — every container passed
+    1  — one or more containers failed
+    2  — missing dependency (jsonschema not installed; use --no-schema to skip,
+         or cryptography not installed with --signatures)
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from segment_verify import is_segmented, verify_segmented
+from stream_verify import verify_stream
+from twff_sign import Ed25519PrivateKey, check_signatures, load_trusted_keys
+from validate_examples import C, fail, head, ok, warn
+from verify_cache import DEFAULT_PATH as DEFAULT_CACHE, VerificationCache
+
+SCHEMA_FILE = Path(__file__).parent.parent / "v0.1" / "schema.json"
+
+# Schema errors reported per container before the rest are only counted.
+MAX_SCHEMA_MESSAGES = 5
+
+
+@dataclass
+class ContainerReport:
+    path:      str
+    ok:        bool = False
+    events:    int = 0
+    seconds:   float = 0.0
+    errors:    list[str] = field(default_factory=list)
+    warnings:  list[str] = field(default_factory=list)
+    signers:   list[str] = field(default_factory=list)
+    cached:    bool = False
+
+
+# ── Worker side
+
+# Built once per worker process by _init_worker.
+_validators: tuple | None = None
+_cache: VerificationCache | None = None
+_cache_options = ""
+_signatures = False
+_trusted: frozenset[str] | None = None
+
+
+def _init_worker(check_schema: bool, cache_path: str | None = None,
+                 signatures: bool = False, trusted: frozenset[str] | None = None) -> None:
+    global _validators, _cache, _cache_options, _signatures, _trusted
+    _cache = VerificationCache(cache_path) if cache_path else None
+    _cache_options = f"schema={int(check_schema)}"
+    _signatures, _trusted = signatures, trusted
+    if signatures:
+        _cache_options += ";sig=" + (",".join(sorted(trusted)) if trusted is not None else "any")
+    if not check_schema:
+        _validators = None
+        return
+    import jsonschema
+
+    with open(SCHEMA_FILE) as f:
+        schema = json.load(f)
+    # Root each validator at its definition (definitions kept for $refs):
+    # a top-level "$ref" hop costs ~50% more per event.
+    defs   = schema["definitions"]
+    header = jsonschema.Draft7Validator({**defs["process_log"], "definitions": defs})
+    event  = jsonschema.Draft7Validator({**defs["event"], "definitions": defs})
+    _validators = (header, event)
+
+
+def verify_container(path: str) -> ContainerReport:
+    """Schema, chain and structural checks for one container, in one pass."""
+    report   = ContainerReport(path)
+    errors   = report.errors
+    t0       = time.perf_counter()
+    schema_errors = 0
+    state    = {"first": None, "last": None, "prev_ts": None, "unordered": False}
+
+    def on_event(i: int, event: dict) -> None:
+        nonlocal schema_errors
+        if _validators is not None:
+            for err in _validators[1].iter_errors(event):
+                schema_errors += 1
+                if schema_errors <= MAX_SCHEMA_MESSAGES:
+                    where = " → ".join(str(p) for p in err.absolute_path)
+                    errors.append(f"schema: [events → {i}{' → ' + where if where else ''}] "
+                                  f"{err.message}")
+        etype = event.get("type")
+        if state["first"] is None:
+            state["first"] = etype
+        state["last"] = etype
+        ts = event.get("timestamp", "")
+        if state["prev_ts"] is not None and ts < state["prev_ts"]:
+            state["unordered"] = True
+        state["prev_ts"] = ts
+
+    try:
+        if is_segmented(path):
+            chain = verify_segmented(path, on_event=on_event)
+        else:
+            chain = verify_stream(path, on_event=on_event)
+    except OSError as e:
+        errors.append(f"unreadable: {e}")
+        report.seconds = time.perf_counter() - t0
+        return report
+
+    report.events = chain.events
+    if not chain.ok:
+        errors.append(f"chain: {chain.detail}")
+    elif not (chain.header.get("_integrity") or {}).get("head_hash"):
+        report.warnings.append("no _integrity.head_hash — chain not anchored")
+
+    # Header fields are only meaningful once the whole member was read.
+    if _validators is not None and chain.index is None and chain.offset is None:
+        for err in _validators[0].iter_errors({**chain.header, "events": []}):
+            schema_errors += 1
+            if schema_errors <= MAX_SCHEMA_MESSAGES:
+                where = " → ".join(str(p) for p in err.absolute_path) or "(root)"
+                errors.append(f"schema: [{where}] {err.message}")
+    if schema_errors > MAX_SCHEMA_MESSAGES:
+        errors.append(f"schema: … {schema_errors - MAX_SCHEMA_MESSAGES} more error(s)")
+
+    if chain.ok:
+        if not chain.events:
+            report.warnings.append("no events in log")
+        else:
+            if state["first"] != "session_start":
+                errors.append("structure: first event is not session_start")
+            if state["last"] != "session_end":
+                errors.append("structure: last event is not session_end")
+            if state["unordered"]:
+                errors.append("structure: events are not in chronological order")
+
+    if _signatures:
+        integrity = chain.header.get("_integrity")
+        if chain.ok and isinstance(integrity, dict) and integrity.get("head_hash"):
+            report.signers, sig_errors = check_signatures(path, integrity, _trusted)
+            errors.extend(f"signature: {e}" for e in sig_errors)
+        elif chain.ok:
+            errors.append("signature: no _integrity.head_hash to verify against")
+
+    report.ok      = not errors
+    report.seconds = time.perf_counter() - t0
+    return report
+
+
+def verify_cached(path: str) -> ContainerReport:
+    """verify_container() behind the worker's VerificationCache, if any."""
+    if _cache is None:
+        return verify_container(path)
+    t0 = time.perf_counter()
+    try:
+        key = _cache.key(path, _cache_options)
+    except OSError:
+        return verify_container(path)       # reports the read error
+    hit = _cache.get(key)
+    if hit is not None:
+        report = ContainerReport(**{**hit, "path": path, "cached": True})
+        report.seconds = time.perf_counter() - t0
+        return report
+    report = verify_container(path)
+    _cache.put(key, asdict(report))
+    return report
+
+
+# ── Driver
+
+def find_containers(paths: list[str]) -> list[str]:
+    """Expand directories to the .twff and process-log.json files below them."""
+    found = []
+    for p in map(Path, paths):
+        if p.is_dir():
+            found.extend(str(f) for f in sorted(p.rglob("*.twff")))
+            found.extend(str(f) for f in sorted(p.rglob("process-log.json")))
+        else:
+            found.append(str(p))
+    return found
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Parallel TWFF container verifier")
+    parser.add_argument("paths", nargs="+", help="Containers, process-log.json files or directories")
+    parser.add_argument("--workers", "-j", type=int, default=os.cpu_count() or 1,
+                        help="Worker processes (default: all cores)")
+    parser.add_argument("--no-schema", action="store_true", help="Skip JSON Schema validation")
+    parser.add_argument("--json", action="store_true", help="Emit one JSON report per line")
+    parser.add_argument("--quiet", "-q", action="store_true", help="Only print failures and the summary")
+    parser.add_argument("--cache", nargs="?", const=str(DEFAULT_CACHE), metavar="DB",
+                        help=f"Reuse results from a verification cache (default DB: {DEFAULT_CACHE})")
+    parser.add_argument("--signatures", action="store_true",
+                        help="Also verify META-INF/signatures.xml (needs cryptography)")
+    parser.add_argument("--trusted-keys", nargs="+", metavar="PUB",
+                        help="With --signatures, accept only these public keys (files / directories)")
+    args = parser.parse_args()
+
+    check_schema = not args.no_schema
+    if check_schema:
+        try:
+            import jsonschema  # noqa: F401
+        except ImportError:
+            print(fail("jsonschema not installed. Run: pip install jsonschema "
+                       "(or pass --no-schema)"), file=sys.stderr)
+            return 2
+    trusted = None
+    if args.signatures:
+        if Ed25519PrivateKey is None:
+            print(fail("cryptography not installed. Run: pip install cryptography"), file=sys.stderr)
+            return 2
+        trusted = load_trusted_keys(args.trusted_keys) if args.trusted_keys else None
+
+    files = find_containers(args.paths)
+    if not files:
+        print(warn("No containers found."), file=sys.stderr)
+        return 0
+
+    workers = max(1, min(args.workers, len(files)))
+    # Small chunks keep results streaming; larger ones cut IPC on huge batches.
+    chunksize = max(1, min(16, len(files) // (workers * 8)))
+    if not args.json:
+        print(head(f"TWFF bulk verifier — {len(files)} container(s), {workers} worker(s)"))
+
+    passed = events = hits = 0
+    t0 = time.perf_counter()
+    with multiprocessing.Pool(workers, initializer=_init_worker,
+                              initargs=(check_schema, args.cache, args.signatures, trusted)) as pool:
+        for report in pool.imap_unordered(verify_cached, files, chunksize):
+            passed += report.ok
+            events += report.events
+            hits   += report.cached
+            if args.json:
+                print(json.dumps(asdict(report), ensure_ascii=False), flush=True)
+            elif not report.ok:
+                print(fail(f"{report.path} ({report.events} events)"))
+                for e in report.errors:
+                    print(f"    {e}")
+            elif not args.quiet:
+                print(ok(f"{report.path} ({report.events} events)"), flush=True)
+    elapsed = time.perf_counter() - t0
+
+    failed = len(files) - passed
+    summary = (f"{passed}/{len(files)} passed in {elapsed:.2f}s — "
+               f"{len(files) / elapsed:,.1f} containers/s, {events / elapsed:,.0f} events/s")
+    if args.cache:
+        summary += f" ({hits} cached)"
+    if args.json:
+        print(f"{C.BOLD}{summary}{C.RESET}", file=sys.stderr)
+    else:
+        print()
+        print(ok(summary) if not failed else fail(summary))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
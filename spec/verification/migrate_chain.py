@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+migrate_chain.py — Upgrade v0.1 bulk-hash logs to the per-event chain (SPEC §5.5)
+
+Rewrites .twff containers (and bare process-log.json files) whose
+`_integrity.algorithm` is the v0.1 bulk "SHA-256", or that have no
+`_integrity` at all. Each log is streamed event by event. _hash is computed
+with the shared twff_hash chain (SPEC §5.2), and a new `_integrity` block is
+written. Memory stays flat however long the log is. A directory tree is
+processed by a worker pool, one container per task.
+
+Per container:
+
+  - The old bulk hash is recomputed on the way. It is SHA-256 over
+    json.dumps(events, sort_keys=True) + session_id, with json's default
+    ", " / ": " separators, exactly as the v0.1 exporter wrote it. It is reported as matching or not,
+    and --require-bulk-match refuses containers whose bulk hash is wrong.
+  - An event that already carries a _hash must match the recomputed chain,
+    so a tampered log is never silently re-sealed.
+  - Every other member is copied unchanged, except members that only
+    describe the old log: META-INF/signatures.xml and meta/process-log.bin.
+    These are dropped and reported.
+  - Output goes to a temporary file in the destination directory, is
+    fsynced, then os.replace()d into place. An interrupted run never leaves
+    a partial container.
+
+Resuming: a source whose destination already holds a chained log is skipped
+(with --in-place, the source itself), so re-running the same command after
+an interruption continues where it stopped. Use --force to redo those.
+Temporary files of a killed run are named .<name>.*.migrating and can be
+deleted.
+
+Usage:
+    python spec/verification/migrate_chain.py archive/ --out migrated/ --workers 8
+    python spec/verification/migrate_chain.py archive/ --in-place
+    python spec/verification/migrate_chain.py old.twff --out new/ --algorithm BLAKE2B-256-CHAIN
+
+Exit codes:
+    0  — every file migrated or already chained
+    1  — one or more files failed
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+import zipfile
+from dataclasses import dataclass, field
+from json.encoder import encode_basestring_ascii
+from pathlib import Path
+
+from anchor_verify import read_integrity
+from twff_hash import CHAIN_ALGORITHMS, DEFAULT_ALGORITHM, canonical_json, chain_hasher
+from twff_json import PROCESS_LOG_MEMBER, JsonStream
+from validate_examples import C, fail, head, ok, warn
+
+# Members that describe the old log and would be stale after migration.
+STALE_MEMBERS = ("META-INF/signatures.xml", "meta/process-log.bin")
+
+# Events serialised per write, as in ProcessLog.export_to().
+_CHUNK_EVENTS = 512
+
+
+# C-encoder fast paths (indent=... would force the pure-Python encoder).
+_encode = json.JSONEncoder().encode
+# One events-array element as the v0.1 bulk hash saw it: json.dumps(..., sort_keys=True).
+_encode_bulk = json.JSONEncoder(sort_keys=True).encode
+# A flat object with the item separator indent=2 puts between its members
+# when it sits at depth 2, as meta does inside an events-array element.
+_encode_flat = json.JSONEncoder(separators=(",\n        ", ": ")).encode
+
+
+def _format_event(event: dict) -> str:
+    """
+    json.dumps(event, indent=2) indented one level further, as an element of
+    the events array. Scalars and a flat meta object go through the C
+    encoder (about 3x faster); anything deeper falls back to json.dumps.
+    """
+    if not event:
+        return "{}"
+    fields = []
+    for key, value in event.items():
+        kind = type(value)
+        if kind is dict and value:
+            if any(type(v) in (dict, list) and v for v in value.values()):
+                return json.dumps(event, indent=2).replace("\n", "\n    ")
+            value = "{\n        " + _encode_flat(value)[1:-1] + "\n      }"
+        elif kind is list and value:
+            return json.dumps(event, indent=2).replace("\n", "\n    ")
+        else:
+            value = _encode(value)
+        fields.append(encode_basestring_ascii(key) + ": " + value)
+    return "{\n      " + ",\n      ".join(fields) + "\n    }"
+
+
+class MigrationError(ValueError):
+    pass
+
+
+@dataclass
+class MigrationReport:
+    path:      str
+    out:       str
+    status:    str = "failed"          # migrated | skipped | failed
+    events:    int = 0
+    bytes_in:  int = 0
+    seconds:   float = 0.0
+    detail:    str = ""
+    bulk_hash: bool | None = None      # old bulk hash matched (None: none recorded)
+    dropped:   list[str] = field(default_factory=list)
+
+
+def is_chained(path: str) -> bool:
+    """True if the log at `path` already carries a per-event chain _integrity block."""
+    try:
+        integrity = read_integrity(path)
+    except (OSError, KeyError, zipfile.BadZipFile):
+        return False
+    return isinstance(integrity, dict) and integrity.get("algorithm") in CHAIN_ALGORITHMS
+
+
+def rewrite_log(raw, out, algorithm: str = DEFAULT_ALGORITHM,
+                require_bulk_match: bool = False) -> tuple[int, bool | None]:
+    """
+    Stream a process log from `raw` to `out` (binary streams) with a fresh
+    per-event chain. Formatting follows ProcessLog.export (indent=2).
+
+    Returns (events, bulk_hash_matched). The second value is None when the
+    old log recorded no bulk hash.
+    """
+    chain_hash = chain_hasher(algorithm)
+    stream  = JsonStream(raw)
+    header: dict = {}
+    trailer: dict = {}
+    old_integrity = None
+    count   = 0
+    prev    = ""
+    seen_events = False
+    bulk    = hashlib.sha256(b"[")
+    try:
+        for key in stream.members():
+            if key != "events":
+                value = stream.value()
+                if key == "_integrity":
+                    old_integrity = value
+                elif seen_events:
+                    trailer[key] = value
+                else:
+                    header[key] = value
+                continue
+            if seen_events:
+                raise MigrationError("more than one events array")
+            seen_events = True
+            session_id = header.get("session_id")
+            if not isinstance(session_id, str):
+                raise MigrationError("session_id must precede events")
+            out.write((json.dumps(header, indent=2)[:-2] + ',\n  "events": [').encode("utf-8"))
+            batch = []
+            for event in stream.items():
+                if not isinstance(event, dict):
+                    raise MigrationError(f"event {count} is not an object")
+                stored  = event.pop("_hash", None)
+                payload = canonical_json(event)
+                bulk.update(((", " if count else "") + _encode_bulk(event)).encode("utf-8"))
+                prev = chain_hash(payload, prev, session_id)
+                if stored is not None and stored != prev:
+                    raise MigrationError(f"event {count} already has a _hash that does not "
+                                         f"match the chain; refusing to re-seal it")
+                event["_hash"] = prev
+                batch.append(("\n    " if count == 0 else ",\n    ") + _format_event(event))
+                count += 1
+                if len(batch) == _CHUNK_EVENTS:
+                    out.write("".join(batch).encode("utf-8"))
+                    batch.clear()
+            out.write("".join(batch).encode("utf-8"))
+    finally:
+        stream.detach()
+    if not seen_events:
+        raise MigrationError("no events array")
+
+    bulk_ok = None
+    if isinstance(old_integrity, dict) and old_integrity.get("algorithm") == "SHA-256" \
+            and old_integrity.get("hash"):
+        bulk.update(("]" + session_id).encode("utf-8"))
+        bulk_ok = bulk.hexdigest() == old_integrity["hash"]
+        if require_bulk_match and not bulk_ok:
+            raise MigrationError("old bulk _integrity.hash does not match the events")
+
+    integrity = {
+        "algorithm":    algorithm,
+        "chain_length": count,
+        "head_hash":    prev,
+        "session_id":   session_id,
+        "note":         "Per-event chained hash. Verify using spec §5.2.",
+    }
+    tail = ("\n  ]" if count else "]") + ',\n  "_integrity": ' \
+        + json.dumps(integrity, indent=2).replace("\n", "\n  ")
+    for key, value in trailer.items():
+        tail += f",\n  {json.dumps(key)}: " + json.dumps(value, indent=2).replace("\n", "\n  ")
+    out.write((tail + "\n}").encode("utf-8"))
+    return count, bulk_ok
+
+
+def migrate(task) -> MigrationReport:
+    """Migrate one file; task = (src, dst, algorithm, require_bulk_match, force)."""
+    src, dst, algorithm, require_bulk_match, force = task
+    report = MigrationReport(src, dst)
+    t0 = time.perf_counter()
+    try:
+        report.bytes_in = os.path.getsize(src)
+        if not force and os.path.exists(dst) and is_chained(dst):
+            report.status = "skipped"
+            report.detail = "already chained"
+            return report
+        if zipfile.is_zipfile(src):
+            _migrate_container(src, dst, algorithm, require_bulk_match, report)
+        else:
+            with _atomic(dst, src) as out, open(src, "rb") as raw:
+                report.events, report.bulk_hash = rewrite_log(raw, out, algorithm, require_bulk_match)
+        report.status = "migrated"
+    except (OSError, ValueError, KeyError, UnicodeDecodeError, zipfile.BadZipFile) as e:
+        report.detail = str(e)
+    finally:
+        report.seconds = time.perf_counter() - t0
+    return report
+
+
+def _migrate_container(src: str, dst: str, algorithm: str, require_bulk_match: bool,
+                       report: MigrationReport) -> None:
+    with zipfile.ZipFile(src) as zin:
+        names = set(zin.namelist())
+        if PROCESS_LOG_MEMBER not in names:
+            raise MigrationError(f"no {PROCESS_LOG_MEMBER} (segmented logs are always chained)")
+        with _atomic(dst, src) as fp, zipfile.ZipFile(fp, "w") as zout:
+            for info in zin.infolist():
+                if info.filename in STALE_MEMBERS:
+                    report.dropped.append(info.filename)
+                    continue
+                copy = zipfile.ZipInfo(info.filename, info.date_time)
+                copy.compress_type = info.compress_type
+                copy.external_attr = info.external_attr
+                copy.create_system = info.create_system
+                copy.comment       = info.comment
+                # A copied member keeps its size, which lets zipfile pick ZIP64
+                # itself. The rewritten log's size is unknown up front (it grows
+                # by a _hash per event), so it is always ZIP64.
+                rewritten = info.filename == PROCESS_LOG_MEMBER
+                if not rewritten:
+                    copy.file_size = info.file_size
+                with zin.open(info) as raw, zout.open(copy, "w", force_zip64=rewritten) as out:
+                    if rewritten:
+                        report.events, report.bulk_hash = rewrite_log(
+                            raw, out, algorithm, require_bulk_match)
+                    else:
+                        shutil.copyfileobj(raw, out, 1 << 20)
+
+
+class _atomic:
+    """Write to a temporary file next to `dst`; fsync and rename on success only."""
+
+    def __init__(self, dst: str, like: str):
+        self.dst  = dst
+        self.like = like
+
+    def __enter__(self):
+        folder = os.path.dirname(os.path.abspath(self.dst))
+        os.makedirs(folder, exist_ok=True)
+        fd, self.tmp = tempfile.mkstemp(dir=folder, prefix=f".{os.path.basename(self.dst)}.",
+                                        suffix=".migrating")
+        self.fp = os.fdopen(fd, "wb")
+        return self.fp
+
+    def __exit__(self, exc_type, *exc) -> None:
+        try:
+            if exc_type is None:
+                self.fp.flush()
+                os.fsync(self.fp.fileno())
+            self.fp.close()
+            if exc_type is None:
+                shutil.copymode(self.like, self.tmp)
+                os.replace(self.tmp, self.dst)
+        finally:
+            if os.path.exists(self.tmp):
+                os.unlink(self.tmp)
+
+
+def plan(paths: list[str], out: str | None) -> list[tuple[str, str]]:
+    """(source, destination) pairs; directories expand to the files below them."""
+    pairs = []
+    for root in map(Path, paths):
+        if root.is_dir():
+            found = sorted(root.rglob("*.twff")) + sorted(root.rglob("process-log.json"))
+            pairs.extend((str(f), str(Path(out) / f.relative_to(root)) if out else str(f))
+                         for f in found)
+        else:
+            pairs.append((str(root), str(Path(out) / root.name) if out else str(root)))
+    return pairs
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Migrate v0.1 bulk-hash TWFF logs to the "
+                                                 "per-event chain")
+    parser.add_argument("paths", nargs="+", help="Containers, process-log.json files or directories")
+    where = parser.add_mutually_exclusive_group(required=True)
+    where.add_argument("--out", metavar="DIR", help="Write migrated files below DIR (tree mirrored)")
+    where.add_argument("--in-place", action="store_true", help="Atomically replace each source")
+    parser.add_argument("--workers", "-j", type=int, default=os.cpu_count() or 1,
+                        help="Worker processes (default: all cores)")
+    parser.add_argument("--algorithm", default=DEFAULT_ALGORITHM, choices=sorted(CHAIN_ALGORITHMS),
+                        help="Chain algorithm (SPEC §5.9)")
+    parser.add_argument("--require-bulk-match", action="store_true",
+                        help="Fail files whose old bulk hash does not match their events")
+    parser.add_argument("--force", action="store_true",
+                        help="Migrate even if the destination is already chained")
+    parser.add_argument("--quiet", "-q", action="store_true",
+                        help="Only print failures and the summary")
+    args = parser.parse_args()
+
+    pairs = plan(args.paths, args.out)
+    if not pairs:
+        print(warn("Nothing to migrate."), file=sys.stderr)
+        return 0
+    tasks   = [(src, dst, args.algorithm, args.require_bulk_match, args.force) for src, dst in pairs]
+    workers = max(1, min(args.workers, len(tasks)))
+    print(head(f"TWFF chain migration — {len(tasks)} file(s), {workers} worker(s)"))
+
+    counts = {"migrated": 0, "skipped": 0, "failed": 0}
+    events = size = 0
+    t0 = time.perf_counter()
+    with multiprocessing.Pool(workers) as pool:
+        for report in pool.imap_unordered(migrate, tasks):
+            counts[report.status] += 1
+            if report.status == "failed":
+                print(fail(f"{report.path}: {report.detail}"))
+                continue
+            if report.status == "skipped":
+                if not args.quiet:
+                    print(f"{C.CYAN}–{C.RESET} {report.path}: {report.detail}")
+                continue
+            events += report.events
+            size   += report.bytes_in
+            if report.bulk_hash is False:
+                print(warn(f"{report.path}: old bulk hash did not match its events"))
+            if report.dropped:
+                print(warn(f"{report.path}: dropped stale {', '.join(report.dropped)}"))
+            if not args.quiet:
+                print(ok(f"{report.path} → {report.out} ({report.events:,} events)"))
+    elapsed = time.perf_counter() - t0
+
+    summary = (f"{counts['migrated']} migrated, {counts['skipped']} already chained, "
+               f"{counts['failed']} failed in {elapsed:.2f}s — "
+               f"{counts['migrated'] / elapsed:,.1f} files/s, {events / elapsed:,.0f} events/s, "
+               f"{size / 2**20 / elapsed:,.1f} MiB/s in")
+    print()
+    print(fail(summary) if counts["failed"] else ok(summary))
+    return 1 if counts["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+segment_verify.py — Verify a segmented process log (SPEC §3.5)
+
+A segmented container replaces meta/process-log.json with bounded
+meta/process-log/part-NNNN.json members and meta/process-log/index.json.
+Each index entry gives the part's first event index, event count, time range,
+per-type counts and chain anchor (the `previous_hash` entering its first
+event, SPEC §5.2). Every part therefore verifies on its own: re-derive the
+chain from its anchor and arrive exactly at the next part's anchor, or at
+`_integrity.head_hash` for the last part. The parts are checked in a process
+pool, and the index entries are checked against what each part contains.
+
+--since / --segments verify only some parts. Their anchors are then taken
+from the index on trust, the same way anchor_verify.py --resume-from trusts
+the events before its anchor.
+
+Usage:
+    python spec/verification/segment_verify.py essay.twff --workers 4
+    python spec/verification/segment_verify.py essay.twff --since 2026-02-16T14:00:00Z
+
+Exit codes:
+    0  — every chain intact
+    1  — one or more files failed
+"""
+from __future__ import annotations
+
+import argparse
+import collections
+import datetime
+import json
+import multiprocessing
+import os
+import sys
+import zipfile
+
+from stream_verify import ChainResult
+from twff_hash import CHAIN_ALGORITHMS, chain_algorithm, chain_hasher, payload_json
+from twff_json import PROCESS_LOG_MEMBER, SEGMENT_INDEX_MEMBER, SEGMENT_PREFIX
+from validate_examples import fail, head, ok
+
+
+def is_segmented(path: str) -> bool:
+    """True for a container whose log is split into segments."""
+    if not zipfile.is_zipfile(path):
+        return False
+    with zipfile.ZipFile(path) as zf:
+        names = set(zf.namelist())
+    return SEGMENT_INDEX_MEMBER in names and PROCESS_LOG_MEMBER not in names
+
+
+def read_index(path: str) -> dict:
+    with zipfile.ZipFile(path) as zf:
+        index = json.loads(zf.read(SEGMENT_INDEX_MEMBER))
+    if not isinstance(index, dict) or not isinstance(index.get("segments"), list):
+        raise ValueError(f"{SEGMENT_INDEX_MEMBER} has no segments list")
+    return index
+
+
+def verify_segmented(path: str, on_event=None, workers: int | None = None,
+                     only: set[int] | None = None) -> ChainResult:
+    """
+    Verify a segmented container's chain part by part.
+
+    Args:
+        path:     .twff container with meta/process-log/index.json.
+        on_event: Optional callback(index, event), called in log order before
+                  each event is hashed. Forces a single process.
+        workers:  Pool size (default: all cores; 1 = in this process).
+        only:     1-based part numbers to verify (default: all).
+
+    `header` of the result holds the index fields other than the segment list,
+    including _integrity, like stream_verify's ChainResult.
+    """
+    try:
+        index = read_index(path)
+    except (KeyError, ValueError, UnicodeDecodeError) as e:
+        return ChainResult(False, f"Unreadable segment index: {e}", 0)
+    segments  = index["segments"]
+    integrity = index.get("_integrity") or {}
+    header    = {k: v for k, v in index.items() if k not in ("segment_events", "segments")}
+
+    expected_first = 0
+    for n, seg in enumerate(segments, start=1):
+        if seg.get("first_index") != expected_first:
+            return ChainResult(False, f"index: part {n} starts at event {seg.get('first_index')}, "
+                                      f"expected {expected_first}", 0, header=header)
+        if not str(seg.get("href", "")).startswith(SEGMENT_PREFIX):
+            return ChainResult(False, f"index: part {n} href {seg.get('href')!r} is outside "
+                                      f"{SEGMENT_PREFIX}", 0, header=header)
+        expected_first += seg.get("count", 0)
+    if segments and segments[0].get("anchor") != "":
+        return ChainResult(False, "index: the first part's anchor must be \"\"", 0, header=header)
+    if integrity and integrity.get("chain_length", expected_first) != expected_first:
+        return ChainResult(False, f"index: parts hold {expected_first} events but "
+                                  f"_integrity.chain_length is {integrity['chain_length']}",
+                           0, header=header)
+
+    algorithm = chain_algorithm(integrity)
+    if algorithm not in CHAIN_ALGORITHMS:
+        return ChainResult(False, f"Unsupported chain algorithm {algorithm!r}", 0, header=header)
+
+    session_id = index.get("session_id", "")
+    head_hash  = integrity.get("head_hash", "")
+    tasks = []
+    for n, seg in enumerate(segments, start=1):
+        if only is not None and n not in only:
+            continue
+        last = n == len(segments)
+        tasks.append((path, n, seg, session_id, algorithm,
+                      head_hash if last else segments[n]["anchor"], last))
+
+    if on_event is not None:
+        workers = 1
+    workers = max(1, min(workers or os.cpu_count() or 1, len(tasks) or 1))
+    pool = None
+    if workers == 1:
+        results = (_verify_part(task, on_event) for task in tasks)
+    else:
+        pool = multiprocessing.Pool(workers)
+        results = pool.imap(_verify_part, tasks)
+    checked = 0
+    try:
+        for seg_ok, count, detail, bad_index in results:
+            checked += count
+            if not seg_ok:
+                return ChainResult(False, detail, checked, bad_index, header=header)
+    finally:
+        if pool is not None:
+            pool.terminate()
+
+    if only is not None:
+        detail = f"{len(tasks)} of {len(segments)} part(s) intact — {checked} events verified."
+    else:
+        detail = f"Log intact — {checked} events verified in {len(tasks)} part(s)."
+    return ChainResult(True, detail, checked, header=header)
+
+
+def _verify_part(task, on_event=None) -> tuple[bool, int, str, int | None]:
+    """Check one part against its index entry; returns (ok, events_checked, detail, bad_index)."""
+    path, n, seg, session_id, algorithm, end_hash, last = task
+    chain_hash = chain_hasher(algorithm)
+    first      = seg["first_index"]
+    prev_hash  = seg.get("anchor", "")
+    try:
+        with zipfile.ZipFile(path) as zf:
+            part = json.loads(zf.read(seg["href"]))
+    except (KeyError, ValueError, UnicodeDecodeError) as e:
+        return False, 0, f"Unreadable part {n} ({seg.get('href')}): {e}", None
+
+    events = part.get("events") if isinstance(part, dict) else None
+    if not isinstance(events, list):
+        return False, 0, f"Part {n} has no events array", None
+    if part.get("first_index", first) != first or part.get("session_id", session_id) != session_id:
+        return False, 0, f"Part {n} does not match its index entry (first_index / session_id)", None
+
+    types = collections.Counter()
+    for k, event in enumerate(events):
+        if not isinstance(event, dict):
+            return False, k, f"Event {first + k} in part {n} is not an object", first + k
+        if on_event is not None:
+            on_event(first + k, event)
+        types[event.get("type")] += 1
+        stored   = event.get("_hash", "")
+        expected = chain_hash(payload_json(event), prev_hash, session_id)
+        if stored and stored != expected:
+            return False, k, (f"Hash mismatch at event {first + k} (type={event.get('type')!r}) "
+                              f"in part {n}. Expected {expected[:16]}…, got {stored[:16]}…"), first + k
+        prev_hash = stored or expected
+
+    count = len(events)
+    if count != seg.get("count"):
+        return False, count, f"Part {n} holds {count} events, index says {seg.get('count')}", None
+    if prev_hash != end_hash:
+        what = "_integrity.head_hash" if last else f"the anchor of part {n + 1}"
+        return False, count, (f"Part {n} does not join {what}. "
+                              f"Expected {end_hash[:16]}…, got {prev_hash[:16]}…"), None
+    if "types" in seg and dict(types) != seg["types"]:
+        return False, count, f"Part {n} type counts differ from the index", None
+    if events and (events[0].get("timestamp") != seg.get("start_time")
+                   or events[-1].get("timestamp") != seg.get("end_time")):
+        return False, count, f"Part {n} time range differs from the index", None
+    return True, count, "", None
+
+
+def _parse_time(ts: str) -> datetime.datetime:
+    dt = datetime.datetime.fromisoformat(ts[:-1] + "+00:00" if ts.endswith("Z") else ts)
+    return dt if dt.tzinfo else dt.replace(tzinfo=datetime.timezone.utc)
+
+
+def parts_since(index: dict, since: str) -> set[int]:
+    """Part numbers whose time range ends at or after `since`."""
+    cutoff = _parse_time(since)
+    return {n for n, seg in enumerate(index["segments"], start=1)
+            if _parse_time(seg["end_time"]) >= cutoff}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Segmented TWFF chain verifier")
+    parser.add_argument("files", nargs="+", help="segmented .twff containers")
+    parser.add_argument("--workers", "-j", type=int, default=None,
+                        help="Worker processes (default: all cores)")
+    which = parser.add_mutually_exclusive_group()
+    which.add_argument("--since", metavar="TIMESTAMP",
+                       help="Only verify parts ending at or after this ISO-8601 time")
+    which.add_argument("--segments", metavar="N[,N...]",
+                       type=lambda s: {int(n) for n in s.split(",")},
+                       help="Only verify these 1-based part numbers")
+    args = parser.parse_args()
+
+    print(head(f"TWFF segmented chain verifier — {len(args.files)} file(s)"))
+    failed = 0
+    for path in args.files:
+        try:
+            only = args.segments
+            if args.since:
+                only = parts_since(read_index(path), args.since)
+            result = verify_segmented(path, workers=args.workers, only=only)
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile) as e:
+            result = ChainResult(False, str(e), 0)
+        if result.ok:
+            print(ok(f"{path}: {result.detail}"))
+        else:
+            failed += 1
+            print(fail(f"{path}: {result.detail}"))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
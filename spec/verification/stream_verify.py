@@ -0,0 +1,403 @@
+#!/usr/bin/env python3
+"""
+stream_verify.py — Constant-memory SPEC §5.2 hash-chain verifier
+
+verify_process_log() and validate_examples.verify_hash_chain() take the whole
+log as a dict. This verifier instead pulls meta/process-log.json through an
+event-at-a-time JSON parser, straight out of a .twff ZIP member (inflated as
+it is read) or a bare process-log.json, so memory stays bounded by one read
+chunk plus one event regardless of log size.
+
+The first broken link is reported with its event index and the byte offset of
+that event inside the (decompressed) process-log.json.
+
+A successful result carries a Checkpoint (event count, head hash, byte offset
+of the last event). Passing it back when the log has grown verifies only the
+new events: the verifier seeks to the offset, confirms the event there still
+has the trusted hash and continues from it, so a re-check costs O(new
+events). If the offset no longer lines up, it falls back to parsing the
+prefix without hashing it. Events before the checkpoint are trusted as they
+were; run a full pass when the file may have been rewritten rather than
+appended to.
+
+Usage:
+    python spec/verification/stream_verify.py essay.twff other/process-log.json
+    python spec/verification/stream_verify.py essay.twff --since 1204:<hash>:398122
+
+Exit codes:
+    0  — every chain intact
+    1  — one or more files failed
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import functools
+import sys
+import zipfile
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+from twff_hash import (
+    CHAIN_ALGORITHMS,
+    DEFAULT_ALGORITHM,
+    canonical_json,
+    chain_algorithm,
+    chain_hasher,
+    detect_algorithm,
+)
+from twff_json import CHUNK_CHARS, PROCESS_LOG_MEMBER, JsonStream
+from validate_examples import fail, head, ok
+
+
+@dataclass(frozen=True)
+class Checkpoint:
+    """
+    A trusted chain state: events[:index] verified, the last of them has
+    _hash == hash. `offset` is the byte offset of that event's opening brace
+    in process-log.json, if known.
+    """
+    index:  int
+    hash:   str
+    offset: int | None = None
+
+    @classmethod
+    def parse(cls, text: str) -> "Checkpoint":
+        """From "INDEX:HASH" or "INDEX:HASH:OFFSET" (the CLI form)."""
+        parts = text.split(":")
+        if len(parts) not in (2, 3):
+            raise ValueError(f"checkpoint must be INDEX:HASH[:OFFSET], got {text!r}")
+        return cls(int(parts[0]), parts[1], int(parts[2]) if len(parts) == 3 else None)
+
+    def __str__(self) -> str:
+        return f"{self.index}:{self.hash}" + (f":{self.offset}" if self.offset is not None else "")
+
+
+@dataclass
+class ChainResult:
+    """
+    Outcome of a streaming verification.
+
+    `index` and `offset` locate the first bad event (offset is in bytes from
+    the start of process-log.json); both are None when the chain is intact or
+    the failure is not tied to one event. `header` holds the top-level fields
+    other than events (including a trailing _integrity block). `checkpoint`
+    is set when the chain verified; `events` counts only the events hashed
+    in this call.
+    """
+    ok:         bool
+    detail:     str
+    events:     int
+    index:      int | None = None
+    offset:     int | None = None
+    header:     dict = field(default_factory=dict)
+    checkpoint: Checkpoint | None = None
+
+
+def verify_stream(source, member: str = PROCESS_LOG_MEMBER,
+                  chunk_chars: int = CHUNK_CHARS,
+                  on_event: Callable[[int, dict], None] | None = None,
+                  checkpoint: Checkpoint | None = None) -> ChainResult:
+    """
+    Verify the SPEC §5.2 chain of a process log without loading it.
+
+    Args:
+        source:     Path to a .twff container or process-log.json, or a
+                    seekable binary file object holding either.
+        member:     Process-log member name inside a container.
+        on_event:   Called as on_event(index, event) for every event, before its
+                    hash is checked, so other per-event checks can share the pass.
+                    The event must not be kept.
+        checkpoint: Trusted state from an earlier result; only events after it
+                    are hashed (and passed to on_event).
+
+    A segmented container (SPEC §3.5) is verified part by part with
+    segment_verify.verify_segmented().
+    """
+    if member == PROCESS_LOG_MEMBER:
+        # segment_verify builds on this module, so it is imported late.
+        from segment_verify import is_segmented, verify_segmented
+        if is_segmented(source):
+            if checkpoint is not None:
+                return ChainResult(False, "Checkpoints do not apply to a segmented container; "
+                                          "use segment_verify.py --since", 0)
+            return verify_segmented(source, on_event, workers=1)
+    opener = functools.partial(open_log, source, member)
+    if checkpoint is not None and checkpoint.index and checkpoint.offset is not None:
+        result = _verify_tail(opener, checkpoint, chunk_chars, on_event)
+        if result is not None:
+            return result
+    result, session_id = _verify_pass(opener, None, chunk_chars, on_event, checkpoint)
+    if result is None:
+        # session_id came after the events array: re-read with it in hand.
+        result, _ = _verify_pass(opener, session_id or "", chunk_chars, on_event, checkpoint)
+    return result
+
+
+@contextlib.contextmanager
+def open_log(source, member: str):
+    """Open the process-log bytes of a container, a bare JSON file or a file object."""
+    is_file = hasattr(source, "read")
+    if is_file:
+        source.seek(0)
+    if zipfile.is_zipfile(source):
+        if is_file:
+            source.seek(0)
+        with zipfile.ZipFile(source) as zf, zf.open(member) as raw:
+            yield raw
+    elif is_file:
+        source.seek(0)
+        yield source
+    else:
+        with open(source, "rb") as raw:
+            yield raw
+
+
+class _Chain:
+    """Running SPEC §5.2 state shared by the full and the tail pass."""
+
+    def __init__(self, session_id: str, prev_hash: str = "", algorithm: str | None = None):
+        self.session_id = session_id
+        self.prev_hash  = prev_hash
+        self.algorithm  = algorithm
+        self._hasher    = None
+
+    def step(self, event: dict) -> tuple[str, str]:
+        """Hash one decoded event (its _hash is removed); returns (stored, expected)."""
+        # The decoded event is ours: drop _hash in place rather than copying
+        # the payload into a new dict.
+        stored  = event.pop("_hash", "")
+        payload = canonical_json(event)
+        if self._hasher is None:
+            # _integrity normally trails the events, so unless it came first
+            # the first hashed event tells which algorithm built the chain.
+            if self.algorithm is None and stored:
+                self.algorithm = detect_algorithm(payload, stored, self.prev_hash, self.session_id)
+            self._hasher = chain_hasher(self.algorithm or DEFAULT_ALGORITHM)
+        expected = self._hasher(payload, self.prev_hash, self.session_id)
+        self.prev_hash = stored or expected
+        return stored, expected
+
+
+def _mismatch(index: int, event: dict, offset: int, stored: str, expected: str) -> str:
+    return (f"Hash mismatch at event {index} (type={event.get('type')!r}) at byte {offset}. "
+            f"Expected {expected[:16]}…, got {stored[:16]}…")
+
+
+def _verify_pass(opener, session_id: str | None, chunk_chars: int, on_event,
+                 checkpoint: Checkpoint | None = None) -> tuple[ChainResult | None, str | None]:
+    """
+    One pass over the log. Returns (None, session_id) if the events came
+    before session_id and must be re-read. Events up to `checkpoint` are
+    parsed but not hashed; the last of them must still carry its hash.
+    """
+    trusted   = checkpoint.index if checkpoint is not None else 0
+    count     = 0
+    deferred  = False
+    chain     = None
+    header: dict = {}
+    skip_header = session_id is not None
+    stream = None
+    offset = None
+    last   = None
+
+    try:
+        with opener() as raw:
+            stream = JsonStream(raw, chunk_chars)
+            try:
+                for key in stream.members():
+                    if key == "events":
+                        if session_id is None:
+                            deferred = True
+                            for _ in stream.items():
+                                pass
+                            continue
+                        chain = _Chain(session_id, checkpoint.hash if trusted else "")
+                        if "_integrity" in header:
+                            chain.algorithm = chain_algorithm(header["_integrity"])
+                            if chain.algorithm not in CHAIN_ALGORITHMS:
+                                return ChainResult(False, (
+                                    f"Unsupported chain algorithm {chain.algorithm!r}"
+                                ), 0, header=header), session_id
+                        for mark, event in stream.marked_items():
+                            if not isinstance(event, dict):
+                                raise ValueError(f"event {count} is not an object")
+                            stream.pin(mark)
+                            if count < trusted:
+                                if count == trusted - 1 and event.get("_hash") != checkpoint.hash:
+                                    offset = stream.byte_offset(mark)
+                                    return ChainResult(False, (
+                                        f"Checkpoint mismatch: event {count} no longer has the "
+                                        f"trusted hash {checkpoint.hash[:16]}…"
+                                    ), 0, count, offset, header), session_id
+                                count += 1
+                                continue
+                            if on_event is not None:
+                                on_event(count, event)
+                            stored, expected = chain.step(event)
+                            if stored and stored != expected:
+                                offset = stream.byte_offset(mark)
+                                return ChainResult(False, _mismatch(count, event, offset, stored, expected),
+                                                   count - trusted, count, offset, header), session_id
+                            count += 1
+                        last = stream.pinned_offset()
+                    else:
+                        header[key] = value = stream.value()
+                        if key == "session_id" and not skip_header:
+                            session_id = value
+            finally:
+                offset = stream.position()
+                stream.detach()
+    except (ValueError, UnicodeDecodeError, zipfile.BadZipFile, KeyError) as e:
+        where = f" near byte {offset}" if offset is not None else ""
+        return ChainResult(False, f"Unreadable process log{where}: {e}",
+                           max(0, count - trusted), None, offset, header), session_id
+
+    if deferred:
+        return None, session_id
+    if count < trusted:
+        return ChainResult(False, (
+            f"Checkpoint is past the end of the log ({count} events, checkpoint at {trusted})"
+        ), 0, header=header), session_id
+    return _finish(chain or _Chain(session_id or ""), header, count, count - trusted, last), session_id
+
+
+def _verify_tail(opener, checkpoint: Checkpoint, chunk_chars: int,
+                 on_event) -> ChainResult | None:
+    """
+    Seek to checkpoint.offset and verify only what follows. Returns None when
+    the offset does not land on the trusted event (the caller then falls back
+    to a full pass) or when session_id does not precede the events.
+    """
+    header: dict = {}
+    with opener() as raw:
+        stream = JsonStream(raw, chunk_chars)
+        try:
+            for key in stream.members():
+                if key == "events":
+                    break
+                header[key] = stream.value()
+        except (ValueError, UnicodeDecodeError):
+            return None
+        finally:
+            stream.detach()
+    session_id = header.get("session_id")
+    if not isinstance(session_id, str) or checkpoint.offset < stream.position():
+        return None
+
+    base   = checkpoint.offset
+    count  = checkpoint.index
+    offset = None
+    last   = base
+    try:
+        with opener() as raw:
+            raw.seek(base)
+            stream = JsonStream(raw, chunk_chars)
+            try:
+                try:
+                    anchor = stream.value()
+                except ValueError:
+                    return None
+                if not isinstance(anchor, dict) or anchor.get("_hash") != checkpoint.hash:
+                    return None
+
+                chain = _Chain(session_id, checkpoint.hash)
+                if "_integrity" in header:
+                    chain.algorithm = chain_algorithm(header["_integrity"])
+                    if chain.algorithm not in CHAIN_ALGORITHMS:
+                        return ChainResult(False, f"Unsupported chain algorithm {chain.algorithm!r}",
+                                           0, header=header)
+                sep = stream.next_char()
+                while sep == ",":
+                    mark  = stream.mark()
+                    event = stream.value()
+                    if not isinstance(event, dict):
+                        raise ValueError(f"event {count} is not an object")
+                    stream.pin(mark)
+                    if on_event is not None:
+                        on_event(count, event)
+                    stored, expected = chain.step(event)
+                    if stored and stored != expected:
+                        offset = base + stream.byte_offset(mark)
+                        return ChainResult(False, _mismatch(count, event, offset, stored, expected),
+                                           count - checkpoint.index, count, offset, header)
+                    count += 1
+                    sep = stream.next_char()
+                if sep != "]":
+                    raise ValueError(f"expected ',' or ']', got {sep!r}")
+                if count > checkpoint.index:
+                    last = base + stream.pinned_offset()
+
+                # Whatever follows the events array (normally _integrity).
+                sep = stream.next_char()
+                while sep == ",":
+                    key = stream.value()
+                    stream.expect(":")
+                    header[key] = stream.value()
+                    sep = stream.next_char()
+                if sep != "}":
+                    raise ValueError(f"expected ',' or '}}', got {sep!r}")
+            finally:
+                offset = base + stream.position()
+                stream.detach()
+    except (ValueError, UnicodeDecodeError, zipfile.BadZipFile, KeyError) as e:
+        return ChainResult(False, f"Unreadable process log near byte {offset}: {e}",
+                           count - checkpoint.index, None, offset, header)
+
+    return _finish(chain, header, count, count - checkpoint.index, last)
+
+
+def _finish(chain: _Chain, header: dict, count: int, hashed: int,
+            last_offset: int | None) -> ChainResult:
+    """Check the _integrity block against the verified chain."""
+    integrity = header.get("_integrity")
+    if isinstance(integrity, dict) and count:
+        declared = chain_algorithm(integrity)
+        if declared not in CHAIN_ALGORITHMS:
+            return ChainResult(False, f"Unsupported chain algorithm {declared!r}",
+                               hashed, header=header)
+        if chain.algorithm is not None and chain.algorithm != declared:
+            return ChainResult(False, (
+                f"Chain was built with {chain.algorithm} but _integrity.algorithm is {declared}"
+            ), hashed, header=header)
+    head_hash = integrity.get("head_hash", "") if isinstance(integrity, dict) else ""
+    if head_hash and head_hash != chain.prev_hash:
+        return ChainResult(False, (
+            f"_integrity.head_hash mismatch. "
+            f"Expected {chain.prev_hash[:16]}…, got {head_hash[:16]}…"
+        ), hashed, header=header)
+    if hashed == count:
+        detail = f"Log intact — {count} events verified."
+    else:
+        detail = f"Log intact — {hashed} new events verified after checkpoint {count - hashed}."
+    return ChainResult(True, detail, hashed, header=header,
+                       checkpoint=Checkpoint(count, chain.prev_hash, last_offset if count else None))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Streaming TWFF hash-chain verifier")
+    parser.add_argument("files", nargs="+", help=".twff containers or process-log.json files")
+    parser.add_argument("--member", default=PROCESS_LOG_MEMBER,
+                        help="Process-log member inside a container")
+    parser.add_argument("--since", type=Checkpoint.parse, metavar="INDEX:HASH[:OFFSET]",
+                        help="Only verify events after this trusted checkpoint")
+    args = parser.parse_args()
+
+    print(head(f"TWFF streaming chain verifier — {len(args.files)} file(s)"))
+    failed = 0
+    for path in args.files:
+        try:
+            result = verify_stream(path, args.member, checkpoint=args.since)
+        except OSError as e:
+            result = ChainResult(False, str(e), 0)
+        if result.ok:
+            print(ok(f"{path}: {result.detail}"))
+            print(f"    checkpoint {result.checkpoint}")
+        else:
+            failed += 1
+            print(fail(f"{path}: {result.detail}"))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+twff_hash.py — Canonical JSON and SPEC §5.2 event hashing, in one place
+
+Every producer and verifier in this repository hashes events through this
+module (ProcessLog, verify_process_log.py, validate_examples.py and the
+streaming / anchored / Merkle verifiers), so they cannot drift apart. The
+SPEC §5.7 Merkle leaf and node hashes live here for the same reason.
+The directory is a small distribution (pyproject.toml): glassbox installs it
+from requirements.txt, and anything else that produces TWFF can
+`pip install ./spec/verification` and import twff_hash (and twff_json, the
+shared streaming parser).
+
+canonical_json(x) is byte-identical to
+json.dumps(x, separators=(",", ":"), sort_keys=True) — same escaping
+(ensure_ascii), same float repr — but reuses one C encoder instead of
+building a JSONEncoder per call, and compute_event_hash() strips `_hash`
+with a C-level dict copy rather than a comprehension. Together that is
+roughly 1.9x the previous hashes/s (benchmarks/bench_canonical_hash.py).
+
+The chain digest is pluggable (SPEC §5.9): CHAIN_ALGORITHMS maps the
+`_integrity.algorithm` name to a hashlib constructor. Every entry produces a
+256-bit digest, so `_hash` keeps its 64-hex-digit format. SHA-256-CHAIN is
+the default and the only algorithm of TWFF v0.1.
+
+hash_vectors.json (next to this file) pins the output; run this module to
+check it:
+
+    python spec/verification/twff_hash.py
+"""
+from __future__ import annotations
+
+import functools
+import hashlib
+import json
+import sys
+from pathlib import Path
+
+try:
+    from json.encoder import c_make_encoder, encode_basestring_ascii
+except ImportError:  # pure-Python json build
+    c_make_encoder = None
+
+VECTORS_FILE = Path(__file__).parent / "hash_vectors.json"
+
+DEFAULT_ALGORITHM = "SHA-256-CHAIN"
+
+CHAIN_ALGORITHMS = {
+    "SHA-256-CHAIN":     hashlib.sha256,
+    "BLAKE2B-256-CHAIN": functools.partial(hashlib.blake2b, digest_size=32),
+    "BLAKE2S-256-CHAIN": hashlib.blake2s,
+    "SHA3-256-CHAIN":    hashlib.sha3_256,
+}
+
+
+def _unserialisable(obj):
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+if c_make_encoder is not None:
+    # Arguments mirror what json.dumps(separators=(",", ":"), sort_keys=True)
+    # passes on its fast path. No circular-reference markers: payloads are
+    # plain JSON data (a cycle fails with RecursionError instead).
+    _iterencode = c_make_encoder(None, _unserialisable, encode_basestring_ascii, None,
+                                 ":", ",", True, False, True)
+
+    def canonical_json(obj) -> str:
+        """Compact, key-sorted JSON (SPEC §5.2 JSON.compact_sorted)."""
+        if isinstance(obj, str):
+            return encode_basestring_ascii(obj)
+        return "".join(_iterencode(obj, 0))
+else:
+    canonical_json = json.JSONEncoder(separators=(",", ":"), sort_keys=True).encode
+
+
+def payload_json(event: dict) -> str:
+    """Canonical JSON of an event's hashed payload — the event without _hash."""
+    if "_hash" in event:
+        event = event.copy()
+        del event["_hash"]
+    return canonical_json(event)
+
+
+def chain_hasher(algorithm: str = DEFAULT_ALGORITHM):
+    """
+    chain_hash(payload, previous_hash, session_id) bound to one algorithm,
+    for hot loops. Raises ValueError for an unknown algorithm name.
+    """
+    try:
+        new = CHAIN_ALGORITHMS[algorithm]
+    except KeyError:
+        raise ValueError(f"unsupported chain algorithm {algorithm!r}") from None
+
+    def chain_hash(payload: str, previous_hash: str, session_id: str) -> str:
+        return new((payload + "|" + previous_hash + "|" + session_id).encode("utf-8")).hexdigest()
+    return chain_hash
+
+
+_HASHERS = {name: chain_hasher(name) for name in CHAIN_ALGORITHMS}
+
+#: SPEC §5.2 hash (SHA-256) from an already-canonical payload string.
+chain_hash = _HASHERS[DEFAULT_ALGORITHM]
+
+
+def compute_event_hash(event: dict, previous_hash: str, session_id: str,
+                       algorithm: str = DEFAULT_ALGORITHM) -> str:
+    """Compute the _hash for a single event. Excludes _hash from payload."""
+    try:
+        hasher = _HASHERS[algorithm]
+    except KeyError:
+        raise ValueError(f"unsupported chain algorithm {algorithm!r}") from None
+    return hasher(payload_json(event), previous_hash, session_id)
+
+
+# SPEC §5.7 Merkle tree hashing, RFC 9162 §2.1: a leaf is the §5.2 payload
+# with the session id, an interior node its two children, each domain-separated.
+MERKLE_ALGORITHM  = "SHA-256-MERKLE"
+MERKLE_EMPTY_ROOT = hashlib.sha256(b"").digest()
+
+
+def merkle_leaf(payload: str, session_id: str) -> bytes:
+    """Leaf hash from an event's canonical payload JSON (event without _hash)."""
+    return hashlib.sha256(b"\x00" + (payload + "|" + session_id).encode("utf-8")).digest()
+
+
+def merkle_node(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(b"\x01" + left + right).digest()
+
+
+def chain_algorithm(integrity: dict | None) -> str:
+    """
+    The chain algorithm named by an _integrity block. The v0.1 bulk "SHA-256"
+    block and a missing block both mean the default chain.
+    """
+    algorithm = (integrity or {}).get("algorithm", DEFAULT_ALGORITHM)
+    return DEFAULT_ALGORITHM if algorithm == "SHA-256" else algorithm
+
+
+def detect_algorithm(payload: str, stored_hash: str, previous_hash: str,
+                     session_id: str) -> str | None:
+    """
+    Which chain algorithm turns this canonical payload into stored_hash, or
+    None. Lets a streaming verifier pick the algorithm from the first event,
+    before it reaches the trailing _integrity block.
+    """
+    for name, hasher in _HASHERS.items():
+        if hasher(payload, previous_hash, session_id) == stored_hash:
+            return name
+    return None
+
+
+def check_vectors(path: Path = VECTORS_FILE) -> list[str]:
+    """Run the pinned test vectors. Returns a list of failures (empty = pass)."""
+    with open(path, encoding="utf-8") as f:
+        vectors = json.load(f)["vectors"]
+    failures = []
+    for v in vectors:
+        payload = payload_json(v["event"])
+        if payload != v["payload_json"]:
+            failures.append(f"{v['name']}: payload {payload!r} != {v['payload_json']!r}")
+        digest = compute_event_hash(v["event"], v["previous_hash"], v["session_id"],
+                                    v.get("algorithm", DEFAULT_ALGORITHM))
+        if digest != v["hash"]:
+            failures.append(f"{v['name']}: hash {digest} != {v['hash']}")
+    return failures
+
+
+def main() -> int:
+    failures = check_vectors()
+    for f in failures:
+        print(f"FAIL: {f}")
+    if failures:
+        return 1
+    print(f"OK: all vectors in {VECTORS_FILE.name} match "
+          f"({'C' if c_make_encoder is not None else 'pure-Python'} encoder)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,192 @@
+"""
+twff_json.py — Event-at-a-time reader for process-log JSON
+
+A process log can be far larger than the memory a reader wants to spend on
+it. JsonStream pulls a UTF-8 JSON byte stream (typically a ZIP member being
+inflated as it is read) through a bounded text buffer and decodes one value
+at a time, which is just deep enough to walk the top-level object and its
+events array.
+
+It is the only such parser in the repository: glassbox's ProcessLogReader,
+the streaming / anchored verifiers and migrate_chain.py all use it, so they
+agree on what a well-formed log is. Any position can be mapped back to a
+byte offset in the stream; offsets are computed lazily (only the discarded
+prefix of each refill is counted), so the happy path pays one isascii() per
+chunk. The member names the log is stored under are defined here too, for
+the same reason.
+
+    with zipfile.ZipFile("essay.twff") as zf, zf.open(PROCESS_LOG_MEMBER) as raw:
+        stream = JsonStream(raw)
+        for key in stream.members():
+            if key == "events":
+                for event in stream.items():
+                    ...
+            else:
+                stream.value()
+"""
+from __future__ import annotations
+
+import io
+import json
+import re
+from collections.abc import Iterator
+
+# Where the process log lives in a container (SPEC §3.2): one member, or
+# bounded parts plus an index under SEGMENT_PREFIX (SPEC §3.5).
+PROCESS_LOG_MEMBER   = "meta/process-log.json"
+SEGMENT_PREFIX       = "meta/process-log/"
+SEGMENT_INDEX_MEMBER = SEGMENT_PREFIX + "index.json"
+
+CHUNK_CHARS = 64 * 1024
+
+_WS = re.compile(r"[ \t\n\r]*")
+
+
+class JsonStream:
+    """
+    Pull parser over a UTF-8 JSON byte stream.
+
+    A mark is an absolute character position (from mark()); byte_offset()
+    turns one that is still buffered into a byte offset, and pin() keeps one
+    resolvable after it has been dropped from the buffer.
+    """
+
+    def __init__(self, raw, chunk_chars: int = CHUNK_CHARS):
+        self._text       = io.TextIOWrapper(raw, encoding="utf-8")
+        self._chunk      = chunk_chars
+        self._buf        = ""
+        self._pos        = 0
+        self._eof        = False
+        self._char_base  = 0   # characters discarded before _buf[0]
+        self._byte_base  = 0   # bytes those characters occupied
+        self._pin        = None
+        self._pin_byte   = None
+        self._decoder    = json.JSONDecoder()
+
+    def detach(self) -> None:
+        """Release the underlying stream without closing it."""
+        self._text.detach()
+
+    #  Positions
+
+    def mark(self) -> int:
+        """Absolute character position of the next value."""
+        self._skip_ws()
+        return self._char_base + self._pos
+
+    def position(self) -> int:
+        """Byte offset of the parser's current position (no further reads)."""
+        return self.byte_offset(self._char_base + self._pos)
+
+    def byte_offset(self, mark: int) -> int:
+        """Byte offset of a mark that is still inside the buffer."""
+        return self._byte_base + len(self._buf[:mark - self._char_base].encode("utf-8"))
+
+    def pin(self, mark: int) -> None:
+        """
+        Remember a mark whose byte offset may be wanted after it has left the
+        buffer. O(1); the offset is resolved at most once per refill.
+        """
+        self._pin, self._pin_byte = mark, None
+
+    def pinned_offset(self) -> int | None:
+        if self._pin is None:
+            return None
+        if self._pin_byte is None:
+            self._pin_byte = self.byte_offset(self._pin)
+        return self._pin_byte
+
+    #  Tokens and values
+
+    def next_char(self) -> str:
+        """Consume and return the next non-whitespace character ('' at EOF)."""
+        self._skip_ws()
+        if self._pos >= len(self._buf):
+            return ""
+        ch = self._buf[self._pos]
+        self._pos += 1
+        return ch
+
+    def peek_char(self) -> str:
+        self._skip_ws()
+        return self._buf[self._pos] if self._pos < len(self._buf) else ""
+
+    def expect(self, ch: str) -> None:
+        got = self.next_char()
+        if got != ch:
+            raise ValueError(f"expected {ch!r}, got {got!r}")
+
+    def value(self):
+        """Decode one complete JSON value."""
+        self._skip_ws()
+        while True:
+            try:
+                obj, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number ending exactly at the buffer edge may be cut short.
+            if end == len(self._buf) and not self._eof and self._fill():
+                continue
+            self._pos = end
+            return obj
+
+    def members(self) -> Iterator[str]:
+        """Walk an object: yields each key, leaving the stream at its value."""
+        self.expect("{")
+        if self.peek_char() == "}":
+            self.next_char()
+            return
+        while True:
+            key = self.value()
+            self.expect(":")
+            yield key
+            sep = self.next_char()
+            if sep == "}":
+                return
+            if sep != ",":
+                raise ValueError(f"expected ',' or '}}', got {sep!r}")
+
+    def items(self) -> Iterator:
+        """Walk an array, decoding one element at a time."""
+        for _, element in self.marked_items():
+            yield element
+
+    def marked_items(self) -> Iterator[tuple[int, object]]:
+        """Walk an array, yielding (mark, element) one element at a time."""
+        self.expect("[")
+        if self.peek_char() == "]":
+            self.next_char()
+            return
+        while True:
+            mark = self.mark()
+            yield mark, self.value()
+            sep = self.next_char()
+            if sep == "]":
+                return
+            if sep != ",":
+                raise ValueError(f"expected ',' or ']', got {sep!r}")
+
+    def _skip_ws(self) -> None:
+        while True:
+            self._pos = _WS.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf) or not self._fill():
+                return
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        chunk = self._text.read(self._chunk)
+        if not chunk:
+            self._eof = True
+            return False
+        dropped = self._buf[:self._pos]
+        if (self._pin is not None and self._pin_byte is None
+                and self._pin < self._char_base + len(dropped)):
+            self._pin_byte = self.byte_offset(self._pin)
+        self._char_base += len(dropped)
+        self._byte_base += len(dropped) if dropped.isascii() else len(dropped.encode("utf-8"))
+        self._buf = self._buf[self._pos:] + chunk
+        self._pos = 0
+        return True
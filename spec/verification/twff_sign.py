@@ -0,0 +1,513 @@
+#!/usr/bin/env python3
+"""
+twff_sign.py — Ed25519 signatures over head_hash in META-INF/signatures.xml (SPEC §5.6)
+
+An author signs the chain summary from `_integrity` (algorithm, session_id,
+chain_length, head_hash, plus the Merkle root and chain anchors when the log
+has them) with a local Ed25519 key. The signature goes into
+META-INF/signatures.xml together with the public key:
+
+    <signatures>
+      <Signature Id="<key id>">
+        <SignedInfo>
+          <SignatureMethod Algorithm="Ed25519"/>
+          <DigestMethod Algorithm="SHA-256-CHAIN"/>
+          <DigestValue>head_hash</DigestValue>
+          <SessionId>…</SessionId>
+          <ChainLength>…</ChainLength>
+        </SignedInfo>
+        <SignatureValue>base64</SignatureValue>
+        <KeyInfo><KeyValue>base64 raw public key</KeyValue></KeyInfo>
+      </Signature>
+    </signatures>
+
+Verification recomputes the signed message from the container's own
+`_integrity` block, never from the XML, so a signature only verifies for the
+chain it was made over. A key id is the first 16 hex digits of
+SHA-256(raw public key); pass --trusted-keys to require a known signer.
+
+Everything runs offline. Batch verification fans containers out over a
+process pool like bulk_verify.py and keeps parsed public keys cached per
+worker. Every chain is re-verified before its signatures are checked, since
+a signature over a head_hash the events do not lead to proves nothing.
+--skip-chain reads only `_integrity` from the tail of each log instead; its
+results are labelled "chain NOT verified".
+
+Needs the `cryptography` package (pip install cryptography).
+
+Usage:
+    python spec/verification/twff_sign.py keygen author.key          # + author.pub
+    python spec/verification/twff_sign.py sign essay.twff --key author.key
+    python spec/verification/twff_sign.py verify submissions/ -j 8 --trusted-keys keys/
+
+Exit codes:
+    0  — every container carries a valid signature
+    1  — one or more containers failed
+    2  — missing dependency (cryptography not installed)
+"""
+from __future__ import annotations
+
+import argparse
+import base64
+import functools
+import hashlib
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+import zipfile
+from collections.abc import Iterable, Iterator
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+from anchor_verify import read_integrity
+from segment_verify import is_segmented, verify_segmented
+from stream_verify import ChainResult, verify_stream
+from twff_hash import canonical_json, chain_algorithm
+from validate_examples import C, fail, head, ok, warn
+
+try:
+    from cryptography.exceptions import InvalidSignature
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric.ed25519 import (
+        Ed25519PrivateKey,
+        Ed25519PublicKey,
+    )
+except ImportError:  # optional dependency; main() reports it
+    Ed25519PrivateKey = None
+
+SIGNATURES_MEMBER = "META-INF/signatures.xml"
+SIGNATURE_METHOD  = "Ed25519"
+
+# Domain separation: the signed bytes can never be mistaken for anything else.
+_DOMAIN = "TWFF-SIGNATURE-1"
+
+_DOCUMENT_TEMPLATE = '<?xml version="1.0" encoding="UTF-8"?>\n<signatures>\n{signatures}</signatures>\n'
+_SIGNATURE_TEMPLATE = (
+    '  <Signature Id="{key_id}">\n'
+    '    <SignedInfo>\n'
+    '      <SignatureMethod Algorithm="{method}"/>\n'
+    '      <DigestMethod Algorithm="{algorithm}"/>\n'
+    '      <DigestValue>{head_hash}</DigestValue>\n'
+    '      <SessionId>{session_id}</SessionId>\n'
+    '      <ChainLength>{chain_length}</ChainLength>\n'
+    '    </SignedInfo>\n'
+    '    <SignatureValue>{signature}</SignatureValue>\n'
+    '    <KeyInfo><KeyValue>{public_key}</KeyValue></KeyInfo>\n'
+    '  </Signature>\n'
+)
+
+
+@dataclass
+class Signature:
+    """One <Signature> element. `value` and `public_key` are raw bytes."""
+    key_id:       str
+    method:       str
+    algorithm:    str
+    head_hash:    str
+    session_id:   str
+    chain_length: int
+    value:        bytes
+    public_key:   bytes
+
+    def to_xml(self) -> str:
+        return _SIGNATURE_TEMPLATE.format(
+            key_id=self.key_id, method=self.method, algorithm=escape(self.algorithm),
+            head_hash=escape(self.head_hash), session_id=escape(self.session_id),
+            chain_length=self.chain_length,
+            signature=base64.b64encode(self.value).decode("ascii"),
+            public_key=base64.b64encode(self.public_key).decode("ascii"),
+        )
+
+
+@dataclass
+class SignatureReport:
+    path:           str
+    ok:             bool = False
+    signers:        list[str] = field(default_factory=list)
+    events:         int = 0
+    seconds:        float = 0.0
+    errors:         list[str] = field(default_factory=list)
+    chain_verified: bool = False
+
+
+# ── Keys
+
+def key_id(public_key: bytes) -> str:
+    """Fingerprint of a raw Ed25519 public key."""
+    return hashlib.sha256(public_key).hexdigest()[:16]
+
+
+def _raw_public(key: "Ed25519PublicKey") -> bytes:
+    return key.public_bytes(serialization.Encoding.Raw, serialization.PublicFormat.Raw)
+
+
+@functools.lru_cache(maxsize=4096)
+def _public_key(raw: bytes) -> "Ed25519PublicKey":
+    return Ed25519PublicKey.from_public_bytes(raw)
+
+
+def generate_keypair(private_path: str, password: bytes | None = None) -> str:
+    """
+    Write a new PKCS#8 private key to private_path (mode 0600) and its public
+    key next to it with a .pub suffix. Returns the key id.
+    """
+    key = Ed25519PrivateKey.generate()
+    encryption = (serialization.BestAvailableEncryption(password) if password
+                  else serialization.NoEncryption())
+    pem = key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8,
+                            encryption)
+    fd = os.open(private_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        f.write(pem)
+    public = key.public_key()
+    with open(Path(private_path).with_suffix(".pub"), "wb") as f:
+        f.write(public.public_bytes(serialization.Encoding.PEM,
+                                    serialization.PublicFormat.SubjectPublicKeyInfo))
+    return key_id(_raw_public(public))
+
+
+def load_private_key(path: str, password: bytes | None = None) -> "Ed25519PrivateKey":
+    with open(path, "rb") as f:
+        key = serialization.load_pem_private_key(f.read(), password)
+    if not isinstance(key, Ed25519PrivateKey):
+        raise ValueError(f"{path}: not an Ed25519 private key")
+    return key
+
+
+def load_trusted_keys(paths: Iterable[str]) -> frozenset[str]:
+    """Key ids of the PEM public keys in `paths` (files, or directories of *.pub)."""
+    ids = set()
+    for p in map(Path, paths):
+        for f in sorted(p.glob("*.pub")) if p.is_dir() else [p]:
+            key = serialization.load_pem_public_key(f.read_bytes())
+            if not isinstance(key, Ed25519PublicKey):
+                raise ValueError(f"{f}: not an Ed25519 public key")
+            ids.add(key_id(_raw_public(key)))
+    return frozenset(ids)
+
+
+# ── Signing
+
+def verify_chain(path: str) -> ChainResult:
+    """
+    Verify a container's chain in whichever layout it uses: one
+    process-log.json, or the segmented parts and index (SPEC §3.5). The
+    result's header carries the _integrity block either way.
+    """
+    if is_segmented(path):
+        # One process per container: verify_many() already fans out.
+        return verify_segmented(path, workers=1)
+    return verify_stream(path)
+
+
+def signed_message(integrity: dict) -> bytes:
+    """
+    The bytes an author signs: the chain summary from _integrity. The Merkle
+    root (SPEC §5.7) and the chain anchors (SPEC §5.8) are appended when
+    present, so neither can be swapped without breaking the signature.
+    """
+    lines = [
+        _DOMAIN,
+        chain_algorithm(integrity),
+        str(integrity.get("session_id", "")),
+        str(integrity.get("chain_length", 0)),
+        str(integrity.get("head_hash", "")),
+    ]
+    merkle = integrity.get("merkle")
+    if merkle is not None:
+        lines.append("merkle:" + str(merkle.get("root", "") if isinstance(merkle, dict) else merkle))
+    if integrity.get("anchors") is not None:
+        lines.append("anchors:" + canonical_json(integrity["anchors"]))
+    return "\n".join(lines).encode("utf-8")
+
+
+def sign_integrity(integrity: dict, private_key: "Ed25519PrivateKey") -> Signature:
+    public = _raw_public(private_key.public_key())
+    return Signature(
+        key_id=key_id(public),
+        method=SIGNATURE_METHOD,
+        algorithm=chain_algorithm(integrity),
+        head_hash=integrity.get("head_hash", ""),
+        session_id=str(integrity.get("session_id", "")),
+        chain_length=int(integrity.get("chain_length", 0)),
+        value=private_key.sign(signed_message(integrity)),
+        public_key=public,
+    )
+
+
+def render_signatures(signatures: Iterable[Signature]) -> bytes:
+    return _DOCUMENT_TEMPLATE.format(signatures="".join(s.to_xml() for s in signatures)).encode("utf-8")
+
+
+def sign_container(path: str, private_key: "Ed25519PrivateKey") -> Signature:
+    """
+    Verify the container's chain, then add (or replace) this key's signature
+    in META-INF/signatures.xml. Other signers' entries are kept.
+    """
+    chain = verify_chain(path)
+    if not chain.ok:
+        raise ValueError(f"{path}: refusing to sign a broken chain — {chain.detail}")
+    integrity = chain.header.get("_integrity")
+    if not isinstance(integrity, dict) or not integrity.get("head_hash"):
+        raise ValueError(f"{path}: no _integrity.head_hash to sign")
+
+    signature = sign_integrity(integrity, private_key)
+    with zipfile.ZipFile(path) as zf:
+        existing = (parse_signatures(zf.read(SIGNATURES_MEMBER))
+                    if SIGNATURES_MEMBER in zf.namelist() else None)
+    kept = [s for s in existing or () if s.key_id != signature.key_id]
+    _write_member(path, SIGNATURES_MEMBER, render_signatures(kept + [signature]),
+                  replace=existing is not None)
+    return signature
+
+
+def _write_member(path: str, name: str, data: bytes, replace: bool) -> None:
+    if not replace:
+        with zipfile.ZipFile(path, "a", zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr(name, data)
+        return
+    # ZIP cannot overwrite a member in place: rewrite next to it, then swap.
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".twff.tmp")
+    try:
+        with os.fdopen(fd, "wb") as f, zipfile.ZipFile(path) as src, \
+                zipfile.ZipFile(f, "w", zipfile.ZIP_DEFLATED) as dst:
+            for info in src.infolist():
+                if info.filename != name:
+                    dst.writestr(info, src.read(info))
+            dst.writestr(name, data)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+# ── Verification
+
+def parse_signatures(data: bytes) -> list[Signature]:
+    """Parse signatures.xml. Raises ValueError if it is malformed."""
+    try:
+        root = ET.fromstring(data)
+        signatures = []
+        for el in root.iter("Signature"):
+            info = el.find("SignedInfo")
+            signatures.append(Signature(
+                key_id=el.get("Id", ""),
+                method=info.find("SignatureMethod").get("Algorithm", ""),
+                algorithm=info.find("DigestMethod").get("Algorithm", ""),
+                head_hash=info.findtext("DigestValue", "").strip(),
+                session_id=info.findtext("SessionId", "").strip(),
+                chain_length=int(info.findtext("ChainLength", "0")),
+                value=base64.b64decode(el.findtext("SignatureValue", ""), validate=True),
+                public_key=base64.b64decode(el.findtext("KeyInfo/KeyValue", ""), validate=True),
+            ))
+    except (ET.ParseError, AttributeError, ValueError) as e:
+        raise ValueError(f"malformed {SIGNATURES_MEMBER}: {e}") from None
+    return signatures
+
+
+def check_signatures(path: str, integrity: dict,
+                     trusted: frozenset[str] | None = None) -> tuple[list[str], list[str]]:
+    """
+    Check every signature in a container against its _integrity block.
+    Returns (key ids of valid signers, error messages). Any invalid signature
+    is an error; with `trusted`, valid signatures by other keys are ignored
+    but at least one trusted signer is required.
+    """
+    try:
+        with zipfile.ZipFile(path) as zf:
+            data = zf.read(SIGNATURES_MEMBER)
+    except KeyError:
+        return [], [f"unsigned: no {SIGNATURES_MEMBER}"]
+    except zipfile.BadZipFile:
+        return [], ["not a .twff container; only containers carry signatures"]
+    try:
+        signatures = parse_signatures(data)
+    except ValueError as e:
+        return [], [str(e)]
+    if not signatures:
+        return [], [f"no <Signature> in {SIGNATURES_MEMBER}"]
+
+    message  = signed_message(integrity)
+    expected = (chain_algorithm(integrity), integrity.get("head_hash", ""),
+                str(integrity.get("session_id", "")), integrity.get("chain_length", 0))
+    signers, errors, untrusted = [], [], []
+    for sig in signatures:
+        kid = key_id(sig.public_key)
+        if sig.method != SIGNATURE_METHOD:
+            errors.append(f"key {kid}: unsupported signature method {sig.method!r}")
+            continue
+        if (sig.algorithm, sig.head_hash, sig.session_id, sig.chain_length) != expected:
+            errors.append(f"key {kid}: signs head_hash {sig.head_hash[:16]}… over "
+                          f"{sig.chain_length} events, but the log has "
+                          f"{expected[1][:16]}… over {expected[3]}")
+            continue
+        try:
+            _public_key(sig.public_key).verify(sig.value, message)
+        except (InvalidSignature, ValueError):
+            errors.append(f"key {kid}: invalid signature")
+            continue
+        if trusted is not None and kid not in trusted:
+            untrusted.append(kid)
+            continue
+        signers.append(kid)
+    if untrusted and not signers:
+        errors.append(f"no trusted signer (signed only by {', '.join(untrusted)})")
+    return signers, errors
+
+
+def verify_signed(path: str, trusted: frozenset[str] | None = None,
+                  check_chain: bool = True) -> SignatureReport:
+    """
+    Verify a container's chain, then its signatures against the verified
+    _integrity block. check_chain=False skips the chain and trusts the
+    _integrity block at the tail of the log (report.chain_verified is False).
+    """
+    report = SignatureReport(path)
+    t0 = time.perf_counter()
+    try:
+        if check_chain:
+            chain = verify_chain(path)
+            report.events = chain.events
+            if chain.ok:
+                report.chain_verified = True
+            else:
+                report.errors.append(f"chain: {chain.detail}")
+            integrity = chain.header.get("_integrity")
+        else:
+            integrity = read_integrity(path)
+            report.events = integrity.get("chain_length", 0) if isinstance(integrity, dict) else 0
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile) as e:
+        report.errors.append(f"unreadable: {e}")
+        integrity = None
+    if isinstance(integrity, dict) and integrity.get("head_hash"):
+        report.signers, errors = check_signatures(path, integrity, trusted)
+        report.errors.extend(errors)
+    elif not report.errors:
+        report.errors.append("no _integrity.head_hash to verify against")
+    report.ok      = bool(report.signers) and not report.errors
+    report.seconds = time.perf_counter() - t0
+    return report
+
+
+# Set once per worker process by _init_worker.
+_trusted: frozenset[str] | None = None
+_check_chain = True
+
+
+def _init_worker(trusted: frozenset[str] | None, check_chain: bool) -> None:
+    global _trusted, _check_chain
+    _trusted, _check_chain = trusted, check_chain
+
+
+def _verify_one(path: str) -> SignatureReport:
+    return verify_signed(path, _trusted, _check_chain)
+
+
+def verify_many(paths: list[str], workers: int | None = None,
+                trusted: frozenset[str] | None = None,
+                check_chain: bool = True) -> Iterator[SignatureReport]:
+    """Verify many containers across a process pool; yields reports as they finish."""
+    workers = max(1, min(workers or os.cpu_count() or 1, len(paths)))
+    if workers == 1:
+        _init_worker(trusted, check_chain)
+        yield from map(_verify_one, paths)
+        return
+    chunksize = max(1, min(64, len(paths) // (workers * 8)))
+    with multiprocessing.Pool(workers, initializer=_init_worker,
+                              initargs=(trusted, check_chain)) as pool:
+        yield from pool.imap_unordered(_verify_one, paths, chunksize)
+
+
+# ── CLI
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="TWFF container signing and verification")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("keygen", help="Create an Ed25519 keypair (KEY and KEY.pub)")
+    p.add_argument("key", help="Private key file to create")
+    p.add_argument("--password-env", metavar="VAR",
+                   help="Encrypt the private key with the password in this environment variable")
+
+    p = sub.add_parser("sign", help="Sign containers' head_hash into META-INF/signatures.xml")
+    p.add_argument("files", nargs="+", help=".twff containers")
+    p.add_argument("--key", required=True, help="Ed25519 private key (PEM)")
+    p.add_argument("--password-env", metavar="VAR", help="Environment variable holding the key password")
+
+    p = sub.add_parser("verify", help="Verify container signatures in bulk")
+    p.add_argument("paths", nargs="+", help="Containers or directories")
+    p.add_argument("--workers", "-j", type=int, default=os.cpu_count() or 1,
+                   help="Worker processes (default: all cores)")
+    p.add_argument("--trusted-keys", nargs="+", metavar="PUB",
+                   help="Accept only signers whose public key is in these files / directories")
+    p.add_argument("--skip-chain", action="store_true",
+                   help="Check signatures against the _integrity block only, without "
+                        "re-verifying the hash chain (results are marked \"chain NOT verified\")")
+    p.add_argument("--json", action="store_true", help="Emit one JSON report per line")
+    p.add_argument("--quiet", "-q", action="store_true", help="Only print failures and the summary")
+    args = parser.parse_args()
+
+    if Ed25519PrivateKey is None:
+        print(fail("cryptography not installed. Run: pip install cryptography"), file=sys.stderr)
+        return 2
+    password = os.environb.get(args.password_env.encode()) if getattr(args, "password_env", None) else None
+
+    if args.command == "keygen":
+        kid = generate_keypair(args.key, password)
+        print(ok(f"Wrote {args.key} and {Path(args.key).with_suffix('.pub')} (key id {kid})"))
+        return 0
+
+    if args.command == "sign":
+        key = load_private_key(args.key, password)
+        failed = 0
+        for path in args.files:
+            try:
+                sig = sign_container(path, key)
+                print(ok(f"{path}: signed by {sig.key_id} ({sig.chain_length} events)"))
+            except (OSError, ValueError, zipfile.BadZipFile) as e:
+                failed += 1
+                print(fail(str(e)))
+        return 1 if failed else 0
+
+    from bulk_verify import find_containers
+
+    trusted = load_trusted_keys(args.trusted_keys) if args.trusted_keys else None
+    files = [f for f in find_containers(args.paths) if f.endswith(".twff")]
+    if not files:
+        print(warn("No containers found."), file=sys.stderr)
+        return 0
+    unverified = " — chain NOT verified (--skip-chain)" if args.skip_chain else ""
+    if not args.json:
+        print(head(f"TWFF signature verifier — {len(files)} container(s){unverified}"))
+
+    passed = 0
+    t0 = time.perf_counter()
+    for report in verify_many(files, args.workers, trusted, not args.skip_chain):
+        passed += report.ok
+        if args.json:
+            print(json.dumps(asdict(report), ensure_ascii=False), flush=True)
+        elif not report.ok:
+            print(fail(report.path))
+            for e in report.errors:
+                print(f"    {e}")
+        elif not args.quiet:
+            print(ok(f"{report.path} — signed by {', '.join(report.signers)}{unverified}"), flush=True)
+    elapsed = time.perf_counter() - t0
+
+    summary = (f"{passed}/{len(files)} signed and valid in {elapsed:.2f}s — "
+               f"{len(files) / elapsed:,.1f} containers/s{unverified}")
+    if args.json:
+        print(f"{C.BOLD}{summary}{C.RESET}", file=sys.stderr)
+    else:
+        print()
+        print(ok(summary) if passed == len(files) else fail(summary))
+    return 0 if passed == len(files) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
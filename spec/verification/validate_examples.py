@@ -22,13 +22,14 @@ Requirements:
 from __future__ import annotations
 
 import argparse
-import hashlib
 import json
 import os
 import sys
 from pathlib import Path
 from typing import Any
 
+from twff_hash import CHAIN_ALGORITHMS, chain_algorithm, compute_event_hash
+
 # ── Locate project root
 
 SCRIPT_DIR  = Path(__file__).parent
@@ -59,15 +60,8 @@ def head(msg: str) -> str: return f"\n{C.BOLD}{C.CYAN}{msg}{C.RESET}"
 
 # ── Hash chain utilities ──
 
-def compute_event_hash(event: dict, previous_hash: str, session_id: str) -> str:
-    """
-    Compute _hash for one event (excluding the _hash field itself).
-    See SPEC §5.2 for the full specification.
-    """
-    payload = {k: v for k, v in event.items() if k != "_hash"}
-    payload_json = json.dumps(payload, separators=(",", ":"), sort_keys=True)
-    hash_input   = payload_json + "|" + previous_hash + "|" + session_id
-    return hashlib.sha256(hash_input.encode("utf-8")).hexdigest()
+# compute_event_hash (SPEC §5.2) is shared with every other producer and
+# verifier; see twff_hash.py.
 
 
 def verify_hash_chain(log: dict, verbose: bool = False) -> tuple[bool, list[str]]:
@@ -80,10 +74,13 @@ def verify_hash_chain(log: dict, verbose: bool = False) -> tuple[bool, list[str]
     messages   = []
     prev_hash  = ""
     all_ok     = True
+    algorithm  = chain_algorithm(log.get("_integrity"))
+    if algorithm not in CHAIN_ALGORITHMS:
+        return False, [fail(f"  Unsupported _integrity.algorithm {algorithm!r}")]
 
     for i, event in enumerate(events):
         stored   = event.get("_hash", "")
-        expected = compute_event_hash(event, prev_hash, session_id)
+        expected = compute_event_hash(event, prev_hash, session_id, algorithm)
 
         if not stored:
             messages.append(warn(f"  Event {i} ({event.get('type')!r}): no _hash field"))
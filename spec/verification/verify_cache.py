@@ -0,0 +1,159 @@
+"""
+verify_cache.py — Persistent verification-result cache for TWFF containers
+
+Students resubmit the same .twff many times. A verdict depends only on the
+container's bytes, the verifier code and the schema, so VerificationCache
+stores reports in SQLite under
+
+    sha256(container bytes) : validator version : schema version
+
+and a repeat verification costs one streaming hash of the file. Both
+versions are digests (of the verifier sources and of schema.json), so
+editing either invalidates old entries automatically.
+
+Entries are evicted least-recently-used once the cache holds more than
+`max_entries`. The database runs in WAL mode with a busy timeout, so any
+number of verifier processes (e.g. bulk_verify.py workers) can share one
+cache file; each process opens its own connection.
+
+Usage:
+    cache = VerificationCache()                      # ~/.cache/twff/verify.sqlite
+    key   = cache.key(path, "schema=1")
+    report = cache.get(key)
+    if report is None:
+        report = verify(path)
+        cache.put(key, report)
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+
+DEFAULT_PATH = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "twff" / "verify.sqlite"
+
+SCHEMA_FILE = Path(__file__).parent.parent / "v0.1" / "schema.json"
+
+# Modules whose code decides a verdict; their digest is the validator version.
+_VALIDATOR_SOURCES = ("twff_hash.py", "twff_json.py", "stream_verify.py", "bulk_verify.py",
+                      "verify_cache.py", "twff_sign.py", "segment_verify.py")
+
+_READ_CHUNK = 1 << 20
+
+# Run the LRU sweep once every this many puts rather than on each one.
+_EVICT_EVERY = 64
+
+
+def file_digest(path: str) -> str:
+    """Hex SHA-256 of a file's raw bytes, read in chunks."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(_READ_CHUNK):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _digest_files(paths) -> str:
+    h = hashlib.sha256()
+    for p in paths:
+        with open(p, "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()[:16]
+
+
+def validator_version() -> str:
+    here = Path(__file__).parent
+    return _digest_files(here / name for name in _VALIDATOR_SOURCES)
+
+
+def schema_version() -> str:
+    return _digest_files([SCHEMA_FILE])
+
+
+class VerificationCache:
+    """
+    SQLite-backed LRU map from container key to verification report (a
+    JSON-serialisable dict).
+
+    Args:
+        path:        Database file (created with its directory if missing).
+        max_entries: LRU bound.
+    """
+
+    def __init__(self, path: str | os.PathLike = DEFAULT_PATH, max_entries: int = 100_000):
+        self.path        = Path(path)
+        self.max_entries = max_entries
+        self._versions   = f"{validator_version()}:{schema_version()}"
+        self._conn: sqlite3.Connection | None = None
+        self._pid        = None
+        self._puts       = 0
+        self.hits = self.misses = 0
+
+    def key(self, container: str, options: str = "") -> str:
+        """Cache key for a container file; `options` captures verdict-changing flags."""
+        return f"{file_digest(container)}:{self._versions}:{options}"
+
+    def get(self, key: str) -> dict | None:
+        conn = self._connect()
+        row = conn.execute("SELECT report FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        with conn:
+            conn.execute("UPDATE results SET last_used = ? WHERE key = ?", (time.time(), key))
+        return json.loads(row[0])
+
+    def put(self, key: str, report: dict) -> None:
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO results (key, report, last_used) VALUES (?, ?, ?)",
+                (key, json.dumps(report, ensure_ascii=False), time.time()),
+            )
+        self._puts += 1
+        if self._puts % _EVICT_EVERY == 0:
+            self.evict()
+
+    def evict(self) -> int:
+        """Drop least-recently-used entries beyond max_entries. Returns how many."""
+        conn = self._connect()
+        with conn:
+            cur = conn.execute(
+                "DELETE FROM results WHERE key IN ("
+                "  SELECT key FROM results ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+        return cur.rowcount
+
+    def __len__(self) -> int:
+        return self._connect().execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def __enter__(self) -> "VerificationCache":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        # A connection inherited across fork() must not be reused.
+        if self._conn is None or self._pid != os.getpid():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "  key TEXT PRIMARY KEY, report TEXT NOT NULL, last_used REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used)")
+            self._conn, self._pid = conn, os.getpid()
+        return self._conn
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+verify_merkle_proof.py — Check one event against a TWFF Merkle root (SPEC §5.7)
+
+A proof document (ProcessLog.inclusion_proof() writes one) carries a single
+event, its position, the tree size, the root and the audit path:
+
+    {
+      "algorithm":  "SHA-256-MERKLE",
+      "session_id": "...",
+      "tree_size":  1204,
+      "root":       "<hex>",
+      "index":      731,
+      "event":      {"timestamp": ..., "type": "ai_interaction", "meta": {...}, "_hash": ...},
+      "path":       ["<hex>", ...]
+    }
+
+Verification costs O(log tree_size) hashes and needs nothing else from the
+log. Compare "root" with `_integrity.merkle.root` from a container you trust
+(or pass it with --root).
+
+Usage:
+    python spec/verification/verify_merkle_proof.py proof.json [--root <hex>]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+
+from twff_hash import (
+    MERKLE_ALGORITHM,
+    MERKLE_EMPTY_ROOT,
+    merkle_leaf,
+    merkle_node,
+    payload_json,
+)
+
+
+def merkle_leaf_hash(event: dict, session_id: str) -> bytes:
+    """RFC 9162 leaf hash of an event's §5.2 payload (excluding _hash)."""
+    return merkle_leaf(payload_json(event), session_id)
+
+
+def root_from_path(leaf: bytes, index: int, tree_size: int, path: list[bytes]) -> bytes | None:
+    """
+    Recompute the root from a leaf and its audit path (RFC 9162 §2.1.3.2).
+    Returns None if the path has the wrong shape for (index, tree_size).
+    """
+    if not 0 <= index < tree_size:
+        return None
+    fn, sn, r = index, tree_size - 1, leaf
+    for p in path:
+        if sn == 0:
+            return None
+        if fn & 1 or fn == sn:
+            r = merkle_node(p, r)
+            while not fn & 1 and fn != 0:
+                fn >>= 1
+                sn >>= 1
+        else:
+            r = merkle_node(r, p)
+        fn >>= 1
+        sn >>= 1
+    return r if sn == 0 else None
+
+
+def compute_merkle_root(events: list[dict], session_id: str) -> str:
+    """Root over a whole events array, for checking _integrity.merkle.root."""
+    # Stack of (subtree size, hash); equal-sized neighbours merge as in a binary counter.
+    stack: list[tuple[int, bytes]] = []
+    for event in events:
+        size, h = 1, merkle_leaf_hash(event, session_id)
+        while stack and stack[-1][0] == size:
+            left = stack.pop()[1]
+            size, h = size * 2, merkle_node(left, h)
+        stack.append((size, h))
+    if not stack:
+        return MERKLE_EMPTY_ROOT.hex()
+    root = stack.pop()[1]
+    while stack:
+        root = merkle_node(stack.pop()[1], root)
+    return root.hex()
+
+
+def verify_inclusion_proof(proof: dict, trusted_root: str | None = None) -> tuple[bool, str]:
+    """
+    Verify a proof document.
+    Returns (is_valid: bool, detail_message: str).
+    """
+    if proof.get("algorithm") != MERKLE_ALGORITHM:
+        return False, f"Unsupported algorithm {proof.get('algorithm')!r}"
+    try:
+        event = proof["event"]
+        index = int(proof["index"])
+        size  = int(proof["tree_size"])
+        root  = proof["root"]
+        path  = [bytes.fromhex(h) for h in proof["path"]]
+    except (KeyError, TypeError, ValueError) as e:
+        return False, f"Malformed proof: {e}"
+
+    if trusted_root is not None and trusted_root != root:
+        return False, (f"Proof root {root[:16]}… does not match the trusted "
+                       f"root {trusted_root[:16]}…")
+
+    leaf     = merkle_leaf_hash(event, proof.get("session_id", ""))
+    computed = root_from_path(leaf, index, size, path)
+    if computed is None:
+        return False, f"Audit path has the wrong shape for leaf {index} of {size}"
+    if computed.hex() != root:
+        return False, (f"Event {index} (type={event.get('type')!r}) is not in the tree. "
+                       f"Expected root {root[:16]}…, got {computed.hex()[:16]}…")
+    return True, (f"Event {index} (type={event.get('type')!r}) is included in the "
+                  f"{size}-event log — {len(path)} hashes checked.")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="TWFF Merkle inclusion-proof verifier")
+    parser.add_argument("proof", help="Proof JSON file")
+    parser.add_argument("--root", help="Trusted root (hex), e.g. from _integrity.merkle.root")
+    args = parser.parse_args()
+
+    with open(args.proof) as f:
+        proof = json.load(f)
+    valid, detail = verify_inclusion_proof(proof, args.root)
+    print(("OK: " if valid else "FAIL: ") + detail)
+    return 0 if valid else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
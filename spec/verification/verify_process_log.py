@@ -1,28 +1,41 @@
-import hashlib
-import json
+from twff_hash import CHAIN_ALGORITHMS, chain_algorithm, compute_event_hash
 
 
-def compute_event_hash(event: dict, previous_hash: str, session_id: str) -> str:
-    """Compute the _hash for a single event. Excludes _hash from payload."""
-    payload = {k: v for k, v in event.items() if k != "_hash"}
-    # Stable serialisation: sorted keys, no extra whitespace
-    payload_json = json.dumps(payload, separators=(",", ":"), sort_keys=True)
-    hash_input   = payload_json + "|" + previous_hash + "|" + session_id
-    return hashlib.sha256(hash_input.encode("utf-8")).hexdigest()
-
-
-def verify_process_log(log: dict) -> tuple[bool, str]:
+def verify_process_log(log: dict, checkpoint: tuple[int, str] | None = None) -> tuple[bool, str]:
     """
     Verify a TWFF process-log.json dict.
     Returns (is_valid: bool, detail_message: str).
+
+    checkpoint=(index, hash) trusts events[:index], whose last event must
+    still carry `hash`, and verifies only the events after it.
     """
     session_id = log.get("session_id", "")
     events     = log.get("events", [])
     prev_hash  = ""
+    start      = 0
+    algorithm  = chain_algorithm(log.get("_integrity"))
+    if algorithm not in CHAIN_ALGORITHMS:
+        return False, f"Unsupported _integrity.algorithm {algorithm!r}."
+
+    if checkpoint is not None:
+        try:
+            index, trusted = checkpoint
+        except (TypeError, ValueError):
+            return False, f"Checkpoint must be an (index, hash) pair, got {checkpoint!r}."
+        if type(index) is not int or not isinstance(trusted, str):
+            return False, f"Checkpoint must be an (int, str) pair, got {checkpoint!r}."
+        if not 0 <= index <= len(events):
+            return False, f"Checkpoint {index} is outside the log ({len(events)} events)."
+        if index:
+            start, prev_hash = index, trusted
+            if events[start - 1].get("_hash") != prev_hash:
+                return False, (f"Checkpoint mismatch: event {start - 1} no longer has the "
+                               f"trusted hash {prev_hash[:16]}…")
 
-    for i, event in enumerate(events):
+    for i in range(start, len(events)):
+        event = events[i]
         stored_hash   = event.get("_hash", "")
-        expected_hash = compute_event_hash(event, prev_hash, session_id)
+        expected_hash = compute_event_hash(event, prev_hash, session_id, algorithm)
         if stored_hash and stored_hash != expected_hash:
             return False, (
                 f"Hash mismatch at event {i} (type={event.get('type')!r}). "
@@ -39,4 +52,6 @@ def verify_process_log(log: dict) -> tuple[bool, str]:
             f"Expected {prev_hash[:16]}…, got {head_hash[:16]}…"
         )
 
+    if start:
+        return True, f"Log intact — {len(events) - start} new events verified after checkpoint {start}."
     return True, f"Log intact — {len(events)} events verified."
@@ -0,0 +1,62 @@
+"""
+Shared fixtures for the TWFF test suite.
+
+Puts glassbox/ and spec/verification/ on sys.path the way
+benchmarks/_common.py does, so components.* and the verifier scripts import
+without installing anything.
+"""
+from __future__ import annotations
+
+import json
+import os
+import sys
+import zipfile
+
+import pytest
+
+REPO_ROOT    = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+VERIFICATION = os.path.join(REPO_ROOT, "spec", "verification")
+sys.path.insert(0, os.path.join(REPO_ROOT, "glassbox"))
+sys.path.insert(0, VERIFICATION)
+
+from components.process_log import ProcessLog  # noqa: E402
+
+
+def build_log(n: int = 50, **kwargs) -> ProcessLog:
+    """A ProcessLog with n events of mixed types."""
+    log = ProcessLog(**kwargs)
+    for i in range(n):
+        if i % 10 == 9:
+            log.log_paste(char_count=12, position_start=i, position_end=i + 12)
+        else:
+            log.log_event("edit", {"position_start": i, "position_end": i + 1, "source": "human"})
+    return log
+
+
+def rewrite_member(path, member: str, transform) -> None:
+    """Replace one member of a container with transform(old_bytes)."""
+    with zipfile.ZipFile(path) as zf:
+        members = [(info, zf.read(info)) for info in zf.infolist()]
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        for info, data in members:
+            zf.writestr(info, transform(data) if info.filename == member else data)
+
+
+def edit_log(path, edit, member: str = "meta/process-log.json") -> None:
+    """Load the process log, let edit(doc) change it, write it back (indent=2)."""
+    def transform(data: bytes) -> bytes:
+        doc = json.loads(data)
+        edit(doc)
+        return json.dumps(doc, indent=2).encode("utf-8")
+    rewrite_member(path, member, transform)
+
+
+@pytest.fixture
+def container(tmp_path):
+    """Factory: export a fresh log of n events to tmp_path and return the path."""
+    def make(n: int = 50, name: str = "essay.twff", log_kwargs: dict | None = None,
+             **export_kwargs) -> str:
+        path = tmp_path / name
+        path.write_bytes(build_log(n, **(log_kwargs or {})).export("<p>essay</p>", **export_kwargs))
+        return str(path)
+    return make
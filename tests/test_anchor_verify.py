@@ -0,0 +1,90 @@
+"""anchor_verify: segment-parallel verification from _integrity.anchors."""
+from __future__ import annotations
+
+import io
+import json
+
+import pytest
+from anchor_verify import verify_anchored
+from conftest import edit_log, rewrite_member
+from stream_verify import verify_stream
+from twff_json import JsonStream
+
+
+def event_offsets(raw: bytes) -> list[int]:
+    stream = JsonStream(io.BytesIO(raw))
+    offsets = []
+    for key in stream.members():
+        if key == "events":
+            offsets = [stream.byte_offset(mark) for mark, _ in stream.marked_items()]
+        else:
+            stream.value()
+    return offsets
+
+
+@pytest.fixture
+def anchored(container):
+    return container(95, log_kwargs={"anchor_every": 10})
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_intact(anchored, workers):
+    result = verify_anchored(anchored, workers=workers)
+    assert result.ok, result.detail
+    assert result.events == 97 and result.segments == 10
+
+
+def test_modified_event_reports_last_good_anchor(anchored):
+    # Same length, so the anchor offsets after it stay valid.
+    edit_log(anchored, lambda doc: doc["events"][47].update(type="tide"))
+    result = verify_anchored(anchored, workers=1)
+    assert not result.ok and result.index == 47
+    assert result.last_good_anchor == 40
+    assert verify_anchored(anchored, workers=1, resume_from=50).ok
+
+
+def test_injected_event_with_shifted_offsets_is_rejected(anchored):
+    """
+    An unhashed event slipped in just before an anchor, with every later
+    anchor offset moved past it, is never read by any segment unless the
+    segments are required to join up.
+    """
+    def inject(data: bytes) -> bytes:
+        doc = json.loads(data)
+        doc["events"].insert(30, {"type": "paste", "timestamp": doc["events"][29]["timestamp"],
+                                  "meta": {"char_count": 5000, "source": "external"}})
+        raw = json.dumps(doc, indent=2).encode("utf-8")
+        offsets = event_offsets(raw)
+        for anchor in doc["_integrity"]["anchors"]:
+            position = anchor["index"] + (anchor["index"] >= 30)
+            anchor["offset"] = offsets[position]
+        raw = json.dumps(doc, indent=2).encode("utf-8")
+        assert event_offsets(raw) == offsets
+        return raw
+
+    rewrite_member(anchored, "meta/process-log.json", inject)
+    result = verify_anchored(anchored, workers=1)
+    assert not result.ok
+    assert "anchor 30" in result.detail
+    assert not verify_stream(anchored).ok
+
+
+def test_first_anchor_must_start_the_events_array(anchored):
+    def shift(data: bytes) -> bytes:
+        doc = json.loads(data)
+        doc["events"].insert(0, {"type": "session_start", "timestamp": doc["events"][0]["timestamp"]})
+        raw = json.dumps(doc, indent=2).encode("utf-8")
+        offsets = event_offsets(raw)
+        for anchor in doc["_integrity"]["anchors"]:
+            anchor["offset"] = offsets[anchor["index"] + 1]
+        return json.dumps(doc, indent=2).encode("utf-8")
+
+    rewrite_member(anchored, "meta/process-log.json", shift)
+    result = verify_anchored(anchored, workers=1)
+    assert not result.ok and "events array starts" in result.detail
+
+
+def test_log_without_anchors_falls_back_to_stream(container):
+    path = container(20)
+    result = verify_anchored(path)
+    assert result.ok and result.segments == 1
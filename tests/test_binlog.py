@@ -0,0 +1,63 @@
+"""binlog: meta/process-log.bin decodes to exactly the JSON log."""
+from __future__ import annotations
+
+import io
+import json
+import zipfile
+
+import pytest
+
+from components.binlog import BINARY_LOG_MEMBER, BinaryLogReader, decode, encode
+from components.process_log import ProcessLog
+from conftest import build_log
+from stream_verify import verify_stream
+from twff_json import PROCESS_LOG_MEMBER
+
+
+def sidecar_and_json(log: ProcessLog) -> tuple[dict, dict]:
+    data = log.export("<p/>", binary_sidecar=True)
+    assert verify_stream(io.BytesIO(data)).ok
+    with zipfile.ZipFile(io.BytesIO(data)) as zf:
+        return decode(zf.read(BINARY_LOG_MEMBER)), json.loads(zf.read(PROCESS_LOG_MEMBER))
+
+
+def test_exported_sidecar_matches_json_log():
+    binary, document = sidecar_and_json(build_log(60))
+    assert binary == document
+
+
+def test_mixed_meta_types_and_previews_round_trip():
+    log = ProcessLog()
+    log.log_paste(3, 0, 3, preview="ab\ud800c")
+    log.log_paste(4, 3, 7, preview="naïve — 字 🙂")
+    log.log_event("note", {"a": -2 ** 63, "b": True, "c": 2 ** 63 - 1, "d": False,
+                           "e": 1.5, "f": None, "g": [1, {"h": "\udfff"}], "i": 2 ** 70})
+    log.log_event("note", {"b": True, "a": -2 ** 63})
+    log.log_event("bare")
+    binary, document = sidecar_and_json(log)
+    assert binary == document
+    assert document["events"][1]["meta"]["output_preview"] == "ab\ud800c"
+
+
+def test_extreme_int_deltas_fall_back_to_side_values():
+    event = {"timestamp": "2026-01-01T00:00:00.000000+00:00", "type": "note",
+             "meta": {"lo": -2 ** 63, "hi": 2 ** 63 - 1, "flag": True, "lo2": -2 ** 63}}
+    log = {"version": "0.1.0", "events": [event, {"type": 7}, {"timestamp": "not a time",
+                                                               "type": "x"}]}
+    assert decode(encode(log)) == log
+
+
+def test_empty_log_and_block_boundaries():
+    assert decode(encode({"version": "0.1.0", "events": []})) == {"version": "0.1.0", "events": []}
+    document = build_log(25).to_dict()
+    data = encode(document, block_events=4)
+    reader = BinaryLogReader(data)
+    assert reader.to_dict() == document
+    assert reader.event_types() == [e["type"] for e in document["events"]]
+    assert len(reader.timestamps_ns()) == len(document["events"])
+
+
+@pytest.mark.parametrize("data", [b"NOPE\x01", b"TWFB\x09"])
+def test_rejects_foreign_data(data):
+    with pytest.raises(ValueError):
+        BinaryLogReader(data + b"\0" * 8)
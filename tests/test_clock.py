@@ -0,0 +1,71 @@
+"""MonotonicClock and format_ns."""
+from __future__ import annotations
+
+import datetime
+
+import pytest
+
+from components import clock
+from components.clock import RESYNC_INTERVAL_NS, MonotonicClock, format_ns, format_many
+
+_S = 1_000_000_000
+_EPOCH = datetime.datetime(1970, 1, 1)
+
+
+class FakeTime:
+    def __init__(self, wall_ns: int):
+        self.wall = wall_ns
+        self.mono = 0
+
+    def advance(self, ns: int, wall_step: int = 0) -> None:
+        self.mono += ns
+        self.wall += ns + wall_step
+
+
+@pytest.fixture
+def fake(monkeypatch):
+    t = FakeTime(1_771_236_000 * _S)
+    monkeypatch.setattr(clock.time, "time_ns", lambda: t.wall)
+    monkeypatch.setattr(clock.time, "monotonic_ns", lambda: t.mono)
+    return t
+
+
+def test_wall_clock_stepping_back_never_reorders(fake):
+    c = MonotonicClock()
+    stamps = [c.now_ns()]
+    fake.advance(5 * _S, wall_step=-3600 * _S)          # NTP steps back an hour
+    stamps.append(c.now_ns())
+    fake.advance(RESYNC_INTERVAL_NS)                    # resync sees the wall behind: ignored
+    stamps.append(c.now_ns())
+    stamps.append(c.now_ns())                           # no time passed at all
+    assert all(a < b for a, b in zip(stamps, stamps[1:]))
+    assert stamps[1] - stamps[0] == 5 * _S
+    assert stamps[3] - stamps[2] == 1_000               # 1 µs apart at minimum
+    rendered = format_many(stamps)
+    assert rendered == sorted(rendered) and len(set(rendered)) == len(rendered)
+
+
+def test_resyncs_forwards_when_the_wall_clock_runs_ahead(fake):
+    c = MonotonicClock()
+    first = c.now_ns()
+    fake.advance(RESYNC_INTERVAL_NS, wall_step=10 * _S)
+    assert c.now_ns() == first + RESYNC_INTERVAL_NS + 10 * _S
+
+
+def test_floor_from_a_recovered_session(fake):
+    floor = fake.wall + 3600 * _S
+    assert MonotonicClock(floor_ns=floor).now_ns() == floor + 1_000
+
+
+@pytest.mark.parametrize("ns", [1_771_236_000_123_456_789, 946_684_799_999_999_000,
+                                1_000, 1_709_164_800_000_001_000])
+def test_format_ns_matches_isoformat(ns):
+    dt = _EPOCH + datetime.timedelta(microseconds=ns // 1_000)
+    assert format_ns(ns) == dt.isoformat() + "Z"
+
+
+def test_format_ns_keeps_microseconds_on_the_second():
+    # isoformat() drops ".000000"; format_ns keeps a fixed width so strings sort.
+    dt = datetime.datetime(2026, 2, 16, 10, 0, 0)
+    ns = int((dt - _EPOCH).total_seconds()) * _S
+    assert format_ns(ns) == dt.isoformat() + ".000000Z"
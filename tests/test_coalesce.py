@@ -0,0 +1,76 @@
+"""EditCoalescer: folding keystroke edits into bursts."""
+from __future__ import annotations
+
+import io
+
+from components.coalesce import EditCoalescer
+from components.process_log import ProcessLog
+from stream_verify import verify_stream
+
+
+def offer(c: EditCoalescer, start: int, end: int, at_ms: float, source: str = "human"):
+    return c.offer(start, end, source, timestamp_ns=int(at_ms * 1e6), now_ms=at_ms)
+
+
+def test_adjacent_edits_merge():
+    c = EditCoalescer()
+    assert offer(c, 10, 11, 0) is None
+    assert offer(c, 11, 12, 100) is None
+    assert offer(c, 9, 10, 200) is None         # touches the start
+    meta, ts = c.flush()
+    assert meta == {"position_start": 9, "position_end": 12, "source": "human"}
+    assert ts == 0 and (c.edits_in, c.edits_out) == (3, 1)
+    assert c.flush() is None
+
+
+def test_non_adjacent_edit_starts_a_new_burst():
+    c = EditCoalescer()
+    offer(c, 10, 11, 0)
+    finished = offer(c, 40, 41, 100)
+    assert finished == ({"position_start": 10, "position_end": 11, "source": "human"}, 0)
+    assert c.pending()["meta"]["position_start"] == 40
+
+
+def test_max_gap_widens_adjacency():
+    c = EditCoalescer(max_gap=3)
+    offer(c, 10, 11, 0)
+    assert offer(c, 14, 15, 100) is None
+    assert offer(c, 19, 20, 200) is not None
+
+
+def test_source_change_splits():
+    c = EditCoalescer()
+    offer(c, 10, 11, 0)
+    finished = offer(c, 11, 12, 100, source="ai")
+    assert finished[0]["source"] == "human"
+    assert c.flush()[0]["source"] == "ai"
+
+
+def test_time_rules_split():
+    c = EditCoalescer(window_ms=500, max_span_ms=1200)
+    offer(c, 0, 1, 0)
+    assert offer(c, 1, 2, 600) is not None      # idle longer than window_ms
+    offer(c, 2, 3, 1000)
+    offer(c, 3, 4, 1400)
+    assert offer(c, 4, 5, 1800) is None         # 1200 ms after the burst began
+    assert offer(c, 5, 6, 1900) is not None     # past max_span_ms
+
+
+def test_non_edit_event_flushes_the_burst_and_chain_verifies():
+    log = ProcessLog(coalescer=EditCoalescer())
+    for i in range(20):
+        log.log_edit(i, i + 1)
+    assert log.count("edit") == 0
+    log.log_paste(char_count=5, position_start=20, position_end=25)
+    for i in range(25, 30):
+        log.log_edit(i, i + 1)
+
+    types = [e["type"] for e in log.snapshot()]
+    assert types == ["session_start", "edit", "paste"]
+    edit = log.last("edit")
+    assert edit["meta"] == {"position_start": 0, "position_end": 20, "source": "human"}
+    assert edit["timestamp"] < log.last("paste")["timestamp"]
+
+    data = log.export("<p/>")
+    assert log.count("edit") == 2              # export flushed the open burst
+    assert verify_stream(io.BytesIO(data)).ok
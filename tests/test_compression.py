@@ -0,0 +1,74 @@
+"""CompressionPolicy: method and level per member."""
+from __future__ import annotations
+
+import io
+import os
+import zipfile
+import zlib
+
+import pytest
+
+from components.compression import (
+    DEFAULT_POLICY,
+    FAST_POLICY,
+    SMALLEST_POLICY,
+    CompressionPolicy,
+)
+from conftest import build_log
+
+STORED, DEFLATED = zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED
+
+
+@pytest.mark.parametrize("name, data, expected", [
+    ("content/images/fig.PNG",             None,              (STORED, None)),
+    ("content/video.mp4",                  None,              (STORED, None)),
+    ("meta/process-log.json",              None,              (DEFLATED, 6)),
+    ("meta/process-log/part-0001.json",    None,              (DEFLATED, 6)),
+    ("content/document.xhtml",             None,              (DEFLATED, 9)),
+    ("meta/manifest.xml",                  None,              (DEFLATED, 9)),
+    ("content/data.bin",                   b"a" * 4096,       (DEFLATED, 6)),
+    ("content/data.bin",                   os.urandom(4096),  (STORED, None)),
+    ("content/data.bin",                   None,              (DEFLATED, 6)),
+])
+def test_default_policy_choices(name, data, expected):
+    assert DEFAULT_POLICY.choose(name, data) == expected
+
+
+def test_presets_and_options():
+    assert FAST_POLICY.choose("meta/process-log.json") == (DEFLATED, 1)
+    assert SMALLEST_POLICY.choose("content/data.bin") == (DEFLATED, 9)
+    assert CompressionPolicy(log_level=0).choose("meta/process-log.json") == (STORED, None)
+    noise = os.urandom(4096)
+    assert CompressionPolicy(sniff=False).choose("content/data.bin", noise) == (DEFLATED, 6)
+
+
+def raw_deflate(data: bytes, level: int) -> int:
+    packer = zlib.compressobj(level, zlib.DEFLATED, -15)
+    return len(packer.compress(data) + packer.flush())
+
+
+@pytest.mark.parametrize("level", [1, 2, 4])   # each differs from the default 6
+def test_level_reaches_the_compressor(level):
+    # ZipInfo._compresslevel is private; make sure zipfile still honours it
+    # for both writestr() and open(..., "w").
+    policy = CompressionPolicy(log_level=level, text_level=level)
+    data   = b"".join(b"%d,%d;" % (i, i * i % 977) for i in range(20_000))
+    buf    = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as zf:
+        zf.writestr(policy.zip_info("content/a.txt"), data)
+        with zf.open(policy.zip_info("meta/process-log.json"), "w") as member:
+            member.write(data)
+    with zipfile.ZipFile(buf) as zf:
+        for info in zf.infolist():
+            assert info.compress_type == DEFLATED
+            assert info.compress_size == raw_deflate(data, level)
+
+
+def test_export_applies_the_policy():
+    data = build_log(40).export("<p/>", assets={"content/fig.png": b"\x89PNG" + bytes(500)},
+                                compression=FAST_POLICY)
+    with zipfile.ZipFile(io.BytesIO(data)) as zf:
+        methods = {info.filename: info.compress_type for info in zf.infolist()}
+    assert methods["content/fig.png"] == STORED
+    assert methods["meta/process-log.json"] == DEFLATED
+    assert methods["content/document.xhtml"] == DEFLATED
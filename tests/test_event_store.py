@@ -0,0 +1,101 @@
+"""Event stores: ColumnarEventStore, EventSnapshot and SpillingEventStore."""
+from __future__ import annotations
+
+import gc
+import io
+import json
+import os
+
+import pytest
+
+from components.event_store import ColumnarEventStore, EventSnapshot, SpillingEventStore
+from conftest import build_log
+from stream_verify import verify_stream
+
+
+def test_columnar_export_is_byte_identical_to_list_backed():
+    log = build_log(80)
+    end_time = log.end_session()
+    as_list = log.export("<p/>", reproducible=True)
+    as_dict = json.dumps(log.to_dict(end_time), indent=2)
+    log.events = ColumnarEventStore(log.events)
+    assert log.export("<p/>", reproducible=True) == as_list
+    assert json.dumps(log.to_dict(end_time), indent=2) == as_dict
+
+
+def test_columnar_log_verifies():
+    data = build_log(80, columnar=True).export("<p/>")
+    assert verify_stream(io.BytesIO(data)).ok
+
+
+def test_columnar_round_trips_unusual_events():
+    events = [
+        {"timestamp": "2026-02-16T10:00:00.000001Z", "type": "edit",
+         "meta": {"position_start": -2 ** 63, "big": 2 ** 64, "source": "human",
+                  "ratio": 0.5, "nested": {"a": [1, None]}, "flag": True},
+         "_hash": "ab" * 32},
+        {"timestamp": "2026-02-16 10:00:00", "type": "custom", "meta": {}, "_hash": "short"},
+        {"timestamp": "2026-02-16T10:00:01.000000+00:00", "type": "paste", "meta": {},
+         "extra": 1},
+    ]
+    store = ColumnarEventStore(events)
+    assert store == events and list(store) == events
+    assert store.hash_at(0) == "ab" * 32 and store.hash_at(1) == "short" and store.hash_at(2) == ""
+    assert store.type_at(1) == "custom"
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_snapshot_indexing(columnar):
+    log  = build_log(30, columnar=columnar)
+    snap = log.snapshot()
+    everything = list(snap)
+    log.log_event("later")
+    assert len(snap) == 31 and list(snap) == everything
+    assert snap[0]["type"] == "session_start"
+    assert snap[-1] == everything[-1] and snap[-31] == everything[0]
+    assert snap[5:9] == everything[5:9] and snap[::10] == everything[::10]
+    assert snap[25:100] == everything[25:]
+    for bad in (31, -32):
+        with pytest.raises(IndexError):
+            snap[bad]
+    assert isinstance(snap, EventSnapshot) and snap.head_hash == everything[-1]["_hash"]
+
+
+def test_reads_back_across_segments(tmp_path):
+    store = SpillingEventStore(max_resident=10, segment_events=4, directory=str(tmp_path))
+    events = [{"type": "edit", "n": i} for i in range(57)]
+    for event in events:
+        store.append(event)
+    assert len(store.segments) >= 10 and store.resident < 10
+    assert list(store) == events
+    assert store[13] == events[13] and store[-1] == events[-1]
+    assert store[5:9] == events[5:9]
+
+
+def test_logs_sharing_a_spill_dir_do_not_collide(tmp_path):
+    spill = str(tmp_path / "spill")
+    a = build_log(120, max_resident_events=16, spill_dir=spill)
+    b = build_log(80, max_resident_events=16, spill_dir=spill)
+    assert a.events.directory != b.events.directory
+    assert a.events.segments and b.events.segments
+    for log in (a, b):
+        assert log.events[-1]["_hash"] == log.head_hash
+        result = verify_stream(io.BytesIO(log.export("<p/>")))
+        assert result.ok, result.detail
+
+
+def test_close_removes_segments_from_a_caller_dir(tmp_path):
+    spill = str(tmp_path / "spill")
+    store = SpillingEventStore(max_resident=4, directory=spill)
+    for i in range(20):
+        store.append({"n": i})
+    assert os.listdir(store.directory)
+    store.close()
+    assert os.listdir(spill) == []
+
+    store = SpillingEventStore(max_resident=4, directory=spill)
+    for i in range(20):
+        store.append({"n": i})
+    del store
+    gc.collect()
+    assert os.listdir(spill) == []
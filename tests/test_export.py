@@ -0,0 +1,76 @@
+"""ProcessLog.export(): reproducible containers, ZIP64 members and asset names."""
+from __future__ import annotations
+
+import hashlib
+import io
+import struct
+import zipfile
+
+import pytest
+
+from components.coalesce import EditCoalescer
+from components.container import TwffContainer
+from components.process_log import ProcessLog
+from conftest import build_log
+from stream_verify import verify_stream
+
+
+def event_types(data: bytes) -> list[str]:
+    with TwffContainer(data) as twff:
+        return [e["type"] for e in twff.log.events()]
+
+
+def test_reproducible_export_is_byte_identical():
+    log = build_log(30)
+    first  = log.export("<p/>", assets={"content/b.png": b"b", "content/a.png": b"a"},
+                        reproducible=True)
+    second = log.export("<p/>", assets={"content/a.png": b"a", "content/b.png": b"b"},
+                        reproducible=True)
+    assert hashlib.sha256(first).digest() == hashlib.sha256(second).digest()
+    assert verify_stream(io.BytesIO(first)).ok
+
+
+def test_reproducible_export_flushes_pending_edits():
+    log = ProcessLog(coalescer=EditCoalescer())
+    log.log_event("focus_change", {"duration_ms": 5})
+    first = log.export("<p/>", reproducible=True)
+    for i in range(5):
+        log.log_edit(i, i + 1)
+    second = log.export("<p/>", reproducible=True)
+
+    types = event_types(second)
+    assert types[-2:] == ["edit", "session_end"]
+    assert len(types) == len(event_types(first)) + 2
+    assert verify_stream(io.BytesIO(second)).ok
+    assert log.export("<p/>", reproducible=True) == second
+
+
+def local_extra(data: bytes, name: str) -> bytes:
+    """The extra field of a member's local file header."""
+    with zipfile.ZipFile(io.BytesIO(data)) as zf:
+        offset = zf.getinfo(name).header_offset
+    name_len, extra_len = struct.unpack_from("<HH", data, offset + 26)
+    return data[offset + 30 + name_len:offset + 30 + name_len + extra_len]
+
+
+def test_streamed_log_members_are_zip64():
+    """Streamed members are written before their size is known, so all are ZIP64."""
+    data = build_log(10).export("<p/>", binary_sidecar=True)
+    for name in ("meta/process-log.json", "meta/process-log.bin"):
+        assert local_extra(data, name)[:2] == b"\x01\x00"      # ZIP64 extra field
+    assert local_extra(data, "content/document.xhtml") == b""
+    assert verify_stream(io.BytesIO(data)).ok
+
+    data = build_log(10).export("<p/>", segment_events=5)
+    assert local_extra(data, "meta/process-log/part-0001.json")[:2] == b"\x01\x00"
+
+
+@pytest.mark.parametrize("name", ["meta/manifest.xml", "meta/process-log.json", "fig.png",
+                                  "content/../meta/manifest.xml", "content//fig.png",
+                                  "content\\fig.png", "content/document.xhtml"])
+def test_export_rejects_assets_that_could_shadow_members(name):
+    log = build_log(5)
+    with pytest.raises(ValueError):
+        log.export("<p/>", assets={name: b"x"})
+    # Rejected before the session was ended.
+    assert log.snapshot()[-1]["type"] != "session_end"
@@ -0,0 +1,84 @@
+"""EventJournal group commit and ProcessLog.recover()."""
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from components import journal as journal_mod
+from components.coalesce import EditCoalescer
+from components.event_store import SpillingEventStore
+from components.journal import EventJournal
+from components.process_log import ProcessLog
+
+
+@pytest.fixture
+def fsyncs(monkeypatch):
+    calls = []
+    monkeypatch.setattr(journal_mod.os, "fsync", lambda fd: calls.append(fd))
+    return calls
+
+
+def test_interval_bound_holds_without_further_appends(tmp_path, fsyncs):
+    journal = EventJournal(str(tmp_path / "j.ndjson"), fsync_every=0, fsync_interval_ms=20)
+    journal.append({"type": "edit"})
+    assert not fsyncs
+    deadline = time.monotonic() + 2
+    while not fsyncs and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert len(fsyncs) == 1
+    journal.close()
+    assert len(fsyncs) == 1             # nothing left pending
+
+
+def test_count_bound_cancels_the_timer(tmp_path, fsyncs):
+    journal = EventJournal(str(tmp_path / "j.ndjson"), fsync_every=2, fsync_interval_ms=20)
+    journal.append({"type": "edit"})
+    journal.append({"type": "edit"})
+    assert len(fsyncs) == 1
+    time.sleep(0.1)
+    assert len(fsyncs) == 1
+    journal.close()
+
+
+def test_recover_replays_the_journal(tmp_path):
+    path = str(tmp_path / "j.ndjson")
+    with ProcessLog(journal=EventJournal(path)) as log:
+        log.log_event("edit", {"char_count": 3})
+        head = log.head_hash
+
+    with ProcessLog.recover(path) as recovered:
+        assert len(recovered.events) == 2 and recovered.head_hash == head
+        recovered.log_event("edit", {"char_count": 4})
+    with ProcessLog.recover(path) as again:
+        assert len(again.events) == 3
+
+
+def test_recover_restores_the_session_settings(tmp_path):
+    path = str(tmp_path / "j.ndjson")
+    log = ProcessLog(journal=EventJournal(path), merkle=True, anchor_every=5,
+                     max_resident_events=8, spill_dir=str(tmp_path / "spill"),
+                     coalescer=EditCoalescer(window_ms=750, max_gap=2))
+    for i in range(20):
+        log.log_event("checkpoint", {"n": i})
+    integrity = log.integrity()
+    log.close()
+
+    with ProcessLog.recover(path, spill_dir=str(tmp_path / "spill")) as recovered:
+        assert isinstance(recovered.events, SpillingEventStore) and recovered.events.segments
+        assert recovered.integrity() == integrity       # same Merkle root and anchors
+        recovered.log_edit(0, 1)
+        recovered.log_edit(1, 2)
+        assert recovered.count("edit") == 0             # coalesced until flushed
+    with ProcessLog.recover(path, anchor_every=0, max_resident_events=0) as plain:
+        assert plain.count("edit") == 1                 # close() logged the burst
+        assert isinstance(plain.events, list) and "anchors" not in plain.integrity()
+
+
+def test_close_syncs_the_journal(tmp_path, fsyncs):
+    with ProcessLog(journal=EventJournal(str(tmp_path / "j.ndjson"), fsync_every=0,
+                                         fsync_interval_ms=0)) as log:
+        synced = len(fsyncs)
+        log.log_event("edit")
+        assert len(fsyncs) == synced
+    assert len(fsyncs) == synced + 1
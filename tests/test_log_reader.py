@@ -0,0 +1,32 @@
+"""ProcessLogReader: lazy header, streamed events, segmented logs."""
+from __future__ import annotations
+
+import json
+import zipfile
+
+from components.process_log import ProcessLog
+
+
+def test_header_events_and_integrity(container):
+    path = container(30)
+    with zipfile.ZipFile(path) as zf:
+        doc = json.loads(zf.read("meta/process-log.json"))
+    with ProcessLog.open(path) as log:
+        assert log.session_id == doc["session_id"]
+        assert log.start_time == doc["start_time"]
+        assert list(log.events()) == doc["events"]
+        assert log.integrity == doc["_integrity"]
+
+
+def test_segmented_log_reads_like_a_single_member(container):
+    flat = container(95, name="flat.twff")
+    with ProcessLog.open(flat) as log:
+        expected = list(log.events())
+    seg = container(95, name="seg.twff", segment_events=20)
+    with ProcessLog.open(seg) as log:
+        assert log.segmented and len(log.segments) == 5
+        events = list(log.events())
+        assert [e["type"] for e in events] == [e["type"] for e in expected]
+        middle = events[40]["timestamp"], events[60]["timestamp"]
+        window = list(log.events_between(*middle))
+        assert window == [e for e in events if middle[0] <= e["timestamp"] <= middle[1]]
@@ -0,0 +1,62 @@
+"""MerkleTree and inclusion proofs (SPEC §5.7)."""
+from __future__ import annotations
+
+import io
+import json
+import zipfile
+
+import pytest
+
+from components.merkle import MerkleTree
+from components.process_log import ProcessLog
+from conftest import build_log
+from twff_hash import MERKLE_EMPTY_ROOT
+from verify_merkle_proof import compute_merkle_root, root_from_path, verify_inclusion_proof
+
+
+def test_every_proof_verifies_for_sizes_1_to_41():
+    log = ProcessLog(merkle=True)               # session_start is leaf 0
+    for size in range(1, 42):
+        snap = log.snapshot()
+        assert len(snap) == size
+        for index in range(size):
+            valid, detail = verify_inclusion_proof(log.inclusion_proof(index, snap))
+            assert valid, detail
+        log.log_event("edit", {"position_start": size, "position_end": size + 1,
+                               "source": "human"})
+
+
+def test_historical_roots_match_a_recomputation():
+    log = build_log(40, merkle=True)
+    document = log.to_dict()
+    for size in (1, 2, 3, 16, 17, 41):
+        assert (log._merkle.root(size).hex()
+                == compute_merkle_root(document["events"][:size], log.session_id))
+    assert MerkleTree().root() == MERKLE_EMPTY_ROOT
+    assert compute_merkle_root([], log.session_id) == MERKLE_EMPTY_ROOT.hex()
+
+
+def test_tampered_proofs_fail():
+    log   = build_log(20, merkle=True)
+    proof = log.inclusion_proof(7)
+    assert not verify_inclusion_proof(proof, trusted_root="00" * 32)[0]
+    assert not verify_inclusion_proof({**proof, "event": {**proof["event"], "type": "tide"}})[0]
+    assert not verify_inclusion_proof({**proof, "index": 8})[0]
+    assert not verify_inclusion_proof({**proof, "path": proof["path"][:-1]})[0]
+    assert root_from_path(b"\0" * 32, 21, 21, []) is None
+    with pytest.raises(IndexError):
+        log._merkle.inclusion_proof(21)
+
+
+def test_export_records_the_merkle_root():
+    log  = build_log(30, merkle=True)
+    data = log.export("<p/>")
+    with zipfile.ZipFile(io.BytesIO(data)) as zf:
+        document = json.loads(zf.read("meta/process-log.json"))
+    merkle = document["_integrity"]["merkle"]
+    events = document["events"]
+    assert merkle["tree_size"] == len(events)
+    assert merkle["root"] == compute_merkle_root(events, document["session_id"])
+    proof = log.inclusion_proof(len(events) - 1)
+    assert verify_inclusion_proof(proof, trusted_root=merkle["root"])[0]
+    assert "merkle" not in build_log(5).integrity()
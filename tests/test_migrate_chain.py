@@ -0,0 +1,59 @@
+"""
+migrate_chain: v0.1 bulk-hash containers upgraded to the per-event chain.
+
+fixtures/v0.1-bulk-hash.twff was written by the v0.1 ProcessLog.export(),
+whose _integrity.hash is sha256(json.dumps(events, sort_keys=True) + session_id).
+Its previews contain non-ASCII text, so the fixture also pins the escaping.
+"""
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import zipfile
+
+import pytest
+from conftest import edit_log
+from migrate_chain import migrate
+from stream_verify import verify_stream
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "v0.1-bulk-hash.twff")
+
+
+@pytest.fixture
+def v01(tmp_path):
+    path = tmp_path / "old.twff"
+    shutil.copyfile(FIXTURE, path)
+    return str(path)
+
+
+def test_baseline_bulk_hash_matches(v01, tmp_path):
+    dst = str(tmp_path / "new.twff")
+    report = migrate((v01, dst, "SHA-256-CHAIN", True, False))
+    assert report.status == "migrated", report.detail
+    assert report.bulk_hash is True
+    assert report.events == 40
+
+    result = verify_stream(dst)
+    assert result.ok, result.detail
+    with zipfile.ZipFile(v01) as old, zipfile.ZipFile(dst) as new:
+        before = json.loads(old.read("meta/process-log.json"))
+        after  = json.loads(new.read("meta/process-log.json"))
+        assert old.read("content/document.xhtml") == new.read("content/document.xhtml")
+    assert [{k: v for k, v in e.items() if k != "_hash"} for e in after["events"]] == before["events"]
+    assert after["_integrity"]["chain_length"] == 40
+
+
+def test_edited_events_fail_the_bulk_check(v01, tmp_path):
+    edit_log(v01, lambda doc: doc["events"][3]["meta"].update(position_end=99))
+    report = migrate((v01, str(tmp_path / "a.twff"), "SHA-256-CHAIN", False, False))
+    assert report.status == "migrated" and report.bulk_hash is False
+    report = migrate((v01, str(tmp_path / "b.twff"), "SHA-256-CHAIN", True, False))
+    assert report.status == "failed" and "bulk" in report.detail
+
+
+def test_rerun_skips_chained_output(v01, tmp_path):
+    dst = str(tmp_path / "new.twff")
+    assert migrate((v01, dst, "BLAKE2B-256-CHAIN", True, False)).status == "migrated"
+    assert verify_stream(dst).ok
+    assert migrate((v01, dst, "BLAKE2B-256-CHAIN", True, False)).status == "skipped"
@@ -0,0 +1,54 @@
+"""ProcessLog: per-type counters and ownership of logged events."""
+from __future__ import annotations
+
+import io
+
+import pytest
+
+from components.process_log import ProcessLog
+from conftest import build_log
+from stream_verify import verify_stream
+
+
+def expected(events, event_type):
+    return [e for e in events if e["type"] == event_type]
+
+
+@pytest.mark.parametrize("log_kwargs", [{}, {"columnar": True},
+                                        {"max_resident_events": 8}],
+                         ids=["list", "columnar", "spilling"])
+def test_counters_match_a_scan(tmp_path, log_kwargs):
+    if "max_resident_events" in log_kwargs:
+        log_kwargs = {**log_kwargs, "spill_dir": str(tmp_path)}
+    log = build_log(57, **log_kwargs)
+    if "max_resident_events" in log_kwargs:
+        assert log.events.segments            # the early events are on disk
+    events = list(log.snapshot())
+    for event_type in ("session_start", "edit", "paste", "missing"):
+        assert log.count(event_type) == len(expected(events, event_type))
+        assert log.of_type(event_type) == expected(events, event_type)
+        assert log.last(event_type) == (expected(events, event_type) or [None])[-1]
+
+
+def test_counters_as_of_a_snapshot():
+    log  = build_log(19)                      # one paste, at event 10
+    snap = log.snapshot()
+    log.log_paste(char_count=1, position_start=0, position_end=1)
+    log.log_event("focus_change", {"duration_ms": 5})
+
+    assert log.count("paste") == 2 and log.count("paste", snap) == 1
+    assert log.of_type("paste", snap) == [snap[10]]
+    assert log.last("paste", snap) == snap[10]
+    assert log.count("focus_change", snap) == 0 and log.last("focus_change", snap) is None
+    assert log.last("focus_change")["meta"] == {"duration_ms": 5}
+
+
+def test_logged_meta_is_not_shared_with_the_caller():
+    log  = ProcessLog()
+    meta = {"char_count": 3, "ranges": [[0, 3]], "nested": {"a": 1}}
+    log.log_event("note", meta)
+    meta["char_count"] = 99
+    meta["ranges"].append([4, 5])
+    meta["nested"]["a"] = 2
+    assert log.last("note")["meta"] == {"char_count": 3, "ranges": [[0, 3]], "nested": {"a": 1}}
+    assert verify_stream(io.BytesIO(log.export("<p/>"))).ok
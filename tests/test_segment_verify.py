@@ -0,0 +1,66 @@
+"""segment_verify: segmented process logs (SPEC §3.5)."""
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from anchor_verify import read_integrity, verify_anchored
+from conftest import edit_log, rewrite_member
+from segment_verify import is_segmented, parts_since, read_index, verify_segmented
+from stream_verify import verify_stream
+
+
+def test_segmented_export_verifies(container):
+    flat = container(95, name="flat.twff")
+    path = container(95, name="seg.twff", segment_events=20)
+    assert is_segmented(path) and not is_segmented(flat)
+    result = verify_segmented(path, workers=1)
+    assert result.ok, result.detail
+    assert result.events == 97
+    assert read_integrity(path) == read_index(path)["_integrity"]
+    assert read_integrity(path)["chain_length"] == verify_stream(flat).checkpoint.index
+
+
+def test_tampered_part_is_located(container):
+    path = container(95, segment_events=20)
+    edit_log(path, lambda doc: doc["events"][3].update(type="tide"),
+             member="meta/process-log/part-0002.json")
+    result = verify_segmented(path, workers=1)
+    assert not result.ok and result.index == 23
+
+
+def test_index_must_match_the_parts(container):
+    path = container(95, segment_events=20)
+
+    def shrink(data: bytes) -> bytes:
+        index = json.loads(data)
+        index["segments"][1]["count"] -= 1
+        return json.dumps(index, indent=2).encode("utf-8")
+
+    rewrite_member(path, "meta/process-log/index.json", shrink)
+    assert not verify_segmented(path, workers=1).ok
+
+
+def test_only_some_parts(container):
+    path = container(95, segment_events=20)
+    index = read_index(path)
+    since = parts_since(index, index["segments"][3]["start_time"])
+    assert since == {4, 5}
+    result = verify_segmented(path, workers=1, only=since)
+    assert result.ok and "2 of 5" in result.detail
+
+
+def test_stream_and_anchored_verifiers_accept_segmented_containers(container):
+    path = container(95, segment_events=20, log_kwargs={"anchor_every": 10})
+    assert "anchors" not in read_integrity(path)
+    assert verify_stream(path).ok
+    result = verify_anchored(path, workers=1)
+    assert result.ok and result.events == 97, result.detail
+    with pytest.raises(ValueError):
+        verify_anchored(path, resume_from=10)
+
+    edit_log(path, lambda doc: doc["events"][3].update(type="tide"),
+             member="meta/process-log/part-0002.json")
+    assert verify_stream(path).index == 23
+    assert verify_anchored(path, workers=1).index == 23
@@ -0,0 +1,104 @@
+"""stream_verify: constant-memory chain verification and tamper detection."""
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+import zipfile
+
+from conftest import VERIFICATION, edit_log, rewrite_member
+from stream_verify import Checkpoint, verify_stream
+
+
+def run_cli(script: str, *args: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, os.path.join(VERIFICATION, script), *args],
+                          capture_output=True, text=True)
+
+
+def test_intact_container(container):
+    path = container(40)
+    result = verify_stream(path)
+    assert result.ok, result.detail
+    assert result.events == 42          # + session_start and session_end
+    assert result.checkpoint.index == 42
+    assert result.checkpoint.hash == result.header["_integrity"]["head_hash"]
+
+
+def test_bare_process_log_json(container, tmp_path):
+    with zipfile.ZipFile(container(10)) as zf:
+        (tmp_path / "process-log.json").write_bytes(zf.read("meta/process-log.json"))
+    assert verify_stream(str(tmp_path / "process-log.json")).ok
+
+
+def test_modified_event_is_located(container):
+    path = container(40)
+    edit_log(path, lambda doc: doc["events"][17].update(position_end=999))
+    result = verify_stream(path)
+    assert not result.ok
+    assert result.index == 17
+    with zipfile.ZipFile(path) as zf:
+        raw = zf.read("meta/process-log.json")
+    assert json.JSONDecoder().raw_decode(raw[result.offset:].decode())[0]["position_end"] == 999
+
+
+def test_deleted_event_breaks_the_chain(container):
+    path = container(40)
+    edit_log(path, lambda doc: doc["events"].pop(5))
+    result = verify_stream(path)
+    assert not result.ok and result.index == 5
+
+
+def test_injected_unhashed_event_breaks_the_head(container):
+    path = container(40)
+    edit_log(path, lambda doc: doc["events"].insert(20, {"type": "paste", "timestamp": "x"}))
+    result = verify_stream(path)
+    assert not result.ok
+    assert "head_hash" in result.detail or result.index is not None
+
+
+def test_head_hash_mismatch(container):
+    path = container(10)
+    edit_log(path, lambda doc: doc["_integrity"].update(head_hash="0" * 64))
+    result = verify_stream(path)
+    assert not result.ok and "head_hash" in result.detail
+
+
+def test_truncated_log_is_unreadable(container):
+    path = container(10)
+    rewrite_member(path, "meta/process-log.json", lambda data: data[:len(data) // 2])
+    result = verify_stream(path)
+    assert not result.ok and result.detail.startswith("Unreadable process log")
+
+
+def test_checkpoint_resume(container):
+    path = container(30)
+    first = verify_stream(path)
+    again = verify_stream(path, checkpoint=first.checkpoint)
+    assert again.ok and again.events == 0
+    stale = Checkpoint(first.checkpoint.index, "f" * 64, first.checkpoint.offset)
+    assert not verify_stream(path, checkpoint=stale).ok
+
+
+def test_checkpoint_parse_round_trip():
+    cp = Checkpoint(12, "ab" * 32, 3456)
+    assert Checkpoint.parse(str(cp)) == cp
+    assert Checkpoint.parse("3:" + "cd" * 32) == Checkpoint(3, "cd" * 32)
+
+
+def test_cli_exit_codes(container):
+    good = container(20, name="good.twff")
+    bad  = container(20, name="bad.twff")
+    edit_log(bad, lambda doc: doc["events"][3].update(type="focus_change"))
+    assert run_cli("stream_verify.py", good).returncode == 0
+    proc = run_cli("stream_verify.py", good, bad)
+    assert proc.returncode == 1
+    assert "Hash mismatch at event 3" in proc.stdout
+
+
+def test_bulk_verify_cli(container):
+    good = container(20, name="good.twff")
+    assert run_cli("bulk_verify.py", "--no-schema", "-j", "1", good).returncode == 0
+    edit_log(good, lambda doc: doc["events"][3].update(type="focus_change"))
+    proc = run_cli("bulk_verify.py", "--no-schema", "-j", "1", good)
+    assert proc.returncode == 1
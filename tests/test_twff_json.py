@@ -0,0 +1,103 @@
+"""twff_json.JsonStream: the shared event-at-a-time process-log parser."""
+from __future__ import annotations
+
+import io
+import json
+
+import pytest
+from twff_json import JsonStream
+
+DOC = {
+    "version": "0.1",
+    "session_id": "sess-ünïcode-✓",
+    "events": [
+        {"type": "edit", "n": 1234567890123, "text": "😀" * 20},
+        {"type": "paste", "n": -1.5e-7, "text": "plain"},
+        [],
+        {},
+        "s",
+        12345,
+    ],
+    "_integrity": {"head_hash": "ab" * 32},
+}
+
+
+def walk(raw: bytes, chunk_chars: int) -> dict:
+    stream = JsonStream(io.BytesIO(raw), chunk_chars)
+    out = {}
+    for key in stream.members():
+        out[key] = list(stream.items()) if key == "events" else stream.value()
+    return out
+
+
+@pytest.mark.parametrize("chunk_chars", [1, 3, 7, 64, 1 << 16])
+@pytest.mark.parametrize("indent", [None, 2])
+def test_round_trips_across_chunk_boundaries(chunk_chars, indent):
+    raw = json.dumps(DOC, indent=indent, ensure_ascii=False).encode("utf-8")
+    assert walk(raw, chunk_chars) == DOC
+
+
+def test_items_without_marks():
+    stream = JsonStream(io.BytesIO(b'[1, {"a": [2]}, "x"]'))
+    assert list(stream.items()) == [1, {"a": [2]}, "x"]
+
+
+def test_empty_containers():
+    stream = JsonStream(io.BytesIO(b'{ "events" : [ ] }'))
+    keys = []
+    for key in stream.members():
+        keys.append(key)
+        assert list(stream.items()) == []
+    assert keys == ["events"]
+    assert list(JsonStream(io.BytesIO(b"{}")).members()) == []
+
+
+def test_byte_offsets_point_at_each_element():
+    raw = json.dumps(DOC, indent=2, ensure_ascii=False).encode("utf-8")
+    stream = JsonStream(io.BytesIO(raw))
+    for key in stream.members():
+        if key != "events":
+            stream.value()
+            continue
+        for mark, item in stream.marked_items():
+            offset = stream.byte_offset(mark)
+            decoded, _ = json.JSONDecoder().raw_decode(raw[offset:].decode("utf-8"))
+            assert decoded == item
+
+
+def test_pinned_offset_survives_refills():
+    raw = json.dumps({"events": DOC["events"]}, ensure_ascii=False).encode("utf-8")
+    stream = JsonStream(io.BytesIO(raw), chunk_chars=2)
+    offsets = []
+    for _ in stream.members():
+        for mark, item in stream.marked_items():
+            stream.pin(mark)
+            offsets.append(stream.pinned_offset())
+    last = offsets[-1]
+    assert raw[last:].startswith(b"12345")
+    assert stream.pinned_offset() == last
+    assert stream.position() == len(raw)
+
+
+@pytest.mark.parametrize("raw", [
+    b'{"events": [1 2]}',
+    b'{"events" [1]}',
+    b'{"a": 1 "b": 2}',
+    b'["unterminated',
+    b'',
+])
+def test_malformed_input_raises_value_error(raw):
+    stream = JsonStream(io.BytesIO(raw), chunk_chars=4)
+    with pytest.raises(ValueError):
+        for _ in stream.members():
+            for _ in stream.items():
+                pass
+
+
+def test_detach_leaves_the_stream_open():
+    raw = io.BytesIO(b'{"a": 1}')
+    stream = JsonStream(raw)
+    for _ in stream.members():
+        stream.value()
+    stream.detach()
+    assert not raw.closed
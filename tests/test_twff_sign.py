@@ -0,0 +1,97 @@
+"""twff_sign: Ed25519 signatures over the _integrity chain summary."""
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+from conftest import VERIFICATION, edit_log
+
+twff_sign = pytest.importorskip("twff_sign")
+if twff_sign.Ed25519PrivateKey is None:
+    pytest.skip("cryptography not installed", allow_module_level=True)
+
+
+@pytest.fixture
+def key(tmp_path):
+    path = str(tmp_path / "author.key")
+    twff_sign.generate_keypair(path)
+    return path
+
+
+def signed(container, key, **kwargs) -> str:
+    path = container(**kwargs)
+    twff_sign.sign_container(path, twff_sign.load_private_key(key))
+    return path
+
+
+def test_sign_and_verify(container, key):
+    path = signed(container, key, n=30)
+    report = twff_sign.verify_signed(path)
+    assert report.ok, report.errors
+    assert report.chain_verified and report.events == 32
+
+
+def test_default_verification_checks_the_chain(container, key):
+    path = signed(container, key, n=30)
+    # Same length, so the tail _integrity block still parses and still matches.
+    edit_log(path, lambda doc: doc["events"][4].update(type="tide"))
+    report = twff_sign.verify_signed(path)
+    assert not report.ok and not report.chain_verified
+    assert any(e.startswith("chain:") for e in report.errors)
+
+    skipped = twff_sign.verify_signed(path, check_chain=False)
+    assert skipped.ok and not skipped.chain_verified
+
+
+def test_message_covers_merkle_root_and_anchors():
+    base = {"algorithm": "SHA-256-CHAIN", "session_id": "s", "chain_length": 3, "head_hash": "h"}
+    plain = twff_sign.signed_message(base)
+    assert plain == b"TWFF-SIGNATURE-1\nSHA-256-CHAIN\ns\n3\nh"
+    merkle = dict(base, merkle={"algorithm": "RFC9162-SHA-256", "tree_size": 3, "root": "ab"})
+    assert twff_sign.signed_message(merkle) == plain + b"\nmerkle:ab"
+    anchors = dict(merkle, anchors=[{"index": 0, "hash": "", "offset": 10}])
+    assert twff_sign.signed_message(anchors) == (
+        plain + b'\nmerkle:ab\nanchors:[{"hash":"","index":0,"offset":10}]')
+
+
+@pytest.mark.parametrize("field, change", [
+    ("merkle", lambda i: i["merkle"].update(root="00" * 32)),
+    ("anchors", lambda i: i["anchors"][1].update(offset=i["anchors"][1]["offset"] + 1)),
+])
+def test_swapped_merkle_root_or_anchor_breaks_the_signature(container, key, field, change):
+    path = signed(container, key, n=40, log_kwargs={"merkle": True, "anchor_every": 10})
+    assert twff_sign.verify_signed(path).ok
+    edit_log(path, lambda doc: change(doc["_integrity"]))
+    report = twff_sign.verify_signed(path, check_chain=False)
+    assert not report.ok
+    assert any("invalid signature" in e for e in report.errors)
+
+
+def test_cli_labels_skipped_chain(container, key):
+    path = signed(container, key, n=10)
+    script = os.path.join(VERIFICATION, "twff_sign.py")
+    full = subprocess.run([sys.executable, script, "verify", "-j", "1", path],
+                          capture_output=True, text=True)
+    assert full.returncode == 0 and "NOT verified" not in full.stdout
+    fast = subprocess.run([sys.executable, script, "verify", "-j", "1", "--skip-chain", path],
+                          capture_output=True, text=True)
+    assert fast.returncode == 0 and "chain NOT verified" in fast.stdout
+    report = json.loads(subprocess.run(
+        [sys.executable, script, "verify", "-j", "1", "--json", "--skip-chain", path],
+        capture_output=True, text=True).stdout.splitlines()[0])
+    assert report["ok"] and report["chain_verified"] is False
+
+
+def test_segmented_container(container, key):
+    path = signed(container, key, n=60, segment_events=25)
+    report = twff_sign.verify_signed(path)
+    assert report.ok, report.errors
+    assert report.chain_verified and report.events == 62
+    assert twff_sign.verify_signed(path, check_chain=False).ok
+
+    edit_log(path, lambda doc: doc["events"][0].update(type="tide"),
+             member="meta/process-log/part-0002.json")
+    assert not twff_sign.verify_signed(path).ok
@@ -0,0 +1,85 @@
+"""VerificationCache: keys, LRU eviction and sharing across processes."""
+from __future__ import annotations
+
+import multiprocessing
+
+import pytest
+
+import verify_cache
+from verify_cache import VerificationCache, file_digest
+
+
+@pytest.fixture
+def cache(tmp_path):
+    with VerificationCache(tmp_path / "cache.sqlite", max_entries=3) as c:
+        yield c
+
+
+def test_key_is_content_validator_and_schema_version(tmp_path, cache):
+    path = tmp_path / "a.twff"
+    path.write_bytes(b"container")
+    digest, validator, schema, options = cache.key(str(path), "schema=1").split(":")
+    assert digest == file_digest(str(path))
+    assert validator == verify_cache.validator_version()
+    assert schema == verify_cache.schema_version()
+    assert options == "schema=1"
+
+
+def test_changed_bytes_or_versions_miss(tmp_path, cache, monkeypatch):
+    path = tmp_path / "a.twff"
+    path.write_bytes(b"first")
+    key = cache.key(str(path))
+    cache.put(key, {"ok": True})
+    assert cache.get(cache.key(str(path))) == {"ok": True}
+
+    path.write_bytes(b"second")
+    assert cache.get(cache.key(str(path))) is None
+
+    path.write_bytes(b"first")
+    monkeypatch.setattr(verify_cache, "schema_version", lambda: "new-schema")
+    with VerificationCache(cache.path) as other:
+        assert other.get(other.key(str(path))) is None
+    monkeypatch.undo()
+    monkeypatch.setattr(verify_cache, "validator_version", lambda: "new-validator")
+    with VerificationCache(cache.path) as other:
+        assert other.get(other.key(str(path))) is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_evicts_least_recently_used(cache, monkeypatch):
+    clock = iter(range(1, 100))
+    monkeypatch.setattr(verify_cache.time, "time", lambda: next(clock))
+    for name in "abcd":
+        cache.put(name, {"name": name})
+    cache.get("a")                      # a is now more recent than b, c and d
+    assert cache.evict() == 1
+    assert len(cache) == 3
+    assert cache.get("b") is None
+    assert all(cache.get(name) == {"name": name} for name in "acd")
+
+
+def test_sweeps_every_few_puts(cache, monkeypatch):
+    monkeypatch.setattr(verify_cache, "_EVICT_EVERY", 4)
+    for i in range(8):
+        cache.put(str(i), {})
+    assert len(cache) == 3
+
+
+def _worker(args) -> int:
+    path, worker = args
+    with VerificationCache(path) as c:
+        for i in range(25):
+            key = f"{worker}-{i}"
+            c.put(key, {"worker": worker, "i": i})
+            assert c.get(key) == {"worker": worker, "i": i}
+            c.get(f"{(worker + 1) % 4}-{i}")      # another worker's entry, maybe missing
+    return worker
+
+
+def test_processes_share_one_cache(tmp_path):
+    path = str(tmp_path / "shared.sqlite")
+    with multiprocessing.get_context("fork").Pool(4) as pool:
+        assert sorted(pool.map(_worker, [(path, w) for w in range(4)])) == [0, 1, 2, 3]
+    with VerificationCache(path) as c:
+        assert len(c) == 100
+        assert c.get("3-24") == {"worker": 3, "i": 24}
@@ -0,0 +1,52 @@
+"""verify_process_log: whole-dict verification and checkpoints."""
+from __future__ import annotations
+
+import pytest
+
+from conftest import build_log
+from verify_process_log import verify_process_log
+
+
+@pytest.fixture
+def document():
+    log = build_log(20)
+    log.end_session()
+    return log.to_dict()
+
+
+def test_intact(document):
+    valid, detail = verify_process_log(document)
+    assert valid, detail
+
+
+def test_checkpoint_verifies_only_new_events(document):
+    events = document["events"]
+    valid, detail = verify_process_log(document, (10, events[9]["_hash"]))
+    assert valid and f"{len(events) - 10} new events" in detail
+    assert verify_process_log(document, (len(events), events[-1]["_hash"]))[0]
+    assert verify_process_log(document, (0, ""))[0]
+
+
+def test_tampering_before_the_checkpoint_is_trusted_unless_it_hits_the_anchor(document):
+    events = document["events"]
+    checkpoint = (10, events[9]["_hash"])
+    events[3]["type"] = "tide"
+    assert verify_process_log(document, checkpoint)[0]
+    events[9]["_hash"] = "0" * 64
+    valid, detail = verify_process_log(document, checkpoint)
+    assert not valid and "Checkpoint mismatch" in detail
+
+
+def test_tampering_after_the_checkpoint_fails(document):
+    events = document["events"]
+    checkpoint = (10, events[9]["_hash"])
+    events[15]["type"] = "tide"
+    valid, detail = verify_process_log(document, checkpoint)
+    assert not valid and "event 15" in detail
+
+
+@pytest.mark.parametrize("checkpoint", [(-1, ""), (23, ""), (10_000, ""), ("3", ""),
+                                        (True, ""), (1.0, ""), (3, None), (3,), "3:abc"])
+def test_bad_checkpoints_are_rejected(document, checkpoint):
+    valid, detail = verify_process_log(document, checkpoint)
+    assert not valid and "Checkpoint" in detail